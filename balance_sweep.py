@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 战斗平衡扫描工具
+在进程池中对玩家等级 × 力量加成 × 防御加成的网格，
+与 create_npcs 中的每个敌对 NPC 以及生成世界中各距离的怪物进行蒙特卡洛战斗模拟，
+输出胜率与期望伤害的热力图（.csv 为逐格表格，.json 为按敌人分组的矩阵）
+
+使用方法:
+    python balance_sweep.py [-o balance.csv] [--levels 1 2 3 4 5] [--strength 0 2 4]
+                            [--defense 0 1 2] [--distances 0 5 10] [--trials 10000] [--workers N]
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.content.game_data import create_npcs
+from src.content.generator import MONSTER_KINDS, generate_monster
+from src.core.entities import NPC, Player
+from src.systems.combat_sim import DAMAGE_PERCENTILES, simulate_combat
+
+# label, health, attack, defense
+EnemyStats = Tuple[str, int, int, int]
+# level, strength bonus, defense bonus, enemy index, seed
+Cell = Tuple[int, int, int, int, int]
+
+CSV_FIELDS = ["enemy", "level", "strength", "defense", "health", "win_rate", "fled_rate",
+              "mean_turns", "mean_damage"] + [f"damage_p{q}" for q in DAMAGE_PERCENTILES]
+
+def player_at(level: int, strength_bonus: int = 0, defense_bonus: int = 0) -> Player:
+    """A fresh player levelled up to `level`, at full health, plus equipment bonuses"""
+    player = Player(current_room_id="cabin")
+    for _ in range(level - 1):
+        player.level_up()
+    player.strength += strength_bonus
+    player.defense += defense_bonus
+    return player
+
+def enemy_roster(distances: List[int]) -> List[EnemyStats]:
+    """Every hostile NPC of the story world, then each generated monster kind at each distance"""
+    enemies = [(npc.name, npc.health, npc.attack_power, npc.defense_power)
+               for npc in create_npcs().values() if npc.hostile]
+    for kind in MONSTER_KINDS:
+        for distance in distances:
+            monster = generate_monster(kind, distance)
+            enemies.append((f"{monster.name}@{distance}", monster.health,
+                            monster.attack_power, monster.defense_power))
+    return enemies
+
+def _init_worker(enemies: List[EnemyStats], trials: int):
+    global _ENEMIES, _TRIALS
+    _ENEMIES, _TRIALS = enemies, trials
+
+def run_cell(cell: Cell) -> Dict:
+    level, strength_bonus, defense_bonus, enemy_index, seed = cell
+    label, health, attack, defense = _ENEMIES[enemy_index]
+    player = player_at(level, strength_bonus, defense_bonus)
+    enemy = NPC(label, "", health=health, max_health=health, attack_power=attack,
+                defense_power=defense, hostile=True)
+    result = simulate_combat(player, enemy, _TRIALS, seed=seed)
+    row = {
+        "enemy": label, "level": level, "strength": player.strength, "defense": player.defense,
+        "health": player.health, "win_rate": round(result.win_rate, 4),
+        "fled_rate": round(result.fled / result.trials, 4),
+        "mean_turns": round(result.mean_turns, 3), "mean_damage": round(result.mean_damage, 3),
+    }
+    for q, value in result.damage_percentiles.items():
+        row[f"damage_p{q}"] = value
+    return row
+
+def write_csv(path: str, rows: List[Dict]):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def write_json(path: str, rows: List[Dict], args):
+    """One heatmap per enemy: win_rate[level][strength][defense], and the same for mean_damage"""
+    axes = {"level": args.levels, "strength_bonus": args.strength, "defense_bonus": args.defense}
+    shape = (len(args.levels), len(args.strength), len(args.defense))
+    heatmaps: Dict[str, Dict] = {}
+    for index, row in enumerate(rows):
+        level, rest = divmod(index % (shape[0] * shape[1] * shape[2]), shape[1] * shape[2])
+        strength, defense = divmod(rest, shape[2])
+        heatmap = heatmaps.setdefault(row["enemy"], {
+            "win_rate": [[[0.0] * shape[2] for _ in range(shape[1])] for _ in range(shape[0])],
+            "mean_damage": [[[0.0] * shape[2] for _ in range(shape[1])] for _ in range(shape[0])],
+        })
+        heatmap["win_rate"][level][strength][defense] = row["win_rate"]
+        heatmap["mean_damage"][level][strength][defense] = row["mean_damage"]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"axes": axes, "trials": args.trials, "enemies": heatmaps}, f, ensure_ascii=False, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description='战斗平衡扫描')
+    parser.add_argument('-o', '--output', default='balance.csv', help='输出文件（.csv 或 .json）')
+    parser.add_argument('--levels', type=int, nargs='+', default=list(range(1, 11)), help='玩家等级')
+    parser.add_argument('--strength', type=int, nargs='+', default=[0, 2, 4, 6, 8], help='力量加成')
+    parser.add_argument('--defense', type=int, nargs='+', default=[0, 1, 2, 3, 4], help='防御加成')
+    parser.add_argument('--distances', type=int, nargs='+', default=[0, 5, 10, 20],
+                        help='生成怪物与起点的距离')
+    parser.add_argument('-n', '--trials', type=int, default=10000, help='每格模拟场数')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(), help='进程数')
+    parser.add_argument('--seed', type=int, default=0, help='随机数种子（结果与进程数无关）')
+    args = parser.parse_args()
+
+    enemies = enemy_roster(args.distances)
+    # Enemy-major order, so each enemy's cells are contiguous; each cell has its own seed
+    cells = [(level, strength, defense, enemy_index, 0)
+             for enemy_index in range(len(enemies))
+             for level in args.levels for strength in args.strength for defense in args.defense]
+    cells = [cell[:4] + (args.seed * len(cells) + index,) for index, cell in enumerate(cells)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker,
+                             initargs=(enemies, args.trials)) as pool:
+        rows = list(pool.map(run_cell, cells, chunksize=max(1, len(cells) // (args.workers * 8))))
+    elapsed = time.perf_counter() - start
+
+    if args.output.endswith('.json'):
+        write_json(args.output, rows, args)
+    else:
+        write_csv(args.output, rows)
+    print(f"{len(enemies)} 个敌人 × {len(cells) // len(enemies)} 个玩家配置 = {len(cells)} 格，"
+          f"每格 {args.trials} 场，{args.workers} 个进程，用时 {elapsed:.2f} s -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 成就规则评估性能测试
+向成就系统批量添加规则（按物品计数、金币阈值），测量每个游戏事件的评估耗时，
+验证规则数量增长时单次动作的开销保持不变
+
+使用方法:
+    python bench_achievements.py [--rules 10 100 1000 10000] [--events N]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.entities import Player
+from src.core.world import SessionRooms
+from src.systems.achievements import Achievement, AchievementSystem, CountEvents, StatRule
+from src.systems.events import EventBus, ItemTaken, PlayerStatChanged
+
+class BenchState:
+    """The slice of GameState the achievement rules read"""
+    def __init__(self):
+        self.player = Player(current_room_id="cabin")
+        self.rooms = SessionRooms()
+        self.npcs = {}
+
+def build(rule_count: int) -> EventBus:
+    bus = EventBus()
+    system = AchievementSystem(bus)
+    system.attach(bus, BenchState())
+    for idx in range(rule_count // 2):
+        system.add(Achievement(f"take_{idx}", f"收集者{idx}", "", rule=CountEvents(
+            ItemTaken, 1_000_000, match=("item_name", f"物品{idx}"))))
+        system.add(Achievement(f"gold_{idx}", f"富翁{idx}", "", rule=StatRule("gold", minimum=10_000 + idx)))
+    return bus
+
+def per_event(bus: EventBus, events) -> float:
+    """Return microseconds per published event"""
+    start = time.perf_counter()
+    for event in events:
+        bus.publish(event)
+    return (time.perf_counter() - start) / len(events) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='成就规则评估性能测试')
+    parser.add_argument('--rules', type=int, nargs='+', default=[10, 100, 1000, 10000], help='规则数量')
+    parser.add_argument('-n', '--events', type=int, default=100_000, help='每种事件的发布次数')
+    args = parser.parse_args()
+
+    takes = [ItemTaken(f"物品{idx % 50}", "物品", "cabin") for idx in range(args.events)]
+    gold = [PlayerStatChanged("gold", idx, idx + 1) for idx in range(args.events)]
+    print(f"{'规则数':>8} {'拾取事件':>12} {'金币变化':>12}")
+    for count in args.rules:
+        bus = build(count)
+        print(f"{count:>8} {per_event(bus, takes):9.2f} µs {per_event(bus, gold):9.2f} µs")
+
+if __name__ == "__main__":
+    main()
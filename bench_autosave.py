@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 自动存档延迟测试
+模拟慢速磁盘（每次写入额外等待固定时间），每 10 个动作自动存档一次，
+对比同步写入与后台写入线程下每条指令耗时的中位数和 p99
+
+使用方法:
+    python bench_autosave.py [--rooms N] [--delay 50] [--commands N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.content.generator import generate_world
+from src.game_engine import GameEngine
+from src.systems.save_writer import SaveWriter
+from src.ui import NullUI
+
+class SlowDiskWriter(SaveWriter):
+    """Adds a fixed delay to every write, like a congested or network disk"""
+    def __init__(self, delay: float, background: bool):
+        super().__init__(background=background)
+        self.delay = delay
+
+    def write(self, work):
+        time.sleep(self.delay)
+        super().write(work)
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def command_latencies(room_count: int, commands: int, delay: float, background: bool):
+    """Return (per-command milliseconds, milliseconds spent waiting for the final flush)"""
+    with tempfile.TemporaryDirectory() as save_dir:
+        world = generate_world(room_count, items_per_room=5)
+        game = GameEngine(save_dir, save_dir, headless=True, ui=NullUI(), world=world)
+        game.game_state.store.writer = SlowDiskWriter(delay, background)
+        game.autosave_enabled = True
+        room = game.game_state.rooms[world.start_room_id]
+        item = next(iter(room.items))
+
+        samples = []
+        for action in range(commands):
+            command = f"take {item.name}" if action % 2 == 0 else f"drop {item.name}"
+            start = time.perf_counter()
+            game.step(command)
+            samples.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        game.close()
+        return samples, (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='自动存档延迟测试')
+    parser.add_argument('--rooms', type=int, default=1000, help='世界房间数')
+    parser.add_argument('--delay', type=float, default=50, help='每次写入的磁盘延迟（毫秒）')
+    parser.add_argument('-n', '--commands', type=int, default=1000, help='执行的指令数')
+    args = parser.parse_args()
+
+    print(f"磁盘延迟 {args.delay:.0f} ms，每 10 个动作自动存档一次")
+    print(f"{'写入方式':<8} {'中位数':>12} {'p99':>12} {'最大':>12} {'退出等待':>12}")
+    for name, background in (("同步", False), ("后台线程", True)):
+        samples, close_ms = command_latencies(args.rooms, args.commands, args.delay / 1000, background)
+        print(f"{name:<8} {percentile(samples, 0.5):9.3f} ms {percentile(samples, 0.99):9.3f} ms "
+              f"{max(samples):9.3f} ms {close_ms:9.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 战斗模拟性能测试
+用 CombatSystem.simulate 让初始玩家与 create_npcs 中的每个敌对 NPC 各战斗 N 次，
+输出胜率、平均回合数与受到伤害的分位数，并对比 NumPy 向量化与纯 Python 实现的耗时
+
+使用方法:
+    python bench_combat_sim.py [--trials 100000] [--flee-at 0]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.content.game_data import create_npcs
+from src.core.entities import Player
+from src.systems.combat_sim import NUMPY_ENABLED, simulate_combat
+
+def main():
+    parser = argparse.ArgumentParser(description='战斗模拟性能测试')
+    parser.add_argument('-n', '--trials', type=int, default=100000, help='每个敌人的模拟场数')
+    parser.add_argument('--flee-at', type=int, default=0, help='生命值不高于此值时尝试逃跑（0 表示从不逃跑）')
+    args = parser.parse_args()
+
+    player = Player(current_room_id="cabin")
+    enemies = [npc for npc in create_npcs().values() if npc.hostile]
+    backends = [True, False] if NUMPY_ENABLED else [False]
+
+    print(f"{'敌人':<8} {'实现':<8} {'胜率':>8} {'逃跑':>8} {'回合':>6} {'伤害 p50/p90/p99':>18} {'耗时':>10}")
+    for enemy in enemies:
+        for use_numpy in backends:
+            start = time.perf_counter()
+            result = simulate_combat(player, enemy, args.trials, args.flee_at, seed=0, use_numpy=use_numpy)
+            millis = (time.perf_counter() - start) * 1000
+            percentiles = "/".join(f"{value:.0f}" for value in result.damage_percentiles.values())
+            print(f"{enemy.name:<8} {'numpy' if use_numpy else 'python':<8} {result.win_rate:8.1%} "
+                  f"{result.fled / result.trials:8.1%} {result.mean_turns:6.2f} {percentiles:>18} {millis:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 指令分发性能测试
+对比旧版 process_command（每条指令重建 lambda 字典）与指令注册表的分发吞吐量
+
+使用方法:
+    python bench_commands.py [--iterations N]
+
+所有指令处理函数都被替换为空操作，因此结果只反映解析与分发本身的开销。
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.game_engine import GameEngine
+
+COMMANDS = [
+    "look", "go 北", "take 火把", "use 火把 on 壁炉", "talk to 斗桨先生 about 宝藏",
+    "i", "n", "examine 古老的地图", "attack", "stats", "x 火把", "unlock 门 with 生锈的钥匙",
+]
+
+HANDLERS = [
+    "move_player", "examine_target", "look_around", "take_item", "drop_item",
+    "show_inventory", "search_target", "open_target", "attack_monster", "show_stats",
+    "show_help", "save_game", "load_game", "show_quests", "quit_game", "show_hint",
+    "show_map", "show_achievements", "show_craft_menu", "show_journal", "rest",
+    "fast_travel", "show_travel_menu", "_handle_use_command", "_handle_talk_command",
+    "_handle_unlock_command",
+]
+
+LEGACY_ALIASES = {
+    'n': 'go 北', 's': 'go 南', 'e': 'go 东', 'w': 'go 西',
+    't': 'take', 'd': 'drop', 'u': 'use', 'x': 'examine',
+}
+
+def _noop(*_args, **_kwargs):
+    return None
+
+def stub_engine(game: GameEngine):
+    """Replace every handler with a no-op and rebuild the registry against the stubs"""
+    for name in HANDLERS:
+        setattr(game, name, _noop)
+    game.commands = game._build_command_registry()
+
+def legacy_process_command(self, command: str):
+    """The pre-registry dispatch path, kept verbatim for comparison"""
+    if command in LEGACY_ALIASES:
+        command = LEGACY_ALIASES[command]
+    parts = command.split()
+    action = parts[0] if parts else ""
+    target = " ".join(parts[1:]) if len(parts) > 1 else None
+
+    commands = {
+        "go": lambda: self.move_player(target) if target else _noop("去哪个方向？"),
+        "look": lambda: self.examine_target(target) if target else self.look_around(),
+        "l": lambda: self.examine_target(target) if target else self.look_around(),
+        "examine": lambda: self.examine_target(target) if target else _noop("检查什么？"),
+        "take": lambda: self.take_item(target) if target else _noop("拿什么？"),
+        "drop": lambda: self.drop_item(target) if target else _noop("丢什么？"),
+        "use": lambda: self._handle_use_command(parts),
+        "inventory": lambda: self.show_inventory(),
+        "i": lambda: self.show_inventory(),
+        "search": lambda: self.search_target(target) if target else _noop("搜索什么？"),
+        "talk": lambda: self._handle_talk_command(parts),
+        "unlock": lambda: self._handle_unlock_command(parts),
+        "open": lambda: self.open_target(target) if target else _noop("打开什么？"),
+        "attack": lambda: self.attack_monster(target) if target else self.attack_monster(),
+        "stats": lambda: self.show_stats(),
+        "help": lambda: self.show_help(),
+        "h": lambda: self.show_help(),
+        "save": lambda: self.save_game(),
+        "load": lambda: self.load_game(),
+        "quests": lambda: self.show_quests(),
+        "quit": lambda: self.quit_game(),
+        "q": lambda: self.quit_game(),
+        "hint": lambda: self.show_hint(),
+        "map": lambda: self.show_map(),
+        "achievements": lambda: self.show_achievements(),
+        "craft": lambda: self.show_craft_menu(),
+        "journal": lambda: self.show_journal(),
+        "rest": lambda: self.rest(),
+        "travel": lambda: self.fast_travel(target) if target else self.show_travel_menu(),
+    }
+
+    current_room = self.game_state.rooms.get(self.game_state.player.current_room_id)
+    if current_room and action in current_room.exits:
+        self.move_player(action)
+    elif action in commands:
+        commands[action]()
+
+def measure(dispatch, iterations: int) -> float:
+    """Return commands per second for the given dispatch callable"""
+    commands = COMMANDS * iterations
+    start = time.perf_counter()
+    for command in commands:
+        dispatch(command)
+    elapsed = time.perf_counter() - start
+    return len(commands) / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='指令分发性能测试')
+    parser.add_argument('-n', '--iterations', type=int, default=20000, help='指令序列重复次数')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    game = GameEngine(os.path.join(script_dir, "saving"), os.path.join(script_dir, "sounds"))
+    game.audio = None
+    stub_engine(game)
+
+    before = measure(lambda command: legacy_process_command(game, command), args.iterations)
+    after = measure(game.process_command, args.iterations)
+
+    print(f"旧版分发:   {before:12,.0f} 条/秒")
+    print(f"指令注册表: {after:12,.0f} 条/秒")
+    print(f"提升:       {after / before:12.2f}x")
+
+if __name__ == "__main__":
+    main()
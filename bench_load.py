@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 读档耗时测试
+在生成的大型世界中让玩家改动全部房间并存档，然后测量读档到显示第一个提示符
+（load_game + look）的耗时，并与读档时立即还原全部房间的方式对比
+
+使用方法:
+    python bench_load.py [--rooms 1000 10000] [--format json binary]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.content.generator import generate_world
+from src.game_engine import GameEngine
+from src.systems.save_codec import CODECS
+from src.ui import NullUI
+
+def first_prompt(game: GameEngine, hydrate_all: bool) -> float:
+    """Milliseconds from load_game to the room description being shown"""
+    state = game.game_state
+    start = time.perf_counter()
+    state.load_game(slot=1)
+    if hydrate_all:
+        for room_id in state.rooms:
+            state.rooms[room_id]
+    game.step("look")
+    return (time.perf_counter() - start) * 1000
+
+def bench_world(room_count: int, codec: str):
+    with tempfile.TemporaryDirectory() as save_dir:
+        world = generate_world(room_count, items_per_room=5)
+        game = GameEngine(save_dir, save_dir, headless=True, ui=NullUI(), world=world)
+        state = game.game_state
+        state.codec = CODECS[codec]
+        for room_id in world.rooms:
+            state.rooms[room_id].properties["searched"] = True
+        state.save_game(slot=1)
+
+        decode = time.perf_counter()
+        state.read_save(slot=1)
+        decode = (time.perf_counter() - decode) * 1000
+        return decode, first_prompt(game, True), first_prompt(game, False)
+
+def main():
+    parser = argparse.ArgumentParser(description='读档耗时测试')
+    parser.add_argument('--rooms', type=int, nargs='+', default=[1000, 10000], help='世界房间数')
+    parser.add_argument('--format', nargs='+', default=list(CODECS), choices=list(CODECS), help='存档格式')
+    args = parser.parse_args()
+
+    print(f"{'房间数':>8} {'格式':<8} {'解码':>12} {'全部还原':>12} {'按需还原':>12}")
+    for rooms in args.rooms:
+        for codec in args.format:
+            decode, eager, lazy = bench_world(rooms, codec)
+            print(f"{rooms:>8} {codec:<8} {decode:9.1f} ms {eager:9.1f} ms {lazy:9.1f} ms")
+
+if __name__ == "__main__":
+    main()
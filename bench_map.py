@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 小地图性能测试
+在生成的大型世界中测量出口图布局的计算耗时（每个世界只算一次），
+以及玩家移动后重新绘制小地图与重复查看同一地图的耗时
+
+使用方法:
+    python bench_map.py [--rooms 100 10000 100000] [--steps 1000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.content.generator import generate_world
+from src.core.world_map import MiniMap
+
+def bench_world(room_count: int, steps: int):
+    world = generate_world(room_count, items_per_room=0, monster_chance=0)
+    start = time.perf_counter()
+    layout = world.layout
+    compute = (time.perf_counter() - start) * 1000
+
+    # Walk east along the first row, then back, showing the map after every move
+    mini_map = MiniMap(layout)
+    visited = []
+    room_id = world.start_room_id
+    redraw = repeat = 0.0
+    for _ in range(steps):
+        visited.append(room_id)
+        start = time.perf_counter()
+        mini_map.sync(visited)
+        mini_map.render(room_id)
+        redraw += time.perf_counter() - start
+        start = time.perf_counter()
+        mini_map.sync(visited)
+        mini_map.render(room_id)
+        repeat += time.perf_counter() - start
+        exits = world.rooms[room_id].exits
+        room_id = exits.get("东") or exits.get("南") or world.start_room_id
+    return compute, redraw / steps * 1e6, repeat / steps * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='小地图性能测试')
+    parser.add_argument('--rooms', type=int, nargs='+', default=[100, 10000, 100000], help='世界房间数')
+    parser.add_argument('--steps', type=int, default=1000, help='移动并查看地图的次数')
+    args = parser.parse_args()
+
+    print(f"{'房间数':>8} {'计算布局':>12} {'移动后绘制':>12} {'重复查看':>12}")
+    for rooms in args.rooms:
+        compute, redraw, repeat = bench_world(rooms, args.steps)
+        print(f"{rooms:>8} {compute:9.1f} ms {redraw:9.1f} us {repeat:9.2f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 终端输出合批测试
+用 rich 界面执行官方通关脚本，统计每条指令写入终端的次数，
+对比逐条输出与按指令合批输出，可为每次写入模拟远程终端的延迟
+
+使用方法:
+    python bench_output_batching.py [--write-delay 0.001]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rich.console import Console
+from src.game_engine import GameEngine
+from src.ui.terminal_ui import GameUI
+
+class Terminal:
+    """A tty-like sink that counts writes and pays a fixed cost for each flush"""
+
+    def __init__(self, write_delay: float):
+        self.write_delay = write_delay
+        self.writes = 0
+        self.bytes = 0
+
+    def isatty(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        self.bytes += len(text.encode("utf-8"))
+        return len(text)
+
+    def flush(self):
+        if self.write_delay:
+            time.sleep(self.write_delay)
+
+def measure(commands, save_dir: str, batch_output: bool, write_delay: float):
+    terminal = Terminal(write_delay)
+    ui = GameUI(Console(file=terminal, width=100, height=40, force_terminal=True), batch_output=batch_output)
+    game = GameEngine(save_dir, save_dir, headless=True, ui=ui, seed=0)
+    start = time.perf_counter()
+    executed = len(game.run_commands(commands))
+    elapsed = time.perf_counter() - start
+    return terminal.writes / executed, terminal.bytes / executed, elapsed / executed * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='终端输出合批测试')
+    parser.add_argument('--write-delay', type=float, default=0.001, help='每次写入的模拟延迟(秒)')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(script_dir, "saving", "official_walkthrough.txt"), encoding='utf-8') as f:
+        commands = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    save_dir = os.path.join(script_dir, "saving")
+
+    print(f"{'输出方式':<10} {'写入/条':>8} {'字节/条':>8} {'耗时/条':>10}")
+    for name, batch_output in (("逐条输出", False), ("按指令合批", True)):
+        writes, size, millis = measure(commands, save_dir, batch_output, args.write_delay)
+        print(f"{name:<10} {writes:8.1f} {size:8.0f} {millis:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
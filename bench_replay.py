@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 指令日志性能测试
+测量记录指令日志（含定期关键帧）对每条指令的额外开销，
+以及从最近关键帧与从日志起点重放恢复整局游戏的耗时
+
+使用方法:
+    python bench_replay.py [--rooms N] [--commands N] [--keyframe-every N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.content.generator import generate_world
+from src.game_engine import GameEngine
+from src.systems.replay import SessionRecorder, restore_session
+from src.ui import NullUI
+
+def play(game: GameEngine, commands: int) -> float:
+    """Return microseconds per take/drop command"""
+    state = game.game_state
+    item = next(iter(state.rooms[state.player.current_room_id].items)).name
+    start = time.perf_counter()
+    for action in range(commands):
+        game.step(f"take {item}" if action % 2 == 0 else f"drop {item}")
+    return (time.perf_counter() - start) / commands * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='指令日志性能测试')
+    parser.add_argument('--rooms', type=int, default=1000, help='世界房间数')
+    parser.add_argument('-n', '--commands', type=int, default=5000, help='执行的指令数')
+    parser.add_argument('-k', '--keyframe-every', type=int, default=100, help='关键帧间隔（指令数）')
+    args = parser.parse_args()
+
+    world = generate_world(args.rooms, items_per_room=5)
+    with tempfile.TemporaryDirectory() as save_dir:
+        plain = play(GameEngine(save_dir, save_dir, headless=True, ui=NullUI(), world=world), args.commands)
+
+        game = GameEngine(save_dir, save_dir, headless=True, ui=NullUI(), world=world)
+        path = os.path.join(save_dir, "session")
+        SessionRecorder(game, path, keyframe_every=args.keyframe_every).start()
+        recorded = play(game, args.commands)
+        game.close()
+        print(f"每条指令: 不记录 {plain:.1f} µs | 记录 {recorded:.1f} µs | "
+              f"日志 {os.path.getsize(path + '.log') / args.commands:.0f} 字节/条")
+
+        for name, use_keyframe in (("最近关键帧", True), ("日志起点", False)):
+            restored = GameEngine(save_dir, save_dir, headless=True, ui=NullUI(), world=world)
+            start = time.perf_counter()
+            replayed = restore_session(restored, path, use_keyframe=use_keyframe)
+            millis = (time.perf_counter() - start) * 1000
+            print(f"从{name}恢复: 重放 {replayed} 条指令，{millis:.1f} ms")
+
+if __name__ == "__main__":
+    main()
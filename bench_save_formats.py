@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 存档格式性能测试
+在生成的大型世界中让玩家改动全部房间，写入完整快照，
+对比 JSON 与二进制格式的文件大小、存档耗时、解码耗时（read_save）和完整读档耗时
+
+使用方法:
+    python bench_save_formats.py [--rooms 1000 10000] [--repeat N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.content.generator import generate_world
+from src.game_engine import GameEngine
+from src.systems.save_codec import CODECS
+from src.systems.save_writer import SaveWriter
+from src.ui import NullUI
+
+def best_of(func, repeat: int) -> float:
+    """Return the fastest of `repeat` runs in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def bench_format(room_count: int, codec: str, repeat: int):
+    """Return (bytes on disk, save, decode and load milliseconds)"""
+    with tempfile.TemporaryDirectory() as save_dir:
+        world = generate_world(room_count, items_per_room=5)
+        game = GameEngine(save_dir, save_dir, headless=True, ui=NullUI(), world=world)
+        state = game.game_state
+        state.store.writer = SaveWriter(background=False)
+        state.codec = CODECS[codec]
+        state.compact_after = 0  # every save writes the whole base snapshot
+        for room_id in world.rooms:
+            state.rooms[room_id].properties["searched"] = True
+
+        save_ms = best_of(lambda: state.save_game(slot=1), repeat)
+        read_ms = best_of(lambda: state.read_save(slot=1), repeat)
+        load_ms = best_of(lambda: state.load_game(slot=1), repeat)
+        return os.path.getsize(state.store.find_save_file(1)), save_ms, read_ms, load_ms
+
+def main():
+    parser = argparse.ArgumentParser(description='存档格式性能测试')
+    parser.add_argument('--rooms', type=int, nargs='+', default=[1000, 10000], help='世界房间数')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='每项测量的重复次数（取最快）')
+    args = parser.parse_args()
+
+    print(f"{'房间数':>8} {'格式':<8} {'文件大小':>12} {'存档':>12} {'解码':>12} {'读档':>12}")
+    for rooms in args.rooms:
+        for codec in CODECS:
+            size, save_ms, read_ms, load_ms = bench_format(rooms, codec, args.repeat)
+            print(f"{rooms:>8} {codec:<8} {size / 1024:9.1f} KB {save_ms:9.1f} ms "
+                  f"{read_ms:9.1f} ms {load_ms:9.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 存档后端性能测试
+多个会话在各自的线程中执行指令并每 10 个动作自动存档一次，
+对比按玩家目录保存文件与共享 SQLite（WAL）数据库的总耗时、存档吞吐量和事务数
+
+使用方法:
+    python bench_save_store.py [--sessions 200] [--commands N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.game_engine import GameEngine
+from src.systems.save_store import SaveDatabase, SqliteSaveStore
+from src.ui import NullUI
+
+def run_sessions(root: str, sessions: int, commands: int, database=None):
+    """Return (seconds until every save is durable, saves written)"""
+    games = []
+    for idx in range(sessions):
+        store = SqliteSaveStore(database, f"player{idx}") if database else None
+        game = GameEngine(os.path.join(root, f"player{idx}"), root, headless=True, ui=NullUI(),
+                          save_store=store)
+        game.autosave_enabled = True
+        games.append(game)
+
+    def play(game):
+        state = game.game_state
+        item = next(iter(state.rooms[state.player.current_room_id].items)).name
+        for action in range(commands):
+            game.step(f"take {item}" if action % 2 == 0 else f"drop {item}")
+        game.close()
+
+    threads = [threading.Thread(target=play, args=(game,)) for game in games]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sessions * (commands // games[0].game_state.auto_save_interval)
+
+def main():
+    parser = argparse.ArgumentParser(description='存档后端性能测试')
+    parser.add_argument('-s', '--sessions', type=int, default=200, help='并发会话数')
+    parser.add_argument('-n', '--commands', type=int, default=200, help='每个会话执行的指令数')
+    args = parser.parse_args()
+
+    print(f"{'后端':<8} {'总耗时':>10} {'存档/秒':>10} {'事务数':>8}")
+    with tempfile.TemporaryDirectory() as root:
+        seconds, saves = run_sessions(os.path.join(root, "files"), args.sessions, args.commands)
+        print(f"{'文件':<8} {seconds:8.2f} s {saves / seconds:10.0f} {'-':>8}")
+
+        database = SaveDatabase(os.path.join(root, "saves.db"))
+        seconds, saves = run_sessions(os.path.join(root, "db"), args.sessions, args.commands, database)
+        print(f"{'SQLite':<8} {seconds:8.2f} s {saves / seconds:10.0f} {database.batches:>8}")
+        database.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 存档性能测试
+在生成的大型世界中先让玩家改动全部房间，然后模拟每 10 个动作一次的自动存档，
+对比完整快照与增量日志的单次存档耗时和写入字节数
+
+使用方法:
+    python bench_saves.py [--rooms 1000 10000] [--saves N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.content.generator import generate_world
+from src.game_engine import GameEngine
+from src.ui import NullUI
+
+ACTIONS_PER_SAVE = 10
+
+def disk_bytes(save_dir: str) -> int:
+    return sum(os.path.getsize(os.path.join(save_dir, name)) for name in os.listdir(save_dir))
+
+def play_and_save(room_count: int, saves: int, full: bool):
+    """Return (milliseconds per save, bytes written per save)"""
+    with tempfile.TemporaryDirectory() as save_dir:
+        world = generate_world(room_count, items_per_room=5)
+        game = GameEngine(save_dir, save_dir, headless=True, ui=NullUI(), world=world)
+        state = game.game_state
+        # Every room differs from the template, so a full snapshot holds the whole world
+        for room_id in world.rooms:
+            state.rooms[room_id].properties["searched"] = True
+        state.compact_after = 0 if full else 10 ** 9
+        state.save_game(slot=0)
+
+        room = state.rooms[world.start_room_id]
+        item = next(iter(room.items))
+        elapsed = 0.0
+        written = 0
+        for _ in range(saves):
+            for action in range(ACTIONS_PER_SAVE):
+                game.step(f"take {item.name}" if action % 2 == 0 else f"drop {item.name}")
+            before = disk_bytes(save_dir)
+            start = time.perf_counter()
+            state.save_game(slot=0)
+            elapsed += time.perf_counter() - start
+            after = disk_bytes(save_dir)
+            written += after if full else after - before
+        return elapsed / saves * 1000, written / saves
+
+def main():
+    parser = argparse.ArgumentParser(description='存档性能测试')
+    parser.add_argument('--rooms', type=int, nargs='+', default=[1000, 10000], help='世界房间数')
+    parser.add_argument('-n', '--saves', type=int, default=20, help='自动存档次数')
+    args = parser.parse_args()
+
+    print(f"{'房间数':>8} {'方式':<6} {'每次存档':>12} {'每次写入':>14}")
+    for rooms in args.rooms:
+        for name, full in (("完整", True), ("增量", False)):
+            millis, written = play_and_save(rooms, args.saves, full)
+            print(f"{rooms:>8} {name:<6} {millis:9.2f} ms {written / 1024:11.1f} KB")
+
+if __name__ == "__main__":
+    main()
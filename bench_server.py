@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 多人服务器压力测试
+在本进程内启动游戏服务器，建立大量空闲连接和停在存档槽位提示处的连接，
+同时让一批活跃客户端循环执行官方通关脚本
+
+使用方法:
+    python bench_server.py [--idle N] [--waiting N] [--active N] [--seconds S] [--workers N]
+
+输出指令吞吐量、指令往返延迟分位数以及进程内存峰值。
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import resource
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.server import GameServer, LISTEN_BACKLOG
+
+PROMPT = b"> "
+
+def load_walkthrough(filepath: str):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+async def read_prompt(reader: asyncio.StreamReader) -> bool:
+    """Read until the server shows a prompt; False if the session ended"""
+    buffer = b""
+    while not buffer.endswith(PROMPT) and not buffer.endswith("名字: ".encode("utf-8")):
+        chunk = await reader.read(65536)
+        if not chunk:
+            return False
+        buffer += chunk
+    return True
+
+async def idle_client(port: int, name: str, stop: asyncio.Event, command: str = ""):
+    """Log in, optionally run `command` (e.g. one that prompts), then sit until stopped"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await read_prompt(reader)
+    writer.write(f"{name}\n".encode("utf-8"))
+    await read_prompt(reader)
+    if command:
+        writer.write(f"{command}\n".encode("utf-8"))
+        await read_prompt(reader)
+    await stop.wait()
+    writer.close()
+
+async def active_client(port: int, name: str, commands, latencies, stop: asyncio.Event):
+    while not stop.is_set():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await read_prompt(reader)
+        writer.write(f"{name}\n".encode("utf-8"))
+        await read_prompt(reader)
+        for command in commands:
+            if stop.is_set():
+                break
+            start = time.perf_counter()
+            writer.write(f"{command}\n".encode("utf-8"))
+            alive = await read_prompt(reader)
+            latencies.append(time.perf_counter() - start)
+            if not alive:
+                break
+        writer.close()
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def run(args):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    commands = load_walkthrough(os.path.join(script_dir, "saving", "official_walkthrough.txt"))
+
+    with tempfile.TemporaryDirectory() as save_root:
+        game_server = GameServer(save_root, os.path.join(script_dir, "sounds"), max_workers=args.workers)
+        server = await asyncio.start_server(game_server.handle_connection, "127.0.0.1", 0,
+                                            backlog=LISTEN_BACKLOG)
+        port = server.sockets[0].getsockname()[1]
+        stop = asyncio.Event()
+
+        idle = [asyncio.create_task(idle_client(port, f"idle{i}", stop)) for i in range(args.idle)]
+        # Sessions left at the save slot prompt must not hold a worker thread
+        idle += [asyncio.create_task(idle_client(port, f"waiting{i}", stop, "save"))
+                 for i in range(args.waiting)]
+        await asyncio.sleep(0.5)
+        print(f"空闲连接: {len(game_server.sessions)}（其中 {args.waiting} 个停在提示处）")
+
+        latencies = []
+        cpu_start = time.process_time()
+        active = [asyncio.create_task(active_client(port, f"active{i}", commands, latencies, stop))
+                  for i in range(args.active)]
+        await asyncio.sleep(args.seconds)
+        stop.set()
+        await asyncio.gather(*active, *idle, return_exceptions=True)
+        cpu = time.process_time() - cpu_start
+        while game_server.sessions:
+            await asyncio.sleep(0.05)
+
+        server.close()
+        await server.wait_closed()
+        game_server.close()
+
+    print(f"活跃客户端: {args.active}, 持续 {args.seconds:.0f} 秒")
+    print(f"指令吞吐量: {len(latencies) / args.seconds:,.0f} 条/秒 (CPU {cpu:.1f} 秒)")
+    if latencies:
+        print(f"往返延迟: p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print(f"内存峰值: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description='多人服务器压力测试')
+    parser.add_argument('--idle', type=int, default=1000, help='空闲连接数')
+    parser.add_argument('--waiting', type=int, default=200, help='停在存档提示处的连接数')
+    parser.add_argument('--active', type=int, default=200, help='活跃客户端数')
+    parser.add_argument('--seconds', type=float, default=10.0, help='测试时长(秒)')
+    parser.add_argument('--workers', type=int, default=256, help='服务器工作线程数')
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
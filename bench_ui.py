@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 界面后端性能测试
+用无界面模式反复执行官方通关脚本，比较各界面后端每条指令的 CPU 时间
+（rich-nocache 为关闭渲染缓存的 rich 后端）
+
+使用方法:
+    python bench_ui.py [--rounds N]
+
+rich 与 plain 后端的输出写入内存缓冲区，不会刷屏。
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.game_engine import GameEngine
+from src.ui import NullUI, PlainUI, RecordingUI
+
+def make_rich_ui(render_cache_size=None):
+    from rich.console import Console
+    from src.ui.terminal_ui import GameUI, RENDER_CACHE_SIZE
+    if render_cache_size is None:
+        render_cache_size = RENDER_CACHE_SIZE
+    return GameUI(Console(file=io.StringIO(), width=80, force_terminal=True), render_cache_size)
+
+BACKENDS = {
+    "rich": make_rich_ui,
+    "rich-nocache": lambda: make_rich_ui(render_cache_size=0),
+    "plain": lambda: PlainUI(io.StringIO(), interactive=False),
+    "recording": RecordingUI,
+    "null": NullUI,
+}
+
+def load_walkthrough(filepath: str):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+def measure(factory, commands, save_dir: str, rounds: int) -> float:
+    """Return CPU microseconds per command"""
+    executed = 0
+    cpu = 0.0
+    for _ in range(rounds):
+        game = GameEngine(save_dir, save_dir, headless=True, ui=factory())
+        start = time.process_time()
+        executed += len(game.run_commands(commands))
+        cpu += time.process_time() - start
+    return cpu / executed * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='界面后端性能测试')
+    parser.add_argument('-r', '--rounds', type=int, default=50, help='通关脚本执行轮数')
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    commands = load_walkthrough(os.path.join(script_dir, "saving", "official_walkthrough.txt"))
+    save_dir = os.path.join(script_dir, "saving")
+
+    results = {name: measure(factory, commands, save_dir, args.rounds) for name, factory in BACKENDS.items()}
+    for name, micros in results.items():
+        print(f"{name:<10} {micros:10.1f} µs/条  ({results['rich'] / micros:6.1f}x)")
+
+if __name__ == "__main__":
+    main()
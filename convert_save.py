@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 存档格式转换工具
+在 JSON 与二进制存档格式之间双向转换，原文件会被替换，
+存档的增量日志（.journal）继续有效
+
+使用方法:
+    python convert_save.py saving/save_slot_1.json --to binary
+    python convert_save.py saving/save_slot_1.sav --to json
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.systems.save_codec import CODECS, convert_save_file
+
+def main():
+    parser = argparse.ArgumentParser(description='存档格式转换')
+    parser.add_argument('files', nargs='+', help='存档文件')
+    parser.add_argument('--to', choices=sorted(CODECS), required=True, help='目标格式')
+    args = parser.parse_args()
+
+    for path in args.files:
+        before = os.path.getsize(path)
+        new_path = convert_save_file(path, args.to)
+        print(f"{path} -> {new_path} ({before} -> {os.path.getsize(new_path)} 字节)")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 """Main entry point for The Lost Treasure Hunter game"""
+import argparse
 import os
 import sys
 
@@ -6,16 +7,40 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.game_engine import GameEngine
+from src.systems.replay import SessionRecorder, restore_session
+from src.ui import create_ui
 
 def main():
+    parser = argparse.ArgumentParser(description="迷失的宝藏猎人 (The Lost Treasure Hunter)")
+    parser.add_argument("--ui", choices=["rich", "plain"], default="rich",
+                        help="终端界面: rich (默认) 或 plain (纯文本)")
+    parser.add_argument("--record", action="store_true",
+                        help="记录每条指令到 saving/session.log，崩溃后可用 --recover 恢复")
+    parser.add_argument("--recover", action="store_true",
+                        help="重放上次记录的指令日志，恢复到最后一条指令后继续游戏")
+    parser.add_argument("--seed", type=int,
+                        help="随机数种子：相同种子下战斗、随机事件和提示完全一致")
+    args = parser.parse_args()
+
     script_dir = os.path.dirname(os.path.abspath(__file__))
     save_dir = os.path.join(script_dir, "saving")
     os.makedirs(save_dir, exist_ok=True)
 
     sounds_dir = os.path.join(script_dir, "sounds")
 
-    game = GameEngine(save_dir, sounds_dir)
-    game.start_game()
+    game = GameEngine(save_dir, sounds_dir, ui=create_ui(args.ui), seed=args.seed)
+    recording = os.path.join(save_dir, "session")
+    if args.recover and os.path.exists(recording + ".log"):
+        # The recorded intro's random draws are already in the log's starting state
+        replayed = restore_session(game, recording)
+        game.ui.print_success(f"已从指令日志恢复（重放 {replayed} 条指令），输入 'look' 查看周围")
+        SessionRecorder(game, recording).resume()
+    else:
+        # The intro draws from the session's random stream, so the log starts after it
+        game.play_intro()
+        if args.record or args.recover:
+            SessionRecorder(game, recording).start()
+    game.start_game(intro=False)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+The Lost Treasure Hunter - 指令日志重放工具
+从指令日志的起点（或最近的关键帧）无界面重放一局游戏，用于复现问题或检查崩溃前的状态
+
+使用方法:
+    python replay_session.py [saving/session] [--from-start] [--verbose]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.game_engine import GameEngine
+from src.systems.replay import restore_session
+from src.ui import PlainUI
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='指令日志重放')
+    parser.add_argument('path', nargs='?', default=os.path.join(script_dir, "saving", "session"),
+                        help='日志路径（不含 .log 后缀）')
+    parser.add_argument('--from-start', action='store_true', help='忽略关键帧，从日志起点重放全部指令')
+    parser.add_argument('-v', '--verbose', action='store_true', help='显示重放过程中的游戏输出')
+    args = parser.parse_args()
+
+    # As when the session was recorded: logged replies answer the combat prompts, and
+    # logged loads and slot menus read the saves next to the log (main.py keeps both in saving/)
+    save_dir = os.path.dirname(os.path.abspath(args.path))
+    game = GameEngine(save_dir, os.path.join(script_dir, "sounds"), headless=True, auto_combat=False)
+    start = time.perf_counter()
+    replayed = restore_session(game, args.path, use_keyframe=not args.from_start,
+                               ui=PlainUI() if args.verbose else None)
+    elapsed = time.perf_counter() - start
+
+    player = game.game_state.player
+    print(f"重放 {replayed} 条指令，用时 {elapsed * 1000:.1f} ms")
+    print(f"位置: {player.current_room_id} | 生命: {player.health}/{player.max_health} | "
+          f"等级: {player.level} | 金币: {player.gold} | 结局: {game.outcome or '进行中'}")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 """Content package"""
-from .game_data import create_items, create_npcs, create_rooms, ASCII_ARTS
+from .game_data import create_items, create_npcs, create_rooms, default_world, ASCII_ARTS
+from .generator import generate_world
 
-__all__ = ['create_items', 'create_npcs', 'create_rooms', 'ASCII_ARTS']
+__all__ = ['create_items', 'create_npcs', 'create_rooms', 'default_world', 'generate_world', 'ASCII_ARTS']
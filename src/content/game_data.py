@@ -1,5 +1,7 @@
 """Game content: ASCII art, items, rooms, NPCs"""
+from functools import lru_cache
 from ..core.entities import Item, Room, NPC
+from ..core.world import WorldTemplate
 
 ASCII_ARTS = {
     "cave_entrance": """
@@ -277,3 +279,10 @@ def create_rooms(items, npcs):
     rooms["cave_chamber"] = room_cave_chamber
 
     return rooms
+
+@lru_cache(maxsize=None)
+def default_world() -> WorldTemplate:
+    """The built-in world, compiled once per process and shared by every engine"""
+    items = create_items()
+    npcs = create_npcs()
+    return WorldTemplate.compile(items, npcs, create_rooms(items, npcs), start_room_id="cabin")
@@ -0,0 +1,85 @@
+"""Procedurally generated worlds for benchmarks and stress tests"""
+import math
+import random
+from typing import Dict
+from ..core.entities import Item, Room, NPC
+from ..core.world import WorldTemplate
+
+MATERIALS = ["铁", "铜", "银", "金", "骨", "木", "石", "水晶", "皮革", "黑曜石"]
+OBJECTS = ["匕首", "戒指", "护符", "卷轴", "药剂", "钥匙", "宝石", "碎片", "头盔", "盾牌"]
+ITEM_TYPES = ["misc", "material", "tool", "treasure", "document"]
+TERRAINS = ["荒野", "密林", "沼泽", "废墟", "峡谷", "洞窟"]
+
+# name, health, attack, defense at distance 0 from the start room
+MONSTER_KINDS = [
+    ("洞穴蝙蝠", 30, 8, 2),
+    ("森林狼", 50, 12, 5),
+    ("骷髅守卫", 80, 15, 8),
+]
+
+# direction, dx, dy
+DIRECTIONS = [("北", 0, -1), ("南", 0, 1), ("东", 1, 0), ("西", -1, 0)]
+
+def room_id(x: int, y: int) -> str:
+    return f"room_{x}_{y}"
+
+def generate_items(count: int, rng: random.Random) -> Dict[str, Item]:
+    items = {}
+    for idx in range(count):
+        name = f"{rng.choice(MATERIALS)}{rng.choice(OBJECTS)}{idx}"
+        items[name] = Item(name, name, f"一件编号为 {idx} 的{name}。", True,
+                           item_type=rng.choice(ITEM_TYPES), value=rng.randint(1, 100))
+    return items
+
+def generate_monster(kind: tuple, distance: int = 0) -> NPC:
+    """A monster whose stats grow with its distance from the start room"""
+    name, health, attack, defense = kind
+    scale = 1 + distance / 10
+    health = int(health * scale)
+    return NPC(
+        name=name,
+        description=f"一只游荡的{name}。",
+        dialogue={"default": "*咆哮*"},
+        health=health,
+        max_health=health,
+        attack_power=int(attack * scale),
+        defense_power=int(defense * scale),
+        hostile=True,
+    )
+
+def generate_world(room_count: int, items_per_room: int = 10, item_kinds: int = 500,
+                   monster_chance: float = 0.2, seed: int = 0) -> WorldTemplate:
+    """A square grid of rooms linked north/south/east/west, filled with random items and monsters.
+
+    The same arguments always produce the same world. Items are drawn from a
+    shared pool of ``item_kinds`` definitions, so a room can hold several
+    copies of the same item, just like after a player drops things.
+    """
+    rng = random.Random(seed)
+    items = generate_items(item_kinds, rng)
+    item_pool = list(items.values())
+    npcs = {kind[0]: generate_monster(kind) for kind in MONSTER_KINDS}
+
+    width = max(1, math.ceil(math.sqrt(room_count)))
+    rooms = {}
+    for idx in range(room_count):
+        x, y = idx % width, idx // width
+        terrain = rng.choice(TERRAINS)
+        room = Room(
+            name=room_id(x, y),
+            display_name=f"{terrain} ({x}, {y})",
+            description=f"一片{terrain}，四周寂静无声。",
+            items=rng.choices(item_pool, k=items_per_room) if item_pool else [],
+        )
+        if idx and rng.random() < monster_chance:
+            room.monsters.append(generate_monster(rng.choice(MONSTER_KINDS), x + y))
+        rooms[room.name] = room
+
+    for room in rooms.values():
+        _, x, y = room.name.split("_")
+        for direction, dx, dy in DIRECTIONS:
+            neighbour = room_id(int(x) + dx, int(y) + dy)
+            if neighbour in rooms:
+                room.add_exit(direction, neighbour)
+
+    return WorldTemplate.compile(items, npcs, rooms, start_room_id=room_id(0, 0))
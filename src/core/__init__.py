@@ -1,4 +1,7 @@
 """Core package"""
-from .entities import Item, Room, NPC, Player
+from .entities import Item, Room, NPC, Player, NamedCollection
+from .commands import Command, CommandRegistry
+from .world import WorldTemplate, SessionRooms
 
-__all__ = ['Item', 'Room', 'NPC', 'Player']
+__all__ = ['Item', 'Room', 'NPC', 'Player', 'NamedCollection', 'Command', 'CommandRegistry',
+           'WorldTemplate', 'SessionRooms']
@@ -0,0 +1,75 @@
+"""Command registry: handlers are declared once and dispatched with a single lookup"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+# Argument grammars understood by the registry
+NO_ARGS = "none"              # handler()
+OPTIONAL_TARGET = "optional"  # handler(target) if a target is given, else fallback()
+REQUIRED_TARGET = "required"  # handler(target) if a target is given, else warn(prompt)
+WORDS = "words"               # handler(words) with the whole command tokenized
+
+@dataclass(frozen=True)
+class Command:
+    name: str
+    handler: Callable
+    aliases: Tuple[str, ...] = ()
+    grammar: str = NO_ARGS
+    prompt: Optional[str] = None
+    fallback: Optional[Callable] = None
+
+class CommandRegistry:
+    def __init__(self, warn: Callable[[str], None]):
+        self.warn = warn
+        self.commands: Dict[str, Command] = {}
+        self._dispatch: Dict[str, Callable[[str, str], None]] = {}
+
+    def register(self, command: Command):
+        """Compile a command and bind it to its name and aliases"""
+        runner = self._compile(command)
+        self.commands[command.name] = command
+        self._dispatch[command.name] = runner
+        for alias in command.aliases:
+            self._dispatch[alias] = runner
+
+    def add_shortcut(self, word: str, expansion: str):
+        """Bind a word to a full command line, e.g. 'n' -> 'go 北'"""
+        verb, _, rest = expansion.partition(" ")
+        runner = self._dispatch[verb]
+        self._dispatch[word] = lambda command, _rest: runner(expansion, rest)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._dispatch
+
+    def dispatch(self, command: str, verb: str, rest: str) -> bool:
+        """Run the handler bound to verb; returns False if the verb is unknown"""
+        runner = self._dispatch.get(verb)
+        if runner is None:
+            return False
+        runner(command, rest)
+        return True
+
+    def _compile(self, command: Command) -> Callable[[str, str], None]:
+        handler = command.handler
+        if command.grammar == NO_ARGS:
+            return lambda _command, _rest: handler()
+        if command.grammar == WORDS:
+            return lambda full, _rest: handler(full.split())
+        if command.grammar == OPTIONAL_TARGET:
+            fallback = command.fallback
+            def run_optional(_command, rest):
+                target = " ".join(rest.split())
+                if target:
+                    handler(target)
+                else:
+                    fallback()
+            return run_optional
+        if command.grammar == REQUIRED_TARGET:
+            warn, prompt = self.warn, command.prompt
+            def run_required(_command, rest):
+                target = " ".join(rest.split())
+                if target:
+                    handler(target)
+                else:
+                    warn(prompt)
+            return run_required
+        raise ValueError(f"Unknown grammar '{command.grammar}' for command '{command.name}'")
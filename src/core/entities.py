@@ -1,5 +1,5 @@
 """Core game entities: Item, Room, NPC, Player"""
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Tuple
 from dataclasses import dataclass, field
 
 @dataclass
@@ -17,19 +17,103 @@ class Item:
     def __post_init__(self):
         self.name = self.name.lower()
 
+class NamedCollection:
+    """Insertion-ordered items or NPCs, indexed by lower-cased name and display name.
+
+    Lookup and removal by name are O(1) whatever the size of the collection;
+    iteration yields entries in the order they were added.
+    """
+    __slots__ = ("_entries", "_index", "_next_slot")
+
+    def __init__(self, entries: Iterable = ()):
+        self._entries: Dict[int, Any] = {}
+        self._index: Dict[str, Dict[int, Any]] = {}
+        self._next_slot = 0
+        for entry in entries:
+            self.append(entry)
+
+    @staticmethod
+    def _keys(entry) -> Tuple[str, ...]:
+        name = entry.name.lower()
+        display_name = getattr(entry, "display_name", name).lower()
+        return (name,) if display_name == name else (name, display_name)
+
+    def append(self, entry):
+        slot = self._next_slot
+        self._next_slot += 1
+        self._entries[slot] = entry
+        for key in self._keys(entry):
+            self._index.setdefault(key, {})[slot] = entry
+
+    def _pop_slot(self, slot: int):
+        entry = self._entries.pop(slot)
+        for key in self._keys(entry):
+            bucket = self._index[key]
+            del bucket[slot]
+            if not bucket:
+                del self._index[key]
+        return entry
+
+    def _slot_by_name(self, name: str) -> Optional[int]:
+        """Slot of the first entry whose name (not display name) matches"""
+        key = name.lower()
+        for slot, entry in self._index.get(key, {}).items():
+            if self._keys(entry)[0] == key:
+                return slot
+        return None
+
+    def find(self, name: str):
+        """First entry whose name or display name matches, ignoring case"""
+        bucket = self._index.get(name.lower())
+        return next(iter(bucket.values())) if bucket else None
+
+    def has(self, name: str) -> bool:
+        return self._slot_by_name(name) is not None
+
+    def pop(self, name: str):
+        """Remove and return the first entry with this name, or None"""
+        slot = self._slot_by_name(name)
+        return None if slot is None else self._pop_slot(slot)
+
+    def remove(self, entry):
+        """Remove this exact entry (by identity)"""
+        for slot, candidate in self._index.get(self._keys(entry)[0], {}).items():
+            if candidate is entry:
+                self._pop_slot(slot)
+                return
+        raise ValueError(f"{entry.name} is not in the collection")
+
+    def first(self):
+        return next(iter(self._entries.values()), None)
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._entries.values()))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"NamedCollection({list(self._entries.values())!r})"
+
 @dataclass
 class Room:
     name: str
     display_name: str
     description: str
     exits: Dict[str, str] = field(default_factory=dict)
-    items: List[Item] = field(default_factory=list)
-    npcs: List['NPC'] = field(default_factory=list)
+    items: NamedCollection = field(default_factory=NamedCollection)
+    npcs: NamedCollection = field(default_factory=NamedCollection)
     properties: Dict[str, Any] = field(default_factory=dict)
     ascii_art_on_enter: Optional[str] = None
     ambient_sound: Optional[str] = None
     visited_art_shown: bool = False
-    monsters: List['NPC'] = field(default_factory=list)
+    monsters: NamedCollection = field(default_factory=NamedCollection)
+
+    def __post_init__(self):
+        # Content code builds rooms from plain lists
+        self.items = NamedCollection(self.items)
+        self.npcs = NamedCollection(self.npcs)
+        self.monsters = NamedCollection(self.monsters)
 
     def add_exit(self, direction: str, room_id: str):
         self.exits[direction.lower()] = room_id
@@ -38,14 +122,22 @@ class Room:
         self.items.append(item)
 
     def remove_item(self, item_name: str) -> Optional[Item]:
-        item_name_lower = item_name.lower()
-        for i, item in enumerate(self.items):
-            if item.name == item_name_lower:
-                return self.items.pop(i)
-        return None
+        return self.items.pop(item_name)
 
     def has_item(self, item_name: str) -> bool:
-        return any(item.name == item_name.lower() for item in self.items)
+        return self.items.has(item_name)
+
+    def find_item(self, name: str) -> Optional[Item]:
+        return self.items.find(name)
+
+    def find_npc(self, name: str) -> Optional['NPC']:
+        return self.npcs.find(name)
+
+    def find_monster(self, name: str) -> Optional['NPC']:
+        return self.monsters.find(name)
+
+    def remove_monster(self, monster: 'NPC'):
+        self.monsters.remove(monster)
 
 @dataclass
 class NPC:
@@ -67,7 +159,7 @@ class NPC:
 @dataclass
 class Player:
     current_room_id: str
-    inventory: List[Item] = field(default_factory=list)
+    inventory: NamedCollection = field(default_factory=NamedCollection)
     health: int = 100
     max_health: int = 100
     score: int = 0
@@ -81,19 +173,21 @@ class Player:
     actions_count: int = 0
     history: List[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        self.inventory = NamedCollection(self.inventory)
+
     def add_to_inventory(self, item: Item):
         self.inventory.append(item)
         self.actions_count += 1
 
     def remove_from_inventory(self, item_name: str) -> Optional[Item]:
-        item_name_lower = item_name.lower()
-        for i, item in enumerate(self.inventory):
-            if item.name == item_name_lower:
-                return self.inventory.pop(i)
-        return None
+        return self.inventory.pop(item_name)
 
     def has_item(self, item_name: str) -> bool:
-        return any(item.name == item_name.lower() for item in self.inventory)
+        return self.inventory.has(item_name)
+
+    def find_item(self, name: str) -> Optional[Item]:
+        return self.inventory.find(name)
 
     def take_damage(self, damage: int):
         actual_damage = max(1, damage - self.defense)
@@ -0,0 +1,154 @@
+"""Shared world template and the per-session room overlay built on top of it"""
+import copy
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple
+from .entities import Item, Room, NPC
+from .world_map import MapLayout
+
+@dataclass(frozen=True)
+class RoomTemplate:
+    name: str
+    display_name: str
+    description: str
+    exits: Mapping
+    items: Tuple[Item, ...]
+    npcs: Tuple[NPC, ...]
+    monsters: Tuple[NPC, ...]
+    properties: Mapping
+    ascii_art_on_enter: Optional[str] = None
+    ambient_sound: Optional[str] = None
+
+    @classmethod
+    def from_room(cls, room: Room) -> "RoomTemplate":
+        return cls(
+            name=room.name,
+            display_name=room.display_name,
+            description=room.description,
+            exits=MappingProxyType(dict(room.exits)),
+            items=tuple(room.items),
+            npcs=tuple(room.npcs),
+            monsters=tuple(room.monsters),
+            properties=MappingProxyType(dict(room.properties)),
+            ascii_art_on_enter=room.ascii_art_on_enter,
+            ambient_sound=room.ambient_sound,
+        )
+
+    def instantiate(self) -> Room:
+        """A private, mutable copy of this room for one session.
+
+        Items and peaceful NPCs are never mutated during play and stay shared;
+        monsters take damage, so each session fights its own copies.
+        """
+        return Room(
+            name=self.name,
+            display_name=self.display_name,
+            description=self.description,
+            exits=dict(self.exits),
+            items=list(self.items),
+            npcs=list(self.npcs),
+            properties=dict(self.properties),
+            ascii_art_on_enter=self.ascii_art_on_enter,
+            ambient_sound=self.ambient_sound,
+            monsters=[copy.copy(monster) for monster in self.monsters],
+        )
+
+@dataclass(frozen=True)
+class WorldTemplate:
+    """Static world content, compiled once and shared read-only by every session"""
+    items: Mapping
+    npcs: Mapping
+    rooms: Mapping
+    start_room_id: str = "cabin"
+
+    @classmethod
+    def compile(cls, items: Dict[str, Item], npcs: Dict[str, NPC], rooms: Dict[str, Room],
+                start_room_id: str = "cabin") -> "WorldTemplate":
+        return cls(
+            items=MappingProxyType(dict(items)),
+            npcs=MappingProxyType(dict(npcs)),
+            rooms=MappingProxyType({room_id: RoomTemplate.from_room(room) for room_id, room in rooms.items()}),
+            start_room_id=start_room_id,
+        )
+
+    @cached_property
+    def layout(self) -> MapLayout:
+        """Grid positions of every room for the mini-map, shared by all sessions of this world"""
+        return MapLayout.compute(self)
+
+EMPTY_WORLD = WorldTemplate.compile({}, {}, {})
+
+class SessionRooms(Mapping):
+    """Copy-on-access overlay of a world template.
+
+    A room is copied out of the template the first time a session looks it
+    up, so untouched rooms cost nothing per session and are by definition in
+    their template state. Every lookup also marks the room dirty: rooms are
+    only ever changed through a lookup, so saves need only look at those.
+
+    After `restore`, rooms from a save are hydrated the same way: the saved
+    state is applied when the room is first looked up, not at load time.
+    """
+
+    def __init__(self, template: WorldTemplate = EMPTY_WORLD):
+        self.template = template
+        self._rooms: Dict[str, Room] = {}
+        self._dirty: Set[str] = set()
+        self._saved: Dict[str, Dict[str, Any]] = {}
+        self._hydrate: Optional[Callable[[Room, Dict[str, Any]], None]] = None
+
+    def __getitem__(self, room_id: str) -> Room:
+        room = self._rooms.get(room_id)
+        if room is None:
+            room = self.template.rooms[room_id].instantiate()
+            saved = self._saved.pop(room_id, None)
+            if saved:
+                self._hydrate(room, saved)
+            self._rooms[room_id] = room
+        self._dirty.add(room_id)
+        return room
+
+    def get(self, room_id: str, default: Any = None) -> Optional[Room]:
+        room = self._rooms.get(room_id)
+        if room is not None:
+            self._dirty.add(room_id)
+            return room
+        if room_id in self.template.rooms:
+            return self[room_id]
+        return default
+
+    def __contains__(self, room_id: object) -> bool:
+        return room_id in self.template.rooms
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.template.rooms)
+
+    def __len__(self) -> int:
+        return len(self.template.rooms)
+
+    def touched(self) -> Dict[str, Room]:
+        """Rooms this session has copied out of the template"""
+        return self._rooms
+
+    def restore(self, saved: Mapping, hydrate: Callable[[Room, Dict[str, Any]], None]):
+        """Reset to the template, then overlay saved room states lazily via hydrate(room, state)"""
+        self.reset()
+        self._saved = {room_id: state for room_id, state in saved.items() if room_id in self.template.rooms}
+        self._hydrate = hydrate
+
+    def saved_states(self) -> Dict[str, Dict[str, Any]]:
+        """Saved states of restored rooms that have not been looked up yet"""
+        return self._saved
+
+    def take_dirty(self) -> Set[str]:
+        """Rooms looked up since the previous call"""
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def reset(self):
+        """Drop every private copy, returning the world to its template state"""
+        self._rooms.clear()
+        self._dirty.clear()
+        self._saved = {}
@@ -0,0 +1,174 @@
+"""Grid layout of a world's exit graph and the per-session mini-map drawn from it"""
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from .world import WorldTemplate
+
+Cell = Tuple[int, int]
+
+# Where an exit leads on the grid; 上/下 go diagonally, other named exits
+# (进入洞穴, 离开密室, ...) take the nearest free cell
+DIRECTION_OFFSETS: Dict[str, Cell] = {
+    "北": (0, -1), "南": (0, 1), "东": (1, 0), "西": (-1, 0),
+    "上": (-1, -1), "下": (1, 1),
+}
+
+# Search order around a cell for a free spot: sides first, then diagonals
+_NEIGHBOUR_ORDER = ((1, 0), (0, 1), (-1, 0), (0, -1), (1, 1), (-1, 1), (-1, -1), (1, -1))
+
+@dataclass(frozen=True)
+class MapLayout:
+    """Every room of a world placed on a grid, computed once per world.
+
+    Rooms are placed breadth-first from the start room, following exits in
+    both directions so a one-way exit still positions its target. A room
+    whose preferred cell is taken goes to the nearest free one.
+    """
+    positions: Dict[str, Cell]
+    rooms_at: Dict[Cell, str]
+    links: Dict[str, FrozenSet[str]]  # rooms joined by an exit either way
+
+    @classmethod
+    def compute(cls, world: "WorldTemplate") -> "MapLayout":
+        neighbours: Dict[str, List[Tuple[str, Optional[Cell]]]] = {room_id: [] for room_id in world.rooms}
+        for room_id, room in world.rooms.items():
+            for direction, target in room.exits.items():
+                if target not in neighbours or target == room_id:
+                    continue
+                offset = DIRECTION_OFFSETS.get(direction)
+                neighbours[room_id].append((target, offset))
+                neighbours[target].append((room_id, (-offset[0], -offset[1]) if offset else None))
+
+        positions: Dict[str, Cell] = {}
+        rooms_at: Dict[Cell, str] = {}
+
+        def place(room_id: str, cell: Cell):
+            cell = _free_cell(cell, rooms_at)
+            positions[room_id] = cell
+            rooms_at[cell] = room_id
+
+        # The start room first, then any part of the world it cannot reach, to the east
+        order = [world.start_room_id] if world.start_room_id in neighbours else []
+        order.extend(room_id for room_id in world.rooms if room_id != world.start_room_id)
+        for root in order:
+            if root in positions:
+                continue
+            place(root, (max((x for x, _ in rooms_at), default=-2) + 2, 0))
+            queue = deque([root])
+            while queue:
+                room_id = queue.popleft()
+                x, y = positions[room_id]
+                for target, offset in neighbours[room_id]:
+                    if target not in positions:
+                        dx, dy = offset or (1, 0)
+                        place(target, (x + dx, y + dy))
+                        queue.append(target)
+
+        links = {room_id: frozenset(target for target, _ in targets) for room_id, targets in neighbours.items()}
+        return cls(positions, rooms_at, links)
+
+def _free_cell(cell: Cell, rooms_at: Dict[Cell, str]) -> Cell:
+    """`cell` if free, else the closest free cell in growing rings around it"""
+    if cell not in rooms_at:
+        return cell
+    x, y = cell
+    radius = 1
+    while True:
+        for dx, dy in _NEIGHBOUR_ORDER:
+            candidate = (x + dx * radius, y + dy * radius)
+            if candidate not in rooms_at:
+                return candidate
+        for dx in range(-radius, radius + 1):
+            for dy in (-radius, radius):
+                for candidate in ((x + dx, y + dy), (x + dy, y + dx)):
+                    if candidate not in rooms_at:
+                        return candidate
+        radius += 1
+
+class MiniMap:
+    """One session's explored part of a MapLayout, drawn around the player.
+
+    Visits are folded in incrementally, and the window around the player is
+    redrawn only after the player moves or explores something new, so its
+    cost depends on the window size, not on the size of the world.
+    """
+
+    def __init__(self, layout: MapLayout, radius: int = 3):
+        self.layout = layout
+        self.radius = radius
+        self.visited: Set[str] = set()
+        self.version = 0
+        self._source: Optional[Sequence[str]] = None  # the visited list folded in so far
+        self._seen = 0
+        self._drawn: Optional[Tuple[str, int]] = None
+        self._rows: List[str] = []
+
+    def visit(self, room_id: str):
+        if room_id not in self.visited:
+            self.visited.add(room_id)
+            self.version += 1
+
+    def sync(self, visited_rooms: Sequence[str]):
+        """Catch up with the player's visited list, which only grows until a load replaces it"""
+        if visited_rooms is not self._source or self._seen > len(visited_rooms):
+            self.visited.clear()
+            self.version += 1
+            self._source, self._seen = visited_rooms, 0
+        for room_id in visited_rooms[self._seen:]:
+            self.visit(room_id)
+        self._seen = len(visited_rooms)
+
+    def render(self, current_room: str) -> List[str]:
+        """Rich-markup rows of the map around `current_room`; empty if it is not on the map"""
+        if (current_room, self.version) == self._drawn:
+            return self._rows
+        center = self.layout.positions.get(current_room)
+        rows: List[str] = []
+        if center is not None:
+            rows = self._draw(current_room, center)
+        self._drawn = (current_room, self.version)
+        self._rows = rows
+        return rows
+
+    def _symbol(self, room_id: Optional[str], current_room: str) -> str:
+        if room_id is None:
+            return " "
+        if room_id == current_room:
+            return "[bold red]X[/]"
+        if room_id in self.visited:
+            return "[green]●[/]"
+        if self.layout.links[room_id] & self.visited:
+            return "[dim]?[/]"
+        return " "
+
+    def _linked(self, room_id: Optional[str], other: Optional[str]) -> bool:
+        """An exit joins the two rooms and the player has been to one of them"""
+        return (room_id is not None and other is not None and other in self.layout.links[room_id]
+                and (room_id in self.visited or other in self.visited))
+
+    def _draw(self, current_room: str, center: Cell) -> List[str]:
+        rooms_at = self.layout.rooms_at
+        cx, cy = center
+        xs = range(cx - self.radius, cx + self.radius + 1)
+        rows = []
+        for y in range(cy - self.radius, cy + self.radius + 1):
+            line, below = [], []
+            for x in xs:
+                room_id = rooms_at.get((x, y))
+                line.append(self._symbol(room_id, current_room))
+                line.append("[blue]───[/]" if self._linked(room_id, rooms_at.get((x + 1, y))) else "   ")
+                below.append("[blue]│[/]" if self._linked(room_id, rooms_at.get((x, y + 1))) else " ")
+                diagonal = (self._linked(room_id, rooms_at.get((x + 1, y + 1))),
+                            self._linked(rooms_at.get((x + 1, y)), rooms_at.get((x, y + 1))))
+                below.append(" [blue]╲[/] " if diagonal[0] else " [blue]╱[/] " if diagonal[1] else "   ")
+            rows.append("".join(line).rstrip())
+            rows.append("".join(below).rstrip())
+        rows.pop()
+        # Drop rows that show nothing at the top and bottom of the window
+        while rows and not rows[0].strip():
+            rows.pop(0)
+        while rows and not rows[-1].strip():
+            rows.pop()
+        return rows
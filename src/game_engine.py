@@ -1,47 +1,195 @@
 """Main game engine with all enhanced features"""
 import os
-import random
 import time
-from typing import Optional, Dict, List
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Dict, List, Iterable, Tuple, Any
 from .core.entities import Player
-from .ui.terminal_ui import ui
+from .core.commands import Command, CommandRegistry, OPTIONAL_TARGET, REQUIRED_TARGET, WORDS
+from .ui import BaseUI, NullUI, RecordingUI, UIEvent, get_default_ui
 from .systems.audio import init_audio
 from .systems.game_state import GameState
-from .systems.combat import CombatSystem, QuestSystem, Quest
+from .systems.save_store import SaveStore
+from .systems.rng import SessionRandom
+from .systems.combat import CombatSystem, QuestSystem, Quest, Objective
 from .systems.achievements import AchievementSystem, CraftingSystem, init_crafting_recipes
-from .content.game_data import create_items, create_npcs, create_rooms, ASCII_ARTS
+from .systems.events import (
+    EventBus, GameEvent, AchievementUnlocked, ItemCrafted, ItemDropped, ItemTaken, ItemUsed,
+    MonsterDefeated, NpcTalkedTo, PlayerStatChanged, PuzzleSolved, QuestCompleted, QuestProgress,
+    RoomEntered,
+)
+from .core.world import WorldTemplate, SessionRooms
+from .core.world_map import MiniMap
+from .content.game_data import default_world, ASCII_ARTS
+
+# Player fields compared before and after each headless step
+TRACKED_PLAYER_FIELDS = (
+    "current_room_id", "health", "max_health", "level", "experience",
+    "gold", "score", "strength", "defense", "intelligence",
+)
+
+# Journal entries for solved puzzles
+PUZZLE_JOURNAL = {
+    "fireplace_lit": "点燃了火把",
+    "cellar_door_unlocked": "解锁地下室入口",
+    "coffin_opened": "撬开石棺",
+}
+
+@dataclass
+class CommandResult:
+    """Outcome of one headless command"""
+    command: str
+    replies: List[str] = field(default_factory=list)
+    events: List[UIEvent] = field(default_factory=list)
+    game_events: List[GameEvent] = field(default_factory=list)
+    delta: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    won: bool = False
+    lost: bool = False
+    running: bool = True
+    error: Optional[str] = None
+
+@dataclass
+class PendingPrompt:
+    """A prompt waiting for the player's next line, when the engine may not block for it"""
+    text: str
+    resume: Callable[[str], None]
+    command: str = ""  # the command that asked, with the replies given so far, for the replay log
+    replies: List[str] = field(default_factory=list)
+
+COMBAT_PROMPT = "\n[攻击/逃跑] > "
 
 class GameEngine:
-    def __init__(self, save_dir: str, sounds_dir: str):
+    def __init__(self, save_dir: str, sounds_dir: str, headless: bool = False,
+                 ui: Optional[BaseUI] = None, auto_combat: Optional[bool] = None,
+                 world: Optional[WorldTemplate] = None, save_store: Optional[SaveStore] = None,
+                 seed: Optional[int] = None, rng: Optional[SessionRandom] = None):
         self.save_dir = save_dir
         self.sounds_dir = sounds_dir
-        self.audio = init_audio(sounds_dir)
-        self.game_state = GameState(save_dir)
-        self.combat_system = CombatSystem(self.audio)
-        self.quest_system = QuestSystem()
-        self.achievement_system = AchievementSystem()
+        self.headless = headless
+        if ui is None:
+            ui = RecordingUI() if headless else get_default_ui()
+        self.ui = ui
+        self.audio = None if headless else init_audio(sounds_dir)
+        self.game_state = GameState(save_dir, store=save_store)
+        # Every chance roll of this session draws from its own stream, never the global one
+        self.rng = rng if rng is not None else SessionRandom(seed)
+        self.events = EventBus()
+        self._game_events: List[GameEvent] = []
+        if auto_combat is None:
+            auto_combat = headless
+        self.paced = not headless  # dramatic pauses between messages; off for headless runs and replays
+        self.combat_system = CombatSystem(self.audio, auto_mode=auto_combat, ui=self.ui, paced=not headless,
+                                          rng=self.rng)
+        self.quest_system = QuestSystem(ui=self.ui, events=self.events)
+        self.achievement_system = AchievementSystem(self.events)
         self.crafting_system = CraftingSystem()
         self.flavor_events = self._init_flavor_events()
         self.intro_quest: Optional[Quest] = None
         self.is_running = True
-        self.command_aliases = {
-            'n': 'go 北', 's': 'go 南', 'e': 'go 东', 'w': 'go 西',
-            't': 'take', 'd': 'drop', 'u': 'use', 'x': 'examine',
-        }
+        self.outcome: Optional[str] = None  # "won", "lost" or "quit" once the game ends
+        self.autosave_enabled = not headless
+        self.recorder = None  # a replay.SessionRecorder logging every command, if attached
+        # Hosts that cannot block on get_input (the server) set this: a prompt then
+        # becomes pending_prompt and the next command is taken as its answer
+        self.suspend_prompts = False
+        self.pending_prompt: Optional[PendingPrompt] = None
+        self.commands = self._build_command_registry()
         self.hints = self._init_hints()
-        self._setup_world()
-
-    def _setup_world(self):
-        self.game_state.items = create_items()
-        self.game_state.npcs = create_npcs()
-        self.game_state.rooms = create_rooms(self.game_state.items, self.game_state.npcs)
-        self.game_state.player = Player(current_room_id="cabin")
-        starting_room = self.game_state.rooms.get("cabin")
+        self._setup_world(world or default_world())
+        self._subscribe_listeners()
+        self.ui.drain()
+
+    def _setup_world(self, world: WorldTemplate):
+        self.game_state.items = world.items
+        self.game_state.npcs = world.npcs
+        self.game_state.rooms = SessionRooms(world)
+        self.mini_map = MiniMap(world.layout)
+        self.game_state.player = Player(current_room_id=world.start_room_id)
+        starting_room = self.game_state.rooms.get(world.start_room_id)
         if starting_room:
-            self.game_state.player.visit_room("cabin", starting_room.display_name)
+            self.game_state.player.visit_room(world.start_room_id, starting_room.display_name)
         self._init_intro_quest()
         init_crafting_recipes(self.crafting_system)
 
+    def _subscribe_listeners(self):
+        """Wire achievements, quests, the journal, audio and the UI to game events"""
+        bus = self.events
+        self.achievement_system.attach(bus, self.game_state)
+        self.game_state.register_component("achievements", self.achievement_system)
+        bus.subscribe(AchievementUnlocked, lambda e: self.ui.print_success(f"🏆 成就解锁：{e.name}"))
+        self.quest_system.attach(bus, self.game_state)
+        self.game_state.register_component("quests", self.quest_system)
+        self.game_state.register_component("rng", self.rng)
+
+        bus.subscribe(RoomEntered, self._journal_room_entered)
+        bus.subscribe(ItemTaken, lambda e: self._log_action(f"拾取 {e.display_name}"))
+        bus.subscribe(ItemDropped, self._journal_item_dropped)
+        bus.subscribe(ItemUsed, self._journal_item_used)
+        bus.subscribe(NpcTalkedTo, lambda e: self._log_action(f"与 {e.npc_name} 对话"))
+        bus.subscribe(MonsterDefeated, lambda e: self._log_action(f"击败了 {e.monster_name}"))
+        bus.subscribe(PuzzleSolved, self._journal_puzzle_solved)
+        bus.subscribe(QuestProgress, lambda e: self._log_action(f"任务进度：{e.quest_name} - {e.objective}"))
+        bus.subscribe(QuestCompleted, lambda e: self._log_action(f"任务完成：{e.quest_name}"))
+
+        if self.audio:
+            self.audio.attach(bus)
+        if self.headless:
+            bus.subscribe(GameEvent, self._game_events.append)
+
+    def _journal_room_entered(self, event: RoomEntered):
+        verb = "快速旅行到" if event.fast_travel else "移动至"
+        self._log_action(f"{verb} {event.display_name}")
+
+    def _journal_item_used(self, event: ItemUsed):
+        # Uses that solve a puzzle are journaled by the puzzle entry alone
+        if event.consumed:
+            self._log_action(f"使用{event.display_name}")
+
+    def _journal_item_dropped(self, event: ItemDropped):
+        room = self.game_state.rooms.get(event.room_id)
+        self._log_action(f"丢弃 {event.display_name} 在 {room.display_name if room else event.room_id}")
+
+    def _journal_puzzle_solved(self, event: PuzzleSolved):
+        entry = PUZZLE_JOURNAL.get(event.puzzle_id)
+        if entry:
+            self._log_action(entry)
+
+    def _build_command_registry(self) -> CommandRegistry:
+        """Declare every command once; dispatch is a single dict lookup afterwards"""
+        registry = CommandRegistry(warn=lambda message: self.ui.print_warning(message))
+        for command in (
+            Command("go", self.move_player, grammar=REQUIRED_TARGET, prompt="去哪个方向？"),
+            Command("look", self.examine_target, ("l",), OPTIONAL_TARGET, fallback=self.look_around),
+            Command("examine", self.examine_target, ("x",), REQUIRED_TARGET, prompt="检查什么？"),
+            Command("take", self.take_item, ("t",), REQUIRED_TARGET, prompt="拿什么？"),
+            Command("drop", self.drop_item, ("d",), REQUIRED_TARGET, prompt="丢什么？"),
+            Command("use", self._handle_use_command, ("u",), WORDS),
+            Command("inventory", self.show_inventory, ("i",)),
+            Command("search", self.search_target, grammar=REQUIRED_TARGET, prompt="搜索什么？"),
+            Command("talk", self._handle_talk_command, grammar=WORDS),
+            Command("unlock", self._handle_unlock_command, grammar=WORDS),
+            Command("open", self.open_target, grammar=REQUIRED_TARGET, prompt="打开什么？"),
+            Command("attack", self.attack_monster, grammar=OPTIONAL_TARGET, fallback=self.attack_monster),
+            Command("stats", self.show_stats),
+            Command("help", self.show_help, ("h",)),
+            Command("save", self.save_game),
+            Command("load", self.load_game),
+            Command("quests", self.show_quests),
+            Command("quit", self.quit_game, ("q",)),
+            Command("hint", self.show_hint),
+            Command("map", self.show_map),
+            Command("achievements", self.show_achievements),
+            Command("craft", self.show_craft_menu),
+            Command("journal", self.show_journal),
+            Command("rest", self.rest),
+            Command("travel", self.fast_travel, grammar=OPTIONAL_TARGET, fallback=self.show_travel_menu),
+        ):
+            registry.register(command)
+
+        for word, expansion in (("n", "go 北"), ("s", "go 南"), ("e", "go 东"), ("w", "go 西")):
+            registry.add_shortcut(word, expansion)
+        return registry
+
     def _init_hints(self) -> Dict[str, List[str]]:
         """Initialize contextual hints for each room"""
         return {
@@ -82,7 +230,11 @@ class GameEngine:
             quest_id="intro_path",
             name="重燃火种",
             description="点亮光源并找到地下室的秘密。",
-            objectives=["点燃火把", "解锁地下室", "取得远古神像"],
+            objectives=[
+                Objective.on("点燃火把", PuzzleSolved, puzzle_id="fireplace_lit"),
+                Objective.on("解锁地下室", PuzzleSolved, puzzle_id="cellar_door_unlocked"),
+                Objective.on("取得远古神像", ItemTaken, item_name="远古神像"),
+            ],
             rewards={"experience": 60, "score": 20}
         )
         self.quest_system.add_quest(quest)
@@ -93,7 +245,11 @@ class GameEngine:
             quest_id="forest_explorer",
             name="森林探险者",
             description="探索森林的每一个角落。",
-            objectives=["探索森林小径", "进入森林深处", "发现隐藏的洞穴"],
+            objectives=[
+                Objective.on("探索森林小径", RoomEntered, room_id="forest_path"),
+                Objective.on("进入森林深处", RoomEntered, room_id="deep_forest"),
+                Objective.on("发现隐藏的洞穴", PuzzleSolved, puzzle_id="cave_found"),
+            ],
             rewards={"experience": 40, "score": 15, "gold": 50}
         )
         self.quest_system.add_quest(forest_quest)
@@ -103,7 +259,11 @@ class GameEngine:
             quest_id="monster_hunter",
             name="怪物猎人",
             description="击败游荡在这片土地上的危险生物。",
-            objectives=["击败洞穴蝙蝠", "击败森林狼", "击败骷髅守卫"],
+            objectives=[
+                Objective.on("击败洞穴蝙蝠", MonsterDefeated, monster_name="洞穴蝙蝠"),
+                Objective.on("击败森林狼", MonsterDefeated, monster_name="森林狼"),
+                Objective.on("击败骷髅守卫", MonsterDefeated, monster_name="骷髅守卫"),
+            ],
             rewards={"experience": 100, "score": 30, "gold": 100}
         )
         self.quest_system.add_quest(monster_quest)
@@ -116,127 +276,224 @@ class GameEngine:
     def _maybe_trigger_flavor_event(self, room):
         """Show occasional flavor text to keep areas lively"""
         events = self.flavor_events.get(room.name, [])
-        if events and random.random() < 0.35:
-            ui.print_message(random.choice(events), "dim")
-
-    def _update_intro_objective(self, index: int):
-        """Mark intro quest progress when applicable"""
-        if not self.intro_quest:
-            return
-        before = self.intro_quest.completed_objectives[index] if 0 <= index < len(self.intro_quest.completed_objectives) else False
-        self.intro_quest.complete_objective(index)
-        if self.intro_quest.completed_objectives[index] and not before:
-            self._log_action(f"任务进度：{self.intro_quest.name} - {self.intro_quest.objectives[index]}")
-        if self.intro_quest.is_completed():
-            if self.quest_system.complete_quest(self.intro_quest.quest_id, self.game_state.player):
-                self._log_action(f"任务完成：{self.intro_quest.name}")
-
-    def start_game(self):
-        ui.clear()
-        ui.print_header("迷失的宝藏猎人 (The Lost Treasure Hunter)")
-        ui.print_message("欢迎来到《迷失的宝藏猎人》！输入 'help' 查看指令。", "green")
-        if self.intro_quest:
-            ui.print_success(f"新任务：{self.intro_quest.name}")
-            ui.print_message(self.intro_quest.description, "white")
-        self.look_around()
-        self._handle_initial_dialogue()
+        if events and self.rng.random() < 0.35:
+            self.ui.print_message(self.rng.choice(events), "dim")
+
+    def start_game(self, intro: bool = True):
+        """Run the interactive loop; pass intro=False when the intro already ran (or was replayed)"""
+        if intro:
+            self.play_intro()
 
         while self.is_running:
             try:
-                # Show status bar
-                player = self.game_state.player
-                current_room = self.game_state.rooms.get(player.current_room_id)
-                if current_room:
-                    ui.print_status_bar(
-                        player.health, player.max_health, player.level,
-                        player.experience, current_room.display_name, player.gold
-                    )
-
-                command = ui.get_input()
+                self.show_status_bar()
+                command = self.ui.get_input()
                 if command:
-                    # Handle command aliases
-                    if command in self.command_aliases:
-                        command = self.command_aliases[command]
-
-                    self.process_command(command)
-                    self._check_game_state()
-
-                    # Auto-save check
-                    if self.game_state.should_auto_save():
-                        if self.game_state.auto_save():
-                            ui.print_message("游戏已自动保存", "dim")
+                    self._run_command(command)
 
             except KeyboardInterrupt:
-                ui.print_warning("\n游戏已中断")
+                self.ui.print_warning("\n游戏已中断")
                 self.is_running = False
             except Exception as e:
-                ui.print_error(f"发生错误: {e}")
+                self.ui.print_error(f"发生错误: {e}")
+
+        self.close()
 
+    def close(self):
+        """Finish the session: stop ambient sound and wait for queued saves to reach disk"""
         if self.audio:
             self.audio.stop_ambient()
+        if self.recorder:
+            self.recorder.close()
+        self.ui.close()
+        self.game_state.flush()
+
+    def play_intro(self):
+        with self.ui.batch():
+            self.show_intro()
+
+    def show_intro(self):
+        self.ui.clear()
+        self.ui.print_header("迷失的宝藏猎人 (The Lost Treasure Hunter)")
+        self.ui.print_message("欢迎来到《迷失的宝藏猎人》！输入 'help' 查看指令。", "green")
+        if self.intro_quest:
+            self.ui.print_success(f"新任务：{self.intro_quest.name}")
+            self.ui.print_message(self.intro_quest.description, "white")
+        self.look_around()
+        self._handle_initial_dialogue()
+
+    def show_status_bar(self):
+        player = self.game_state.player
+        current_room = self.game_state.rooms.get(player.current_room_id)
+        if current_room:
+            self.ui.print_status_bar(
+                player.health, player.max_health, player.level,
+                player.experience, current_room.display_name, player.gold
+            )
+
+    def _run_command(self, command: str):
+        """One full turn: dispatch (or answer the pending prompt), check win/lose, auto-save, log for replay"""
+        self.ui.consumed_replies = []
+        prompt, self.pending_prompt = self.pending_prompt, None
+        try:
+            # The turn's output reaches the terminal in one write, or at its first prompt
+            with self.ui.batch():
+                watch_stats = self.events.wants(PlayerStatChanged)
+                before = self._player_stats() if watch_stats else None
+                if prompt is None:
+                    self.process_command(command)
+                else:
+                    reply = command.strip().lower()
+                    self.ui.consumed_replies.append(reply)
+                    prompt.resume(reply)
+                if watch_stats:
+                    after = self._player_stats()
+                    for name, old in before.items():
+                        if after[name] != old:
+                            self.events.publish(PlayerStatChanged(name, old, after[name]))
+                self._check_game_state()
+
+                # Never in the middle of a fight or menu, as when prompts block
+                if (self.autosave_enabled and self.pending_prompt is None
+                        and self.game_state.should_auto_save()):
+                    if self.game_state.auto_save():
+                        self.ui.print_message("游戏已自动保存", "dim")
+        finally:
+            # A suspended command is logged once its last prompt is answered, as if it had blocked
+            replies = self.ui.consumed_replies
+            if prompt is not None:
+                command, replies = prompt.command, prompt.replies + replies
+            if self.pending_prompt is not None:
+                self.pending_prompt.command, self.pending_prompt.replies = command, replies
+            elif self.recorder:
+                self.recorder.record(command, replies)
+
+    def _ask(self, text: str, resume: Callable[[str], None]) -> Optional[str]:
+        """The player's answer to a prompt, or None when prompts are suspended.
+
+        In that case nothing blocks: the prompt is kept as pending_prompt and
+        resume(answer) runs when the answer arrives as the next command.
+        """
+        if self.suspend_prompts:
+            self.pending_prompt = PendingPrompt(text, resume)
+            return None
+        return self.ui.get_input(text)
+
+    def set_ui(self, ui: BaseUI):
+        """Switch rendering backend, including for the systems that print"""
+        self.ui = ui
+        self.combat_system.ui = ui
+        self.quest_system.ui = ui
+
+    def random_state(self) -> Any:
+        """State of the random stream the game draws from, for keyframes"""
+        return self.rng.getstate()
+
+    def set_random_state(self, state: Any):
+        # States that went through JSON come back with lists where tuples were
+        self.rng.setstate(tuple(tuple(part) if isinstance(part, list) else part for part in state))
+
+    @contextmanager
+    def fast_forward(self, ui: Optional[BaseUI] = None):
+        """Re-run commands without sound, pacing, saving or recording, rendering to ui (default: nowhere)"""
+        saved = (self.ui, self.paced, self.combat_system.paced, self.autosave_enabled, self.recorder)
+        self.set_ui(ui if ui is not None else NullUI())
+        self.paced = False
+        self.combat_system.paced = False
+        self.autosave_enabled = False
+        self.recorder = None
+        self.game_state.saves_suspended = True
+        if self.audio:
+            audio_enabled, self.audio.enabled = self.audio.enabled, False
+        try:
+            yield
+        finally:
+            ui, self.paced, self.combat_system.paced, self.autosave_enabled, self.recorder = saved
+            self.set_ui(ui)
+            self.game_state.saves_suspended = False
+            if self.audio:
+                self.audio.enabled = audio_enabled
+
+    def step(self, command: str, replies: Iterable[str] = ()) -> CommandResult:
+        """Run one command headlessly; replies answer any prompt it raises"""
+        self.ui.queue_replies(replies)
+        self._game_events.clear()
+        before = self._player_snapshot()
+        result = CommandResult(command=command)
+        try:
+            self._run_command(command)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        after = self._player_snapshot()
+
+        result.replies = self.ui.consumed_replies
+        result.events = self.ui.drain()
+        result.game_events = list(self._game_events)
+        result.delta = {key: (before[key], after[key]) for key in before if before[key] != after[key]}
+        result.won = self.outcome == "won"
+        result.lost = self.outcome == "lost"
+        result.running = self.is_running
+        return result
+
+    def run_commands(self, commands: Iterable[str]) -> List[CommandResult]:
+        """Run a scripted session; prompts consume the next lines, like piped stdin"""
+        lines = iter(commands)
+        self.ui.reply_source = lambda: next(lines, None)
+        results = []
+        try:
+            for command in lines:
+                command = command.strip()
+                if not command:
+                    continue
+                results.append(self.step(command))
+                if not self.is_running:
+                    break
+        finally:
+            self.ui.reply_source = None
+        return results
+
+    def _player_stats(self) -> Dict[str, Any]:
+        player = self.game_state.player
+        return {name: getattr(player, name) for name in TRACKED_PLAYER_FIELDS}
+
+    def _player_snapshot(self) -> Dict[str, Any]:
+        player = self.game_state.player
+        snapshot = self._player_stats()
+        snapshot["inventory"] = tuple(item.name for item in player.inventory)
+        return snapshot
+
+    def _pause(self, seconds: float):
+        """Dramatic pause for interactive play; headless runs and replays never sleep"""
+        if self.paced:
+            self.ui.flush()
+            time.sleep(seconds)
 
     def _handle_initial_dialogue(self):
         current_room = self.game_state.rooms.get(self.game_state.player.current_room_id)
         if current_room and current_room.name == "cabin":
             for npc in current_room.npcs:
                 if npc.name == "斗桨先生":
-                    ui.print_message(f"\n{npc.name}站在小屋的阴影中，他缓缓开口：", "white")
-                    time.sleep(0.5)
+                    self.ui.print_message(f"\n{npc.name}站在小屋的阴影中，他缓缓开口：", "white")
+                    self._pause(0.5)
                     dialogue = npc.talk("世界观")
-                    ui.print_dialogue(npc.name, dialogue)
+                    self.ui.print_dialogue(npc.name, dialogue)
                     if self.audio and npc.tts_voice_name:
                         self.audio.speak_mac(dialogue, npc.tts_voice_name)
-                    time.sleep(0.5)
+                    self._pause(0.5)
                     break
 
     def process_command(self, command: str):
-        parts = command.split()
-        action = parts[0] if parts else ""
-        target = " ".join(parts[1:]) if len(parts) > 1 else None
-
-        commands = {
-            "go": lambda: self.move_player(target) if target else ui.print_warning("去哪个方向？"),
-            "look": lambda: self.examine_target(target) if target else self.look_around(),
-            "l": lambda: self.examine_target(target) if target else self.look_around(),
-            "examine": lambda: self.examine_target(target) if target else ui.print_warning("检查什么？"),
-            "take": lambda: self.take_item(target) if target else ui.print_warning("拿什么？"),
-            "drop": lambda: self.drop_item(target) if target else ui.print_warning("丢什么？"),
-            "use": lambda: self._handle_use_command(parts),
-            "inventory": lambda: self.show_inventory(),
-            "i": lambda: self.show_inventory(),
-            "search": lambda: self.search_target(target) if target else ui.print_warning("搜索什么？"),
-            "talk": lambda: self._handle_talk_command(parts),
-            "unlock": lambda: self._handle_unlock_command(parts),
-            "open": lambda: self.open_target(target) if target else ui.print_warning("打开什么？"),
-            "attack": lambda: self.attack_monster(target) if target else self.attack_monster(),
-            "stats": lambda: self.show_stats(),
-            "help": lambda: self.show_help(),
-            "h": lambda: self.show_help(),
-            "save": lambda: self.save_game(),
-            "load": lambda: self.load_game(),
-            "quests": lambda: self.quest_system.show_quests(),
-            "quit": lambda: self.quit_game(),
-            "q": lambda: self.quit_game(),
-            "hint": lambda: self.show_hint(),
-            "map": lambda: self.show_map(),
-            "achievements": lambda: self.show_achievements(),
-            "craft": lambda: self.show_craft_menu(),
-            "journal": lambda: self.show_journal(),
-            "rest": lambda: self.rest(),
-            "travel": lambda: self.fast_travel(target) if target else self.show_travel_menu(),
-        }
+        verb, _, rest = command.strip().partition(" ")
 
         current_room = self.game_state.rooms.get(self.game_state.player.current_room_id)
-        if current_room and action in current_room.exits:
-            self.move_player(action)
-        elif action in commands:
-            commands[action]()
-        else:
-            ui.print_error(f"我不明白 '{command}'. 输入 'help' 查看指令。")
+        if current_room and verb in current_room.exits:
+            self.move_player(verb)
+        elif not self.commands.dispatch(command, verb, rest):
+            self.ui.print_error(f"我不明白 '{command}'. 输入 'help' 查看指令。")
 
     def _handle_use_command(self, parts):
         if len(parts) < 2:
-            ui.print_warning("用什么物品？")
+            self.ui.print_warning("用什么物品？")
             return
         if "on" in parts:
             on_idx = parts.index("on")
@@ -248,7 +505,7 @@ class GameEngine:
 
     def _handle_talk_command(self, parts):
         if len(parts) < 3 or parts[1] != "to":
-            ui.print_warning("和谁说话？格式: talk to [NPC] (about [话题])")
+            self.ui.print_warning("和谁说话？格式: talk to [NPC] (about [话题])")
             return
         npc_parts = []
         topic = "default"
@@ -262,7 +519,7 @@ class GameEngine:
 
     def _handle_unlock_command(self, parts):
         if "with" not in parts:
-            ui.print_warning("用什么解锁？格式: unlock [目标] with [物品]")
+            self.ui.print_warning("用什么解锁？格式: unlock [目标] with [物品]")
             return
         with_idx = parts.index("with")
         target = " ".join(parts[1:with_idx])
@@ -273,7 +530,7 @@ class GameEngine:
         player = self.game_state.player
         current_room = self.game_state.rooms.get(player.current_room_id)
         if not current_room:
-            ui.print_error(f"错误：当前房间 '{player.current_room_id}' 未找到!")
+            self.ui.print_error(f"错误：当前房间 '{player.current_room_id}' 未找到!")
             return
 
         if self.audio:
@@ -282,7 +539,7 @@ class GameEngine:
                 self.audio.play_sound(current_room.ambient_sound, loop=True, volume=0.3)
 
         if current_room.ascii_art_on_enter and not current_room.visited_art_shown:
-            ui.print_ascii_art(ASCII_ARTS.get(current_room.ascii_art_on_enter, ""))
+            self.ui.print_ascii_art(ASCII_ARTS.get(current_room.ascii_art_on_enter, ""))
             current_room.visited_art_shown = True
 
         items = [item.display_name for item in current_room.items]
@@ -290,11 +547,11 @@ class GameEngine:
         monsters = [monster.name for monster in current_room.monsters] if current_room.monsters else []
         exits = list(current_room.exits.keys())
 
-        ui.print_room(current_room.display_name, current_room.description, items, npcs, exits)
+        self.ui.print_room(current_room.display_name, current_room.description, items, npcs, exits)
 
         # Show monsters if present
         if monsters:
-            ui.print_warning(f"⚔️ 怪物: {', '.join(monsters)}")
+            self.ui.print_warning(f"⚔️ 怪物: {', '.join(monsters)}")
 
         self._maybe_trigger_flavor_event(current_room)
         self._check_monsters(current_room)
@@ -307,7 +564,7 @@ class GameEngine:
 
         direction_lower = direction.lower()
         if direction_lower not in current_room.exits:
-            ui.print_error(f"不能往 {direction} 走。")
+            self.ui.print_error(f"不能往 {direction} 走。")
             if self.audio:
                 self.audio.play_sound("action_fail")
             return
@@ -315,45 +572,36 @@ class GameEngine:
         next_room_id = current_room.exits[direction_lower]
         next_room = self.game_state.rooms.get(next_room_id)
         if not next_room:
-            ui.print_error(f"错误：目标房间 '{next_room_id}' 未定义！")
+            self.ui.print_error(f"错误：目标房间 '{next_room_id}' 未定义！")
             return
 
         if current_room.name == "dark_cellar_entrance" and direction_lower == "下":
             if current_room.properties.get('door_locked', True):
-                ui.print_warning("门是锁着的。")
+                self.ui.print_warning("门是锁着的。")
                 if self.audio:
                     self.audio.play_sound("action_fail")
                 return
             if not player.has_item("点燃的火把"):
-                ui.print_warning("太暗了，需要光源。")
+                self.ui.print_warning("太暗了，需要光源。")
                 if self.audio:
                     self.audio.play_sound("action_fail")
                 return
 
         if current_room.name == "deep_forest" and direction_lower == "进入洞穴":
             if current_room.properties.get('cave_hidden', True):
-                ui.print_warning("这里没什么特别的。")
+                self.ui.print_warning("这里没什么特别的。")
                 return
 
-        if self.audio:
-            self.audio.play_sound("footsteps_stone", volume=0.5)
-
+        first_visit = next_room_id not in player.visited_rooms
         player.current_room_id = next_room_id
         player.visit_room(next_room_id, next_room.display_name)
-
-        # Check explorer achievement
-        if len(player.visited_rooms) >= len(self.game_state.rooms):
-            if self.achievement_system.unlock("explorer"):
-                ui.print_success("🏆 成就解锁：探险家")
-
-        self._log_action(f"移动至 {next_room.display_name}")
+        self.events.publish(RoomEntered(next_room_id, next_room.display_name, first_visit))
         self.look_around()
 
         if next_room.name == "deep_forest" and next_room.properties.get('cave_hidden', True):
-            ui.print_success("仔细观察后，你注意到一个被藤蔓遮掩的[洞穴入口]！")
+            self.ui.print_success("仔细观察后，你注意到一个被藤蔓遮掩的[洞穴入口]！")
             next_room.properties['cave_hidden'] = False
-            if self.audio:
-                self.audio.play_sound("puzzle_solve")
+            self.events.publish(PuzzleSolved("cave_found", next_room_id))
 
     def take_item(self, item_name: str):
         player = self.game_state.player
@@ -361,40 +609,21 @@ class GameEngine:
         if not current_room:
             return
 
-        item_name_lower = item_name.lower()
-        item_to_take = None
-        for item in current_room.items:
-            if item.name == item_name_lower or item.display_name.lower() == item_name_lower:
-                item_to_take = item
-                break
-
+        item_to_take = current_room.find_item(item_name)
         if not item_to_take:
-            ui.print_error(f"这里没有 '{item_name}'。")
+            self.ui.print_error(f"这里没有 '{item_name}'。")
             if self.audio:
                 self.audio.play_sound("action_fail")
             return
 
         if not item_to_take.takeable:
-            ui.print_warning(f"不能拾取 [{item_to_take.display_name}].")
+            self.ui.print_warning(f"不能拾取 [{item_to_take.display_name}].")
             return
 
-        current_room.remove_item(item_to_take.name)
+        current_room.items.remove(item_to_take)
         player.add_to_inventory(item_to_take)
-        ui.print_success(f"你将 [{item_to_take.display_name}] 加入了物品栏。")
-        self._log_action(f"拾取 {item_to_take.display_name}")
-
-        # Check achievements
-        if len(player.inventory) >= 10:
-            if self.achievement_system.unlock("collector"):
-                ui.print_success("🏆 成就解锁：收藏家")
-
-        if item_to_take.name == "远古神像":
-            if self.achievement_system.unlock("treasure_hunter"):
-                ui.print_success("🏆 成就解锁：寻宝猎人")
-            self._update_intro_objective(2)
-
-        if self.audio:
-            self.audio.play_sound("item_pickup")
+        self.ui.print_success(f"你将 [{item_to_take.display_name}] 加入了物品栏。")
+        self.events.publish(ItemTaken(item_to_take.name, item_to_take.display_name, current_room.name))
 
     def drop_item(self, item_name: str):
         player = self.game_state.player
@@ -405,10 +634,10 @@ class GameEngine:
         item = player.remove_from_inventory(item_name)
         if item:
             current_room.add_item(item)
-            ui.print_message(f"你丢下了 [{item.display_name}].", "white")
-            self._log_action(f"丢弃 {item.display_name} 在 {current_room.display_name}")
+            self.ui.print_message(f"你丢下了 [{item.display_name}].", "white")
+            self.events.publish(ItemDropped(item.name, item.display_name, current_room.name))
         else:
-            ui.print_error(f"物品栏里没有 '{item_name}'。")
+            self.ui.print_error(f"物品栏里没有 '{item_name}'。")
 
     def use_item(self, item_name: str, target: Optional[str] = None):
         player = self.game_state.player
@@ -416,51 +645,41 @@ class GameEngine:
         if not current_room:
             return
 
-        item = None
-        for inv_item in player.inventory:
-            if inv_item.name == item_name.lower() or inv_item.display_name.lower() == item_name.lower():
-                item = inv_item
-                break
-
+        item = player.find_item(item_name)
         if not item:
-            ui.print_error(f"你没有 [{item_name}].")
+            self.ui.print_error(f"你没有 [{item_name}].")
             if self.audio:
                 self.audio.play_sound("action_fail")
             return
 
         if item.name == "火把" and target and "壁炉" in target.lower():
             if current_room.name == "cabin" and not current_room.properties.get("fireplace_lit"):
-                ui.print_success("你用[壁炉]点燃了[火把]！")
+                self.ui.print_success("你用[壁炉]点燃了[火把]！")
                 current_room.properties["fireplace_lit"] = True
                 player.remove_from_inventory(item.name)
                 player.add_to_inventory(self.game_state.items["点燃的火把"])
-                self._log_action("点燃了火把")
-                self._update_intro_objective(0)
-                if self.audio:
-                    self.audio.play_sound("fire_crackle")
+                self.events.publish(ItemUsed(item.name, item.display_name, current_room.name, target))
+                self.events.publish(PuzzleSolved("fireplace_lit", current_room.name))
                 return
 
         if item.name == "治疗药水":
             player.heal(50)
-            ui.print_success("你喝下治疗药水，好多了！")
-            ui.print_message(f"生命值: {player.health}/{player.max_health}", "green")
+            self.ui.print_success("你喝下治疗药水，好多了！")
+            self.ui.print_message(f"生命值: {player.health}/{player.max_health}", "green")
             player.remove_from_inventory(item.name)
-            self._log_action("使用治疗药水")
-            if self.audio:
-                self.audio.play_sound("item_pickup")
+            self.events.publish(ItemUsed(item.name, item.display_name, current_room.name, consumed=True))
             return
 
         if item.name == "撬棍" and target and "石棺" in target.lower():
             if current_room.name == "cave_chamber" and not current_room.properties.get('coffin_opened'):
-                ui.print_success("你用[撬棍]撬开了[石棺]！")
-                ui.print_message("里面是空的！旁边有些[金币]。", "white")
+                self.ui.print_success("你用[撬棍]撬开了[石棺]！")
+                self.ui.print_message("里面是空的！旁边有些[金币]。", "white")
                 current_room.properties['coffin_opened'] = True
-                self._log_action("撬开石棺")
-                if self.audio:
-                    self.audio.play_sound("puzzle_solve")
+                self.events.publish(ItemUsed(item.name, item.display_name, current_room.name, target))
+                self.events.publish(PuzzleSolved("coffin_opened", current_room.name))
                 return
 
-        ui.print_warning(f"使用了 [{item.display_name}]. 没什么反应。")
+        self.ui.print_warning(f"使用了 [{item.display_name}]. 没什么反应。")
 
     def examine_target(self, target: str):
         player = self.game_state.player
@@ -468,31 +687,29 @@ class GameEngine:
         if not current_room:
             return
 
-        target_lower = target.lower()
-
-        for item in player.inventory:
-            if item.name == target_lower or item.display_name.lower() == target_lower:
-                ui.print_message(f"你仔细检查了 [{item.display_name}]:", "white")
-                ui.print_message(item.description, "white")
-                if item.ascii_art_name and item.ascii_art_name in ASCII_ARTS:
-                    ui.print_ascii_art(ASCII_ARTS[item.ascii_art_name])
-                return
+        item = player.find_item(target)
+        if item:
+            self.ui.print_message(f"你仔细检查了 [{item.display_name}]:", "white")
+            self.ui.print_message(item.description, "white")
+            if item.ascii_art_name and item.ascii_art_name in ASCII_ARTS:
+                self.ui.print_ascii_art(ASCII_ARTS[item.ascii_art_name])
+            return
 
-        for item in current_room.items:
-            if item.name == target_lower or item.display_name.lower() == target_lower:
-                ui.print_message(f"你看到一个 [{item.display_name}]:", "white")
-                ui.print_message(item.description, "white")
-                if item.ascii_art_name and item.ascii_art_name in ASCII_ARTS:
-                    ui.print_ascii_art(ASCII_ARTS[item.ascii_art_name])
-                return
+        item = current_room.find_item(target)
+        if item:
+            self.ui.print_message(f"你看到一个 [{item.display_name}]:", "white")
+            self.ui.print_message(item.description, "white")
+            if item.ascii_art_name and item.ascii_art_name in ASCII_ARTS:
+                self.ui.print_ascii_art(ASCII_ARTS[item.ascii_art_name])
+            return
 
-        for npc in current_room.npcs:
-            if npc.name.lower() == target_lower:
-                ui.print_message(f"你仔细观察 {npc.name}:", "white")
-                ui.print_message(npc.description, "white")
-                return
+        npc = current_room.find_npc(target)
+        if npc:
+            self.ui.print_message(f"你仔细观察 {npc.name}:", "white")
+            self.ui.print_message(npc.description, "white")
+            return
 
-        ui.print_warning(f"这里没有 '{target}' 可以检查。")
+        self.ui.print_warning(f"这里没有 '{target}' 可以检查。")
 
     def search_target(self, target: str):
         player = self.game_state.player
@@ -504,12 +721,12 @@ class GameEngine:
 
         if current_room.name == "forest_path" and "枯叶" in target_lower:
             if not current_room.properties.get('leaves_searched'):
-                ui.print_message("你在枯叶堆里翻找...", "white")
+                self.ui.print_message("你在枯叶堆里翻找...", "white")
                 current_room.properties['leaves_searched'] = True
                 key = self.game_state.items.get('生锈的钥匙')
                 if key and not current_room.has_item(key.name) and not player.has_item(key.name):
                     current_room.add_item(key)
-                    ui.print_success("在枯叶下，你发现了一把[生锈的钥匙]！")
+                    self.ui.print_success("在枯叶下，你发现了一把[生锈的钥匙]！")
                     self._log_action("在枯叶堆找到生锈的钥匙")
                     if self.audio:
                         self.audio.play_sound("item_pickup")
@@ -517,37 +734,32 @@ class GameEngine:
 
         if current_room.name == "cellar" and "木箱" in target_lower:
             if not current_room.properties.get('crates_searched'):
-                ui.print_message("你搜索了木箱...", "white")
+                self.ui.print_message("你搜索了木箱...", "white")
                 current_room.properties['crates_searched'] = True
                 crowbar = self.game_state.items.get('撬棍')
                 if crowbar and not current_room.has_item(crowbar.name) and not player.has_item(crowbar.name):
                     current_room.add_item(crowbar)
-                    ui.print_success("在一个箱子里找到了一根[撬棍]！")
+                    self.ui.print_success("在一个箱子里找到了一根[撬棍]！")
                     self._log_action("在地下室木箱找到撬棍")
                     if self.audio:
                         self.audio.play_sound("item_pickup")
                 return
 
-        ui.print_warning(f"你搜索了 {target}，但什么也没找到。")
+        self.ui.print_warning(f"你搜索了 {target}，但什么也没找到。")
 
     def talk_to_npc(self, npc_name: str, topic: str = "default"):
         current_room = self.game_state.rooms.get(self.game_state.player.current_room_id)
         if not current_room:
             return
 
-        npc = None
-        for n in current_room.npcs:
-            if n.name.lower() == npc_name.lower():
-                npc = n
-                break
-
+        npc = current_room.find_npc(npc_name)
         if not npc:
-            ui.print_error(f"这里没有 '{npc_name}' 可以对话。")
+            self.ui.print_error(f"这里没有 '{npc_name}' 可以对话。")
             return
 
         dialogue = npc.talk(topic)
-        ui.print_dialogue(npc.name, dialogue)
-        self._log_action(f"与 {npc.name} 对话")
+        self.ui.print_dialogue(npc.name, dialogue)
+        self.events.publish(NpcTalkedTo(npc.name, topic))
 
         if self.audio and npc.tts_voice_name:
             self.audio.speak_mac(dialogue, npc.tts_voice_name)
@@ -558,33 +770,26 @@ class GameEngine:
         if not current_room:
             return
 
-        item = None
-        for inv_item in player.inventory:
-            if inv_item.name == item_name.lower() or inv_item.display_name.lower() == item_name.lower():
-                item = inv_item
-                break
-
+        item = player.find_item(item_name)
         if not item:
-            ui.print_error(f"你没有 [{item_name}].")
+            self.ui.print_error(f"你没有 [{item_name}].")
             return
 
         if current_room.name == "dark_cellar_entrance" and "门" in target.lower():
             if current_room.properties.get('door_locked', True):
                 if item.name == "生锈的钥匙":
-                    ui.print_success("你用[生锈的钥匙]打开了[门]！")
+                    self.ui.print_success("你用[生锈的钥匙]打开了[门]！")
                     current_room.properties['door_locked'] = False
                     current_room.add_exit("下", "cellar")
-                    self._log_action("解锁地下室入口")
-                    self._update_intro_objective(1)
-                    if self.audio:
-                        self.audio.play_sound("door_unlock")
+                    self.events.publish(ItemUsed(item.name, item.display_name, current_room.name, target))
+                    self.events.publish(PuzzleSolved("cellar_door_unlocked", current_room.name))
                 else:
-                    ui.print_error(f"[{item.display_name}] 打不开这扇门。")
+                    self.ui.print_error(f"[{item.display_name}] 打不开这扇门。")
             else:
-                ui.print_warning("门已开。")
+                self.ui.print_warning("门已开。")
             return
 
-        ui.print_error(f"不能用 [{item.display_name}] 解锁 '{target}'。")
+        self.ui.print_error(f"不能用 [{item.display_name}] 解锁 '{target}'。")
 
     def open_target(self, target: str):
         current_room = self.game_state.rooms.get(self.game_state.player.current_room_id)
@@ -593,23 +798,26 @@ class GameEngine:
 
         if current_room.name == "dark_cellar_entrance" and "门" in target.lower():
             if not current_room.properties.get('door_locked', True):
-                ui.print_message("门已开。", "white")
+                self.ui.print_message("门已开。", "white")
                 if self.audio:
                     self.audio.play_sound("door_open")
             else:
-                ui.print_warning("门锁着。")
+                self.ui.print_warning("门锁着。")
             return
 
-        ui.print_error(f"尝试打开 '{target}' 失败。")
+        self.ui.print_error(f"尝试打开 '{target}' 失败。")
 
     def show_inventory(self):
         player = self.game_state.player
         if not player.inventory:
-            ui.print_warning("你的物品栏是空的。")
+            self.ui.print_warning("你的物品栏是空的。")
             return
 
         items = [(item.display_name, item.description, item.item_type) for item in player.inventory]
-        ui.print_inventory(items, player.health, player.max_health, player.level, player.experience)
+        self.ui.print_inventory(items, player.health, player.max_health, player.level, player.experience)
+
+    def show_quests(self):
+        self.quest_system.show_quests()
 
     def show_help(self):
         commands = {
@@ -639,7 +847,7 @@ class GameEngine:
             "help / h": "显示帮助",
             "quit / q": "退出游戏",
         }
-        ui.print_help(commands)
+        self.ui.print_help(commands)
 
     def show_hint(self):
         """Show contextual hint for current room"""
@@ -649,23 +857,24 @@ class GameEngine:
             return
 
         hints = self.hints.get(current_room.name, ["探索周围环境，寻找线索"])
-        import random
-        hint = random.choice(hints)
-        ui.print_hint(hint)
+        hint = self.rng.choice(hints)
+        self.ui.print_hint(hint)
 
     def show_map(self):
         """Show mini-map of explored areas"""
         player = self.game_state.player
-        visited = {room_id: True for room_id in player.visited_rooms}
-        ui.print_mini_map(player.current_room_id, visited, {})
+        self.mini_map.sync(player.visited_rooms)
+        current_room = self.game_state.rooms.get(player.current_room_id)
+        name = current_room.display_name if current_room else player.current_room_id
+        self.ui.print_mini_map(name, self.mini_map.render(player.current_room_id))
 
     def show_achievements(self):
         """Show all achievements"""
         achievements = self.achievement_system.get_all()
-        ui.print_achievements(achievements)
+        self.ui.print_achievements(achievements)
         unlocked = self.achievement_system.get_unlocked_count()
         total = len(achievements)
-        ui.print_message(f"\n已解锁: {unlocked}/{total}", "yellow")
+        self.ui.print_message(f"\n已解锁: {unlocked}/{total}", "yellow")
 
     def show_craft_menu(self):
         """Show crafting menu and handle crafting"""
@@ -673,13 +882,18 @@ class GameEngine:
         recipes = self.crafting_system.get_available_recipes(player)
 
         if not recipes:
-            ui.print_warning("没有可用的合成配方")
+            self.ui.print_warning("没有可用的合成配方")
             return
 
-        ui.print_crafting_menu(recipes)
-        ui.print_message("\n输入配方编号进行合成，或输入 'cancel' 取消", "white")
+        self.ui.print_crafting_menu(recipes)
+        self.ui.print_message("\n输入配方编号进行合成，或输入 'cancel' 取消", "white")
+
+        choice = self._ask("选择 > ", lambda reply: self._craft_choice(recipes, reply))
+        if choice is not None:
+            self._craft_choice(recipes, choice)
 
-        choice = ui.get_input("选择 > ")
+    def _craft_choice(self, recipes, choice: str):
+        player = self.game_state.player
         if choice == "cancel":
             return
 
@@ -690,34 +904,31 @@ class GameEngine:
                 result = self.crafting_system.craft(recipe_name, player, self.game_state.items)
                 if result:
                     player.add_to_inventory(result)
-                    ui.print_success(f"成功合成了 [{result.display_name}]！")
-
-                    # Check crafting achievement
-                    if self.crafting_system.crafted_count >= 5:
-                        if self.achievement_system.unlock("crafter"):
-                            ui.print_success("🏆 成就解锁：工匠")
-
-                    if self.audio:
-                        self.audio.play_sound("puzzle_solve")
+                    self.ui.print_success(f"成功合成了 [{result.display_name}]！")
+                    self.events.publish(ItemCrafted(result.name, result.display_name, recipe_name))
                 else:
-                    ui.print_error("合成失败！缺少必要材料。")
+                    self.ui.print_error("合成失败！缺少必要材料。")
         except (ValueError, IndexError):
-            ui.print_error("无效的选择")
+            self.ui.print_error("无效的选择")
 
     def show_travel_menu(self):
         """Show fast travel menu"""
         player = self.game_state.player
-        ui.print_message("\n[bold cyan]快速旅行[/]", "cyan")
-        ui.print_message("已解锁的地点：", "white")
+        self.ui.print_message("\n[bold cyan]快速旅行[/]", "cyan")
+        self.ui.print_message("已解锁的地点：", "white")
 
         for idx, room_id in enumerate(player.visited_rooms, 1):
             room = self.game_state.rooms.get(room_id)
             if room:
-                ui.print_message(f"  [{idx}] {room.display_name}", "cyan")
+                self.ui.print_message(f"  [{idx}] {room.display_name}", "cyan")
 
-        ui.print_message("\n输入编号进行传送，或输入 'cancel' 取消", "white")
-        choice = ui.get_input("选择 > ")
+        self.ui.print_message("\n输入编号进行传送，或输入 'cancel' 取消", "white")
+        choice = self._ask("选择 > ", self._travel_choice)
+        if choice is not None:
+            self._travel_choice(choice)
 
+    def _travel_choice(self, choice: str):
+        player = self.game_state.player
         if choice == "cancel":
             return
 
@@ -727,35 +938,31 @@ class GameEngine:
                 target_room_id = player.visited_rooms[idx]
                 self.fast_travel(target_room_id)
         except (ValueError, IndexError):
-            ui.print_error("无效的选择")
+            self.ui.print_error("无效的选择")
 
     def fast_travel(self, target_room_id: str):
         """Fast travel to a visited room"""
         player = self.game_state.player
 
         if target_room_id not in player.visited_rooms:
-            ui.print_error("你还没有去过那个地方！")
+            self.ui.print_error("你还没有去过那个地方！")
             return
 
         if target_room_id == player.current_room_id:
-            ui.print_warning("你已经在这里了！")
+            self.ui.print_warning("你已经在这里了！")
             return
 
         target_room = self.game_state.rooms.get(target_room_id)
         if not target_room:
-            ui.print_error("目标地点不存在！")
+            self.ui.print_error("目标地点不存在！")
             return
 
-        ui.print_message(f"传送中... . . .", "cyan")
-        time.sleep(0.5)
+        self.ui.print_message(f"传送中... . . .", "cyan")
+        self._pause(0.5)
         player.current_room_id = target_room_id
         player.visit_room(target_room_id, target_room.display_name)
-        ui.print_success(f"已传送到 {target_room.display_name}")
-        self._log_action(f"快速旅行到 {target_room.display_name}")
-
-        if self.audio:
-            self.audio.play_sound("puzzle_solve")
-
+        self.ui.print_success(f"已传送到 {target_room.display_name}")
+        self.events.publish(RoomEntered(target_room_id, target_room.display_name, False, fast_travel=True))
         self.look_around()
 
     def show_journal(self):
@@ -763,9 +970,9 @@ class GameEngine:
         player = self.game_state.player
         entries = player.history[-10:]
         if not entries:
-            ui.print_warning("暂时没有可显示的冒险记录。")
+            self.ui.print_warning("暂时没有可显示的冒险记录。")
             return
-        ui.print_journal(entries)
+        self.ui.print_journal(entries)
 
     def attack_monster(self, monster_name: Optional[str] = None):
         """Attack a monster in the current room"""
@@ -775,43 +982,51 @@ class GameEngine:
             return
 
         if not current_room.monsters:
-            ui.print_warning("这里没有可以攻击的怪物。")
+            self.ui.print_warning("这里没有可以攻击的怪物。")
             return
 
         # Find target monster
         target = None
         if monster_name:
-            for monster in current_room.monsters:
-                if monster.name.lower() == monster_name.lower():
-                    target = monster
-                    break
+            target = current_room.find_monster(monster_name)
             if not target:
-                ui.print_error(f"找不到怪物 '{monster_name}'")
+                self.ui.print_error(f"找不到怪物 '{monster_name}'")
                 return
         else:
-            target = current_room.monsters[0]
-
-        # Start combat
-        if self.combat_system.start_combat(player, target):
-            # Monster defeated
-            current_room.monsters.remove(target)
-            gold_reward = target.attack_power * 5
-            player.add_gold(gold_reward)
-            ui.print_success(f"获得 {gold_reward} 金币！")
-            self._log_action(f"击败了 {target.name}")
-
-            # Check monster hunter achievement
-            if not hasattr(self, '_monsters_defeated'):
-                self._monsters_defeated = 0
-            self._monsters_defeated += 1
-            if self._monsters_defeated >= 3:
-                if self.achievement_system.unlock("survivor"):
-                    ui.print_success("🏆 成就解锁：怪物猎人")
+            target = current_room.monsters.first()
+
+        self.combat_system.render(self.combat_system.begin(player, target))
+        self._fight(current_room, target)
+
+    def _fight(self, room, monster, action: Optional[str] = None):
+        """Step the fight begun by attack_monster, one half-round at a time, until it ends.
+
+        Returns early when the next action is a suspended prompt; its answer
+        comes back here as `action`.
+        """
+        combat = self.combat_system
+        while combat.in_combat:
+            if combat.awaiting_action:
+                if action is None:
+                    action = "攻击" if combat.auto_mode else self._ask(
+                        COMBAT_PROMPT, lambda reply: self._fight(room, monster, reply))
+                    if action is None:
+                        return
+                combat.submit(action)
+                action = None
+            combat.render(combat.advance())
+
+        if combat.encounter.outcome == "won":
+            room.remove_monster(monster)
+            gold_reward = monster.attack_power * 5
+            self.game_state.player.add_gold(gold_reward)
+            self.ui.print_success(f"获得 {gold_reward} 金币！")
+            self.events.publish(MonsterDefeated(monster.name, room.name))
 
     def show_stats(self):
         """Show character stats using enhanced panel"""
         player = self.game_state.player
-        ui.print_stats_panel(
+        self.ui.print_stats_panel(
             player.health, player.max_health, player.level,
             player.experience, player.strength, player.intelligence,
             player.defense, player.gold, player.score
@@ -822,10 +1037,10 @@ class GameEngine:
         if not room.monsters:
             return
 
-        for monster in room.monsters[:]:  # Copy list to avoid modification during iteration
+        for monster in room.monsters:
             if monster.hostile:
-                ui.print_warning(f"\n⚔️ 警告：{monster.name} 注意到了你！")
-                ui.print_message(f"你可以输入 'attack' 进行攻击，或尝试 'go [方向]' 逃离。", "yellow")
+                self.ui.print_warning(f"\n⚔️ 警告：{monster.name} 注意到了你！")
+                self.ui.print_message(f"你可以输入 'attack' 进行攻击，或尝试 'go [方向]' 逃离。", "yellow")
                 break
 
     def rest(self):
@@ -837,119 +1052,134 @@ class GameEngine:
 
         # Check if monsters present
         if current_room.monsters:
-            ui.print_warning("有怪物在附近，无法休息！")
+            self.ui.print_warning("有怪物在附近，无法休息！")
             return
 
         if current_room.name != "cabin":
-            ui.print_warning("这里不安全，无法放心休息。")
+            self.ui.print_warning("这里不安全，无法放心休息。")
             return
 
         heal_amount = 25 if current_room.properties.get("fireplace_lit") else 15
         before = player.health
         player.heal(heal_amount)
         recovered = player.health - before
-        ui.print_success(f"你休息片刻，恢复了 {recovered} 点生命值。")
+        self.ui.print_success(f"你休息片刻，恢复了 {recovered} 点生命值。")
         self._log_action("在小屋休息恢复体力")
         if self.audio:
             self.audio.play_sound("fire_crackle")
 
+    def _show_save_slots(self, saves: List[Dict[str, Any]]):
+        for save in saves:
+            if save['exists']:
+                saved_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(save['timestamp']))
+                hours, minutes = divmod(int(save['play_time']) // 60, 60)
+                self.ui.print_message(
+                    f"  [{save['slot']}] {save['location']} - Lv.{save['level']}  "
+                    f"{saved_at}  游戏时长 {hours}:{minutes:02d}", "yellow")
+            else:
+                self.ui.print_message(f"  [{save['slot']}] <空>", "dim")
+
+        self.ui.print_message("\n输入槽位编号（任意正整数），或输入 'cancel' 取消", "white")
+
     def save_game(self):
         """Save game with slot selection"""
         saves = self.game_state.list_saves()
 
-        ui.print_message("\n[bold cyan]保存游戏[/]", "cyan")
-        ui.print_message("选择存档槽位：", "white")
-
-        for save in saves:
-            if save['exists']:
-                ui.print_message(f"  [{save['slot']}] {save['location']} - Lv.{save['level']}", "yellow")
-            else:
-                ui.print_message(f"  [{save['slot']}] <空>", "dim")
+        self.ui.print_message("\n[bold cyan]保存游戏[/]", "cyan")
+        self.ui.print_message("选择存档槽位：", "white")
 
-        ui.print_message("\n输入槽位编号 (1-3)，或输入 'cancel' 取消", "white")
-        choice = ui.get_input("选择 > ")
+        self._show_save_slots(saves)
+        choice = self._ask("选择 > ", self._save_to_slot)
+        if choice is not None:
+            self._save_to_slot(choice)
 
+    def _save_to_slot(self, choice: str):
         if choice == "cancel":
             return
 
         try:
             slot = int(choice)
-            if 1 <= slot <= 3:
+            if slot >= 1:
                 if self.game_state.save_game(slot=slot):
-                    ui.print_success(f"游戏进度已保存到槽位 {slot}")
+                    self.ui.print_success(f"游戏进度已保存到槽位 {slot}")
                     if self.audio:
                         self.audio.play_sound("puzzle_solve")
                 else:
-                    ui.print_error("保存失败！")
+                    self.ui.print_error("保存失败！")
             else:
-                ui.print_error("无效的槽位编号")
+                self.ui.print_error("无效的槽位编号")
         except ValueError:
-            ui.print_error("无效的输入")
+            self.ui.print_error("无效的输入")
 
     def load_game(self):
         """Load game with slot selection"""
         saves = self.game_state.list_saves()
 
-        ui.print_message("\n[bold cyan]读取游戏[/]", "cyan")
-        ui.print_message("选择存档槽位：", "white")
+        self.ui.print_message("\n[bold cyan]读取游戏[/]", "cyan")
+        self.ui.print_message("选择存档槽位：", "white")
 
         available_saves = [s for s in saves if s['exists']]
         if not available_saves:
-            ui.print_warning("没有可用的存档")
+            self.ui.print_warning("没有可用的存档")
             return
 
-        for save in saves:
-            if save['exists']:
-                ui.print_message(f"  [{save['slot']}] {save['location']} - Lv.{save['level']}", "yellow")
-            else:
-                ui.print_message(f"  [{save['slot']}] <空>", "dim")
-
-        ui.print_message("\n输入槽位编号 (1-3)，或输入 'cancel' 取消", "white")
-        choice = ui.get_input("选择 > ")
+        self._show_save_slots(saves)
+        choice = self._ask("选择 > ", self._load_from_slot)
+        if choice is not None:
+            self._load_from_slot(choice)
 
+    def _load_from_slot(self, choice: str):
         if choice == "cancel":
             return
 
         try:
             slot = int(choice)
-            if 1 <= slot <= 3:
+            if slot >= 1:
                 if self.game_state.load_game(slot=slot):
-                    ui.print_success("游戏进度已成功读取！")
+                    self.ui.print_success("游戏进度已成功读取！")
                     if self.audio:
                         self.audio.play_sound("puzzle_solve")
                     self.look_around()
                 else:
-                    ui.print_error("读取失败！")
+                    self.ui.print_error("读取失败！")
             else:
-                ui.print_error("无效的槽位编号")
+                self.ui.print_error("无效的槽位编号")
         except ValueError:
-            ui.print_error("无效的输入")
+            self.ui.print_error("无效的输入")
 
     def quit_game(self):
-        ui.print_warning("你确定要退出游戏吗？(是/否)")
-        confirm = ui.get_input()
+        self.ui.print_warning("你确定要退出游戏吗？(是/否)")
+        confirm = self._ask("> ", self._confirm_quit)
+        if confirm is not None:
+            self._confirm_quit(confirm)
+
+    def _confirm_quit(self, confirm: str):
         if confirm in ["是", "yes", "y"]:
-            ui.print_message("感谢游玩！再见。", "magenta")
+            self.ui.print_message("感谢游玩！再见。", "magenta")
             self.is_running = False
+            self.outcome = "quit"
 
     def _check_game_state(self):
         player = self.game_state.player
         if player.health <= 0:
-            ui.print_error("\n你的生命值耗尽了...游戏结束。")
-            ui.print_ascii_art(ASCII_ARTS.get("game_over", ""))
+            self.ui.print_error("\n你的生命值耗尽了...游戏结束。")
+            self.ui.print_ascii_art(ASCII_ARTS.get("game_over", ""))
             self.is_running = False
+            self.outcome = "lost"
             return
 
         if self._check_win_condition():
-            ui.print_success("\n恭喜！你找到了远古神像并打开了石棺，揭开了宝藏的秘密！游戏胜利！")
-            ui.print_ascii_art(ASCII_ARTS.get("treasure_chest_open", ""))
+            self.ui.print_success("\n恭喜！你找到了远古神像并打开了石棺，揭开了宝藏的秘密！游戏胜利！")
+            self.ui.print_ascii_art(ASCII_ARTS.get("treasure_chest_open", ""))
             if self.audio:
                 self.audio.play_sound("puzzle_solve")
             self.is_running = False
+            self.outcome = "won"
 
     def _check_win_condition(self) -> bool:
         player = self.game_state.player
+        if player.current_room_id != "cave_chamber":
+            return False
         treasure_room = self.game_state.rooms.get("cave_chamber")
-        return (player.current_room_id == "cave_chamber" and
-                treasure_room and treasure_room.properties.get('coffin_opened') and
-                player.has_item("远古神像"))
+        return bool(treasure_room and treasure_room.properties.get('coffin_opened') and
+                    player.has_item("远古神像"))
@@ -0,0 +1,247 @@
+"""Line-protocol TCP server hosting one GameEngine per connection
+
+Run with ``python -m src.server`` and connect with telnet or netcat. The
+event loop only does socket I/O; each command runs on a worker thread with
+a headless engine (no sleeps, no audio) and a per-session plain-text UI, so
+a slow command never stalls other sessions. Engine prompts (save/load
+slots, the quit confirmation, every combat round) are suspended: the
+session keeps the pending prompt and answers it with the client's next
+line, so a player sitting at a prompt holds no worker thread.
+"""
+import argparse
+import asyncio
+import io
+import itertools
+import os
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set
+from .game_engine import GameEngine
+from .systems.save_store import SaveDatabase, SqliteSaveStore
+from .ui.plain_ui import PlainUI, strip_markup
+
+PROMPT = "> "
+LISTEN_BACKLOG = 1024
+MAX_NAME_LENGTH = 32
+UNSAFE_NAME_CHARS = re.compile(r"[^\w-]")
+
+class SessionUI(PlainUI):
+    """Plain-text UI bound to one connection.
+
+    The engine suspends its own prompts; any other get_input falls back to
+    waiting for the client's next line on the worker thread.
+    """
+
+    def __init__(self, session: "Session"):
+        super().__init__(io.StringIO(), interactive=False)
+        self.reply_source = session.wait_for_line
+
+    def get_input(self, prompt: str = "> ") -> str:
+        if not self.replies:
+            self.stream.write(strip_markup(prompt))
+        return self.next_reply()
+
+    def take_output(self) -> str:
+        text = self.stream.getvalue()
+        self.stream.seek(0)
+        self.stream.truncate()
+        return text
+
+class Session:
+    def __init__(self, server: "GameServer", session_id: int, writer: asyncio.StreamWriter):
+        self.server = server
+        self.session_id = session_id
+        self.writer = writer
+        self.loop = asyncio.get_running_loop()
+        self.inbox: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.lock = threading.Lock()
+        self.busy = False
+        self.closed = False
+        self.ui = SessionUI(self)
+        self.engine: Optional[GameEngine] = None
+        self.player: Optional[str] = None  # the name claimed on the server, once logged in
+
+    def submit(self, line: Optional[str]):
+        """Queue a line from the client (None on disconnect) and start a worker if idle"""
+        with self.lock:
+            self.inbox.put(line)
+            if self.busy:
+                return
+            self.busy = True
+        self.loop.run_in_executor(self.server.executor, self._pump)
+
+    def wait_for_line(self) -> Optional[str]:
+        """Answer a blocking prompt with the client's next line (worker thread); None once closed"""
+        if self.closed:
+            return None
+        self.flush()
+        try:
+            line = self.inbox.get(timeout=self.server.prompt_timeout)
+        except queue.Empty:
+            return None
+        if line is None:
+            # Leave the disconnect for _pump, which closes the engine
+            self.inbox.put(None)
+        return line
+
+    def flush(self):
+        text = self.ui.take_output()
+        if text and not self.closed:
+            data = text.replace("\n", "\r\n").encode("utf-8")
+            self.loop.call_soon_threadsafe(self._write, data)
+
+    def _write(self, data: bytes):
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+    def _pump(self):
+        """Run queued lines one at a time until the inbox is empty (worker thread)"""
+        while True:
+            with self.lock:
+                if self.inbox.empty():
+                    self.busy = False
+                    return
+                line = self.inbox.get_nowait()
+            if line is None:
+                self._finish()
+                return
+            try:
+                self._handle_line(line)
+            except Exception as e:
+                self.ui.print_error(f"发生错误: {e}")
+            if self.engine is None:
+                self.ui.stream.write("请输入你的名字: ")
+            elif not self.engine.is_running:
+                self._finish()
+                self.flush()
+                self.loop.call_soon_threadsafe(self.writer.close)
+                return
+            elif self.engine.pending_prompt is not None:
+                self.ui.stream.write(strip_markup(self.engine.pending_prompt.text))
+            else:
+                self.engine.show_status_bar()
+                self.ui.stream.write(PROMPT)
+            self.flush()
+
+    def _handle_line(self, line: str):
+        if self.engine is None:
+            player = self.server.claim_name(line)
+            if player is None:
+                self.ui.print_error("这个名字的玩家正在游戏中，请换一个名字。")
+                return
+            self.player = player
+            self.engine = self.server.create_engine(player, self.ui)
+            self.engine.show_intro()
+        elif line or self.engine.pending_prompt is not None:
+            self.engine.step(line)
+
+    def _finish(self):
+        """Close the engine (waiting for its saves) and free the player's name"""
+        if self.engine is not None:
+            self.engine.close()
+        if self.player is not None:
+            self.server.release_name(self.player)
+            self.player = None
+
+class GameServer:
+    def __init__(self, save_root: str, sounds_dir: str, max_workers: int = 256,
+                 prompt_timeout: float = 600.0, database: Optional[SaveDatabase] = None):
+        self.save_root = save_root
+        # With a database every player's saves go to it instead of save_root/<name>/
+        self.database = database
+        self.sounds_dir = sounds_dir
+        self.prompt_timeout = prompt_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="session")
+        self.sessions: Dict[int, Session] = {}
+        self._ids = itertools.count(1)
+        # Names (as save directories / database keys) of players connected right now
+        self.players: Set[str] = set()
+        self._players_lock = threading.Lock()
+
+    @staticmethod
+    def player_dir(name: str) -> str:
+        return UNSAFE_NAME_CHARS.sub("_", name.strip())[:MAX_NAME_LENGTH] or "guest"
+
+    def claim_name(self, name: str) -> Optional[str]:
+        """The player's save key, or None if a connected session already uses it.
+
+        Two sessions under one name would share autosave slot 0 and
+        overwrite each other's saves.
+        """
+        player = self.player_dir(name)
+        with self._players_lock:
+            if player in self.players:
+                return None
+            self.players.add(player)
+        return player
+
+    def release_name(self, player: str):
+        with self._players_lock:
+            self.players.discard(player)
+
+    def create_engine(self, name: str, ui: SessionUI) -> GameEngine:
+        """Headless engine with interactive combat and suspended prompts, saving under the player's own directory"""
+        player_dir = self.player_dir(name)
+        store = SqliteSaveStore(self.database, player_dir) if self.database else None
+        engine = GameEngine(os.path.join(self.save_root, player_dir), self.sounds_dir,
+                            headless=True, ui=ui, auto_combat=False, save_store=store)
+        engine.autosave_enabled = True
+        engine.suspend_prompts = True
+        return engine
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = Session(self, next(self._ids), writer)
+        self.sessions[session.session_id] = session
+        writer.write("欢迎来到《迷失的宝藏猎人》！请输入你的名字: ".encode("utf-8"))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                session.submit(line.decode("utf-8", errors="replace").strip())
+        finally:
+            session.closed = True
+            session.submit(None)
+            del self.sessions[session.session_id]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=LISTEN_BACKLOG)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.database:
+            self.database.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="迷失的宝藏猎人 多人游戏服务器")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=4000, help="监听端口")
+    parser.add_argument("--workers", type=int, default=256, help="执行指令的工作线程数")
+    parser.add_argument("--db", help="SQLite 存档数据库路径（默认按玩家目录保存文件）")
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server = GameServer(os.path.join(root, "saving", "sessions"), os.path.join(root, "sounds"),
+                        max_workers=args.workers, database=SaveDatabase(args.db) if args.db else None)
+    print(f"服务器已启动: telnet {args.host} {args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
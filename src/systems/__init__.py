@@ -2,5 +2,6 @@
 from .audio import init_audio
 from .game_state import GameState
 from .combat import CombatSystem, QuestSystem, Quest
+from .events import EventBus, GameEvent
 
-__all__ = ['init_audio', 'GameState', 'CombatSystem', 'QuestSystem', 'Quest']
+__all__ = ['init_audio', 'GameState', 'CombatSystem', 'QuestSystem', 'Quest', 'EventBus', 'GameEvent']
@@ -1,7 +1,54 @@
 """Achievement and crafting systems"""
-from typing import Dict, List, Optional, Tuple
+import bisect
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type, Union
 from dataclasses import dataclass, field
 from ..core.entities import Item, Player
+from .events import (EventBus, GameEvent, AchievementUnlocked, ItemCrafted, ItemTaken,
+                     MonsterDefeated, NpcTalkedTo, PlayerStatChanged, PuzzleSolved, RoomEntered)
+
+# Puzzles of the built-in world, for the puzzle_master achievement
+PUZZLE_IDS = frozenset({"fireplace_lit", "cellar_door_unlocked", "cave_found", "coffin_opened"})
+
+@dataclass(frozen=True)
+class CountEvents:
+    """Unlocks after `count` events of a type, optionally only those whose `attr` equals a value"""
+    event_type: Type[GameEvent]
+    count: int = 1
+    match: Optional[Tuple[str, Any]] = None
+
+@dataclass(frozen=True)
+class StatRule:
+    """Unlocks once a tracked player field is within [minimum, maximum]"""
+    field: str
+    minimum: Optional[int] = None
+    maximum: Optional[int] = None
+
+    def holds(self, value) -> bool:
+        return ((self.minimum is None or value >= self.minimum) and
+                (self.maximum is None or value <= self.maximum))
+
+@dataclass(frozen=True)
+class CoverEvents:
+    """Unlocks once events of a type have covered every key of a set.
+
+    `universe` and `seed` are collections or callables taking the GameState;
+    `seed` lists keys already covered before any event (the starting room).
+    """
+    event_type: Type[GameEvent]
+    key: str
+    universe: Union[Iterable[str], Callable[[Any], Iterable[str]]]
+    seed: Optional[Callable[[Any], Iterable[str]]] = None
+
+AchievementRule = Union[CountEvents, StatRule, CoverEvents]
+
+def all_rooms(game_state) -> Iterable[str]:
+    return game_state.rooms
+
+def visited_rooms(game_state) -> Iterable[str]:
+    return game_state.player.visited_rooms
+
+def peaceful_npcs(game_state) -> Iterable[str]:
+    return [name for name, npc in game_state.npcs.items() if not npc.hostile]
 
 @dataclass
 class Achievement:
@@ -10,31 +57,131 @@ class Achievement:
     description: str
     unlocked: bool = False
     hidden: bool = False
+    rule: Optional[AchievementRule] = field(default=None, repr=False, compare=False)
 
 class AchievementSystem:
-    def __init__(self):
+    """Evaluates declarative achievement rules from game events.
+
+    Rules are indexed by the event type (and matched attribute value) or the
+    player field they depend on, and leave the index once unlocked, so each
+    event only touches the rules it can advance.
+    """
+
+    def __init__(self, events: Optional[EventBus] = None):
         self.achievements: Dict[str, Achievement] = {}
+        self.events = events
+        self.game_state = None
+        self.counters: Dict[str, int] = {}
+        self.covered: Dict[str, Set[str]] = {}
+        self._universes: Dict[str, frozenset] = {}
+        self._event_rules: Dict[type, List[str]] = {}
+        self._match_rules: Dict[type, Dict[str, Dict[Any, List[str]]]] = {}
+        # At-least rules sorted by threshold, so a rising value unlocks from the front
+        self._stat_floors: Dict[str, List[Tuple[int, str]]] = {}
+        self._stat_ranges: Dict[str, List[str]] = {}
+        self._subscribed: Set[type] = set()
         self._init_achievements()
 
     def _init_achievements(self):
         achievements = [
-            Achievement("first_steps", "初次探险", "开始你的冒险之旅"),
-            Achievement("explorer", "探险家", "探索所有房间"),
-            Achievement("collector", "收藏家", "收集10个物品"),
-            Achievement("treasure_hunter", "寻宝猎人", "找到远古神像"),
-            Achievement("puzzle_master", "解谜大师", "解开所有谜题"),
-            Achievement("survivor", "幸存者", "生命值降至10以下后存活"),
-            Achievement("level_5", "进阶冒险者", "达到5级"),
-            Achievement("rich", "富有", "拥有100金币"),
-            Achievement("crafter", "工匠", "合成5个物品"),
-            Achievement("social", "社交达人", "与所有NPC对话"),
+            Achievement("first_steps", "初次探险", "开始你的冒险之旅", rule=CountEvents(RoomEntered)),
+            Achievement("explorer", "探险家", "探索所有房间",
+                        rule=CoverEvents(RoomEntered, "room_id", all_rooms, seed=visited_rooms)),
+            Achievement("collector", "收藏家", "收集10个物品", rule=CountEvents(ItemTaken, 10)),
+            Achievement("treasure_hunter", "寻宝猎人", "找到远古神像",
+                        rule=CountEvents(ItemTaken, match=("item_name", "远古神像"))),
+            Achievement("puzzle_master", "解谜大师", "解开所有谜题",
+                        rule=CoverEvents(PuzzleSolved, "puzzle_id", PUZZLE_IDS)),
+            Achievement("survivor", "幸存者", "生命值降至10以下后存活",
+                        rule=StatRule("health", minimum=1, maximum=9)),
+            Achievement("monster_slayer", "怪物猎人", "击败3只怪物", rule=CountEvents(MonsterDefeated, 3)),
+            Achievement("level_5", "进阶冒险者", "达到5级", rule=StatRule("level", minimum=5)),
+            Achievement("rich", "富有", "拥有100金币", rule=StatRule("gold", minimum=100)),
+            Achievement("crafter", "工匠", "合成5个物品", rule=CountEvents(ItemCrafted, 5)),
+            Achievement("social", "社交达人", "与所有NPC对话",
+                        rule=CoverEvents(NpcTalkedTo, "npc_name", peaceful_npcs)),
         ]
         for ach in achievements:
-            self.achievements[ach.id] = ach
+            self.add(ach)
+
+    def add(self, achievement: Achievement):
+        self.achievements[achievement.id] = achievement
+        if self.game_state is not None:
+            self._subscribe(achievement.rule)
+            self._index(achievement)
+
+    def attach(self, events: EventBus, game_state):
+        """Evaluate achievement rules from the engine's events"""
+        self.events = events
+        self.game_state = game_state
+        for achievement in self.achievements.values():
+            self._subscribe(achievement.rule)
+        self._rebuild()
+
+    def _subscribe(self, rule: Optional[AchievementRule]):
+        event_type = PlayerStatChanged if isinstance(rule, StatRule) else getattr(rule, "event_type", None)
+        if event_type is None or event_type in self._subscribed:
+            return
+        self._subscribed.add(event_type)
+        handler = self._on_stat_changed if event_type is PlayerStatChanged else self._on_event
+        self.events.subscribe(event_type, handler)
+
+    def _rebuild(self):
+        self._event_rules.clear()
+        self._match_rules.clear()
+        self._stat_floors.clear()
+        self._stat_ranges.clear()
+        self._universes.clear()
+        for achievement in self.achievements.values():
+            self._index(achievement)
+        self._check_stats()
+
+    def _index(self, achievement: Achievement):
+        rule = achievement.rule
+        if rule is None or achievement.unlocked:
+            return
+        if isinstance(rule, StatRule):
+            if rule.maximum is None:
+                bisect.insort(self._stat_floors.setdefault(rule.field, []), (rule.minimum, achievement.id))
+            else:
+                self._stat_ranges.setdefault(rule.field, []).append(achievement.id)
+            return
+        if isinstance(rule, CoverEvents):
+            universe = rule.universe(self.game_state) if callable(rule.universe) else rule.universe
+            self._universes[achievement.id] = frozenset(universe)
+            covered = self.covered.setdefault(achievement.id, set())
+            if rule.seed:
+                covered.update(key for key in rule.seed(self.game_state) if key in self._universes[achievement.id])
+        if isinstance(rule, CountEvents) and rule.match:
+            attr, value = rule.match
+            by_value = self._match_rules.setdefault(rule.event_type, {}).setdefault(attr, {})
+            by_value.setdefault(value, []).append(achievement.id)
+        else:
+            self._event_rules.setdefault(rule.event_type, []).append(achievement.id)
+        if isinstance(rule, CoverEvents):
+            self._check_coverage(achievement.id)
+
+    def _unindex(self, achievement: Achievement):
+        rule = achievement.rule
+        if isinstance(rule, StatRule):
+            if rule.maximum is None:
+                self._stat_floors[rule.field].remove((rule.minimum, achievement.id))
+            else:
+                self._stat_ranges[rule.field].remove(achievement.id)
+        elif isinstance(rule, CountEvents) and rule.match:
+            attr, value = rule.match
+            self._match_rules[rule.event_type][attr][value].remove(achievement.id)
+        elif rule is not None:
+            self._event_rules[rule.event_type].remove(achievement.id)
 
     def unlock(self, achievement_id: str) -> bool:
         if achievement_id in self.achievements and not self.achievements[achievement_id].unlocked:
-            self.achievements[achievement_id].unlocked = True
+            achievement = self.achievements[achievement_id]
+            achievement.unlocked = True
+            if self.game_state is not None:
+                self._unindex(achievement)
+            if self.events:
+                self.events.publish(AchievementUnlocked(achievement_id, achievement.name))
             return True
         return False
 
@@ -43,6 +190,67 @@ class AchievementSystem:
             return self.unlock(achievement_id)
         return False
 
+    def _on_event(self, event: GameEvent):
+        event_type = type(event)
+        for achievement_id in tuple(self._event_rules.get(event_type, ())):
+            self._advance(achievement_id, event)
+        for attr, by_value in self._match_rules.get(event_type, {}).items():
+            for achievement_id in tuple(by_value.get(getattr(event, attr), ())):
+                self._advance(achievement_id, event)
+
+    def _advance(self, achievement_id: str, event: GameEvent):
+        rule = self.achievements[achievement_id].rule
+        if isinstance(rule, CountEvents):
+            self.counters[achievement_id] = self.counters.get(achievement_id, 0) + 1
+            if self.counters[achievement_id] >= rule.count:
+                self.unlock(achievement_id)
+        else:
+            key = getattr(event, rule.key)
+            covered = self.covered[achievement_id]
+            if key in self._universes[achievement_id] and key not in covered:
+                covered.add(key)
+                self._check_coverage(achievement_id)
+
+    def _check_coverage(self, achievement_id: str):
+        universe = self._universes[achievement_id]
+        if universe and len(self.covered[achievement_id]) == len(universe):
+            self.unlock(achievement_id)
+
+    def _on_stat_changed(self, event: PlayerStatChanged):
+        self._check_stat(event.field, event.new)
+
+    def _check_stat(self, field_name: str, value):
+        floors = self._stat_floors.get(field_name)
+        while floors and floors[0][0] <= value:
+            self.unlock(floors[0][1])
+        for achievement_id in tuple(self._stat_ranges.get(field_name, ())):
+            if self.achievements[achievement_id].rule.holds(value):
+                self.unlock(achievement_id)
+
+    def _check_stats(self):
+        """Evaluate stat rules against the current player, e.g. after loading a save"""
+        player = self.game_state.player if self.game_state else None
+        if player is None:
+            return
+        for field_name in set(self._stat_floors) | set(self._stat_ranges):
+            self._check_stat(field_name, getattr(player, field_name))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "unlocked": [ach_id for ach_id, ach in self.achievements.items() if ach.unlocked],
+            "counters": dict(self.counters),
+            "covered": {ach_id: sorted(keys) for ach_id, keys in self.covered.items() if keys},
+        }
+
+    def load_dict(self, data: Dict[str, Any]):
+        unlocked = set(data.get("unlocked", []))
+        for ach_id, achievement in self.achievements.items():
+            achievement.unlocked = ach_id in unlocked
+        self.counters = dict(data.get("counters", {}))
+        self.covered = {ach_id: set(keys) for ach_id, keys in data.get("covered", {}).items()}
+        if self.game_state is not None:
+            self._rebuild()
+
     def get_all(self) -> List[Tuple[str, str, bool]]:
         return [(a.name, a.description, a.unlocked) for a in self.achievements.values() if not a.hidden]
 
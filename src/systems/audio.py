@@ -2,6 +2,7 @@
 import os
 import platform
 from typing import Optional
+from .events import EventBus, ItemCrafted, ItemTaken, ItemUsed, PuzzleSolved, RoomEntered
 
 SOUND_ENABLED = True
 AMBIENT_CHANNEL = None
@@ -33,12 +34,38 @@ SOUND_FILES = {
 
 LOADED_SOUNDS = {}
 
+PUZZLE_SOUNDS = {
+    "fireplace_lit": "fire_crackle",
+    "cellar_door_unlocked": "door_unlock",
+}
+
 class AudioSystem:
     def __init__(self, sounds_dir: str):
         self.sounds_dir = sounds_dir
         self.enabled = SOUND_ENABLED
         self.ambient_channel = AMBIENT_CHANNEL
 
+    def attach(self, events: EventBus):
+        """Play sound effects for game events"""
+        events.subscribe(RoomEntered, self._on_room_entered)
+        events.subscribe(ItemTaken, lambda event: self.play_sound("item_pickup"))
+        events.subscribe(ItemUsed, self._on_item_used)
+        events.subscribe(ItemCrafted, lambda event: self.play_sound("puzzle_solve"))
+        events.subscribe(PuzzleSolved, self._on_puzzle_solved)
+
+    def _on_room_entered(self, event: RoomEntered):
+        if event.fast_travel:
+            self.play_sound("puzzle_solve")
+        else:
+            self.play_sound("footsteps_stone", volume=0.5)
+
+    def _on_item_used(self, event: ItemUsed):
+        if event.consumed:
+            self.play_sound("item_pickup")
+
+    def _on_puzzle_solved(self, event: PuzzleSolved):
+        self.play_sound(PUZZLE_SOUNDS.get(event.puzzle_id, "puzzle_solve"))
+
     def load_sound(self, sound_name: str):
         if not self.enabled:
             return None
@@ -1,93 +1,209 @@
 """Combat and quest systems"""
-from typing import Optional, List, Dict
+from dataclasses import dataclass
+from typing import Any, Optional, List, Dict, Set, Tuple, Type, Union
 from ..core.entities import Player, NPC
-from ..ui.terminal_ui import ui
+from ..ui import BaseUI, get_default_ui
+from .events import (
+    CombatActionNeeded, CombatEnded, CombatHit, CombatStarted, EventBus, FleeAttempted, GameEvent,
+    QuestCompleted, QuestProgress,
+)
+from .combat_sim import CombatSimulation, simulate_combat
 import random
 import time
 
+# Phases of an encounter
+AWAITING_ACTION, PLAYER_TURN, ENEMY_TURN, OVER = "action", "player", "enemy", "over"
+
+FLEE_ACTIONS = ("逃跑", "flee", "run")
+
+@dataclass
+class Encounter:
+    """One fight in progress"""
+    player: Player
+    enemy: NPC
+    phase: str = AWAITING_ACTION
+    action: Optional[str] = None
+    outcome: Optional[str] = None  # "won", "lost" or "fled" once over
+
 class CombatSystem:
-    def __init__(self, audio_system=None, auto_mode: bool = False):
+    """Turn-based combat as a non-blocking state machine.
+
+    begin() starts a fight, submit() hands over the player's action and
+    each advance() resolves the next half-round; all three return the
+    combat events that happened and never block, print or sleep. render()
+    presents those events, pacing them for human players. The engine steps
+    its fights through these; start_combat() is the blocking driver for a
+    standalone terminal fight.
+    """
+
+    def __init__(self, audio_system=None, auto_mode: bool = False, ui: Optional[BaseUI] = None,
+                 paced: Optional[bool] = None, rng: Optional[random.Random] = None):
         self.audio = audio_system
-        self.in_combat = False
+        self.rng = rng if rng is not None else random.Random()
+        self.ui = ui if ui is not None else get_default_ui()
+        self.encounter: Optional[Encounter] = None
         self.auto_mode = auto_mode  # 自动战斗模式（用于测试）
+        self.paced = not auto_mode if paced is None else paced
 
-    def start_combat(self, player: Player, enemy: NPC) -> bool:
-        """Returns True if player wins, False if player loses"""
-        self.in_combat = True
-        ui.print_message(f"\n[bold red]战斗开始！[/] 你遭遇了 {enemy.name}！", "red")
-        
-        if not self.auto_mode:
-            time.sleep(1)
-
-        while player.health > 0 and enemy.health > 0:
-            ui.print_combat(player.health, player.max_health, enemy.name, enemy.health, enemy.max_health)
-
-            # 自动模式下自动攻击
-            if self.auto_mode:
-                action = "攻击"
-            else:
-                action = ui.get_input("\n[攻击/逃跑] > ")
+    @property
+    def in_combat(self) -> bool:
+        return self.encounter is not None and self.encounter.phase != OVER
 
-            if action in ["逃跑", "flee", "run"]:
-                if random.random() < 0.5:
-                    ui.print_success("你成功逃跑了！")
-                    self.in_combat = False
-                    return False
-                else:
-                    ui.print_warning("逃跑失败！")
+    @property
+    def awaiting_action(self) -> bool:
+        return self.in_combat and self.encounter.phase == AWAITING_ACTION
 
-            player_damage = self._calculate_damage(player.strength, enemy.defense_power)
-            enemy.health -= player_damage
-            ui.print_message(f"你对 {enemy.name} 造成了 [bold red]{player_damage}[/] 点伤害！", "green")
+    def begin(self, player: Player, enemy: NPC) -> List[GameEvent]:
+        self.encounter = Encounter(player, enemy)
+        events: List[GameEvent] = [CombatStarted(enemy.name)]
+        if player.health > 0 and enemy.health > 0:
+            events.append(self._action_needed())
+        else:
+            self._end("won" if player.health > 0 else "lost", events)
+        return events
 
-            if self.audio:
-                self.audio.play_sound("combat_hit", volume=0.5)
+    def submit(self, action: Optional[str]) -> List[GameEvent]:
+        """Choose the player's action for this round; anything but fleeing attacks"""
+        if not self.awaiting_action:
+            raise RuntimeError("combat is not waiting for an action")
+        self.encounter.action = action
+        self.encounter.phase = PLAYER_TURN
+        return []
 
-            time.sleep(0.5)
+    def advance(self) -> List[GameEvent]:
+        """Resolve the next half-round; nothing happens while an action is awaited"""
+        encounter = self.encounter
+        events: List[GameEvent] = []
+        if encounter is None or encounter.phase in (AWAITING_ACTION, OVER):
+            return events
+        player, enemy = encounter.player, encounter.enemy
 
+        if encounter.phase == PLAYER_TURN:
+            if encounter.action in FLEE_ACTIONS:
+                escaped = self.rng.random() < 0.5
+                events.append(FleeAttempted(escaped))
+                if escaped:
+                    self._end("fled", events)
+                    return events
+            damage = self._calculate_damage(player.strength, enemy.defense_power)
+            enemy.health -= damage
+            events.append(CombatHit("你", enemy.name, damage, enemy.health, True))
             if enemy.health <= 0:
-                ui.print_monster_defeated(enemy.name, enemy.attack_power * 10, enemy.attack_power * 5)
                 old_level = player.level
                 player.add_experience(enemy.attack_power * 10)
+                self._end("won", events, enemy.attack_power * 10, enemy.attack_power * 5,
+                          player.level if player.level > old_level else None)
+            else:
+                encounter.phase = ENEMY_TURN
+        else:
+            damage = self._calculate_damage(enemy.attack_power, player.defense)
+            player.take_damage(damage)
+            events.append(CombatHit(enemy.name, "你", damage, player.health, False))
+            if player.health <= 0:
+                self._end("lost", events)
+            else:
+                encounter.phase = AWAITING_ACTION
+                events.append(self._action_needed())
+        return events
+
+    def _action_needed(self) -> CombatActionNeeded:
+        player, enemy = self.encounter.player, self.encounter.enemy
+        return CombatActionNeeded(player.health, player.max_health, enemy.name, enemy.health, enemy.max_health)
+
+    def _end(self, outcome: str, events: List[GameEvent], experience: int = 0, gold: int = 0,
+             new_level: Optional[int] = None):
+        self.encounter.phase = OVER
+        self.encounter.outcome = outcome
+        events.append(CombatEnded(self.encounter.enemy.name, outcome, experience, gold, new_level))
 
-                # Check for level up
-                if player.level > old_level:
-                    ui.print_level_up(player.level)
+    def render(self, events: List[GameEvent]):
+        """Present combat events on the UI, with sounds and (when paced) pauses between blows"""
+        for event in events:
+            if isinstance(event, CombatStarted):
+                self.ui.print_message(f"\n[bold red]战斗开始！[/] 你遭遇了 {event.enemy_name}！", "red")
+                self._pause(1)
+            elif isinstance(event, CombatActionNeeded):
+                self.ui.print_combat(event.player_hp, event.player_max_hp, event.enemy_name,
+                                     event.enemy_hp, event.enemy_max_hp)
+            elif isinstance(event, FleeAttempted):
+                if event.succeeded:
+                    self.ui.print_success("你成功逃跑了！")
+                else:
+                    self.ui.print_warning("逃跑失败！")
+            elif isinstance(event, CombatHit) and event.by_player:
+                self.ui.print_message(f"你对 {event.defender} 造成了 [bold red]{event.damage}[/] 点伤害！", "green")
+                if self.audio:
+                    self.audio.play_sound("combat_hit", volume=0.5)
+                self._pause(0.5)
+            elif isinstance(event, CombatHit):
+                self.ui.print_message(f"{event.attacker} 对你造成了 [bold red]{event.damage}[/] 点伤害！", "red")
+                self._pause(0.5)
+            elif isinstance(event, CombatEnded) and event.outcome == "won" and event.experience:
+                self.ui.print_monster_defeated(event.enemy_name, event.experience, event.gold)
+                if event.new_level is not None:
+                    self.ui.print_level_up(event.new_level)
                     if self.audio:
                         self.audio.play_sound("level_up")
-
                 if self.audio:
                     self.audio.play_sound("puzzle_solve")
+            elif isinstance(event, CombatEnded) and event.outcome == "lost":
+                self.ui.print_error("\n你被击败了...")
 
-                self.in_combat = False
-                return True
-
-            enemy_damage = self._calculate_damage(enemy.attack_power, player.defense)
-            player.take_damage(enemy_damage)
-            ui.print_message(f"{enemy.name} 对你造成了 [bold red]{enemy_damage}[/] 点伤害！", "red")
+    def start_combat(self, player: Player, enemy: NPC) -> bool:
+        """Play a whole fight, prompting for each action unless in auto mode. Returns True if player wins"""
+        self.render(self.begin(player, enemy))
+        while self.in_combat:
+            if self.awaiting_action:
+                self.submit("攻击" if self.auto_mode else self.ui.get_input("\n[攻击/逃跑] > "))
+            self.render(self.advance())
+        return self.encounter.outcome == "won"
 
-            time.sleep(0.5)
+    def simulate(self, player_stats, enemy_stats, trials: int = 10000, flee_at: int = 0,
+                 seed: Optional[int] = None) -> CombatSimulation:
+        """Win rate, round counts and damage taken over `trials` fights played by start_combat's rules.
 
-            if player.health <= 0:
-                ui.print_error("\n你被击败了...")
-                self.in_combat = False
-                return False
+        Takes a Player and an NPC (or anything with the same stat attributes)
+        and never modifies them, prints or sleeps. The player tries to flee
+        whenever its health is at or below `flee_at`.
+        """
+        return simulate_combat(player_stats, enemy_stats, trials, flee_at, seed)
 
-        self.in_combat = False
-        return player.health > 0
+    def _pause(self, seconds: float):
+        """Pace the fight for human players; unpaced (auto or hosted) fights never sleep"""
+        if self.paced:
+            self.ui.flush()
+            time.sleep(seconds)
 
     def _calculate_damage(self, attack: int, defense: int) -> int:
         base_damage = max(1, attack - defense // 2)
-        variance = random.randint(-2, 2)
+        variance = self.rng.randint(-2, 2)
         return max(1, base_damage + variance)
 
+@dataclass(frozen=True)
+class Objective:
+    """A quest objective that completes on the first event of `event_type` whose attributes equal `match`"""
+    description: str
+    event_type: Type[GameEvent]
+    match: Tuple[Tuple[str, Any], ...] = ()
+
+    @classmethod
+    def on(cls, description: str, event_type: Type[GameEvent], **match) -> "Objective":
+        return cls(description, event_type, tuple(match.items()))
+
+    def matches(self, event: GameEvent) -> bool:
+        return all(getattr(event, attr) == value for attr, value in self.match)
+
 class Quest:
     def __init__(self, quest_id: str, name: str, description: str,
-                 objectives: List[str], rewards: Dict[str, int]):
+                 objectives: List[Union[str, Objective]], rewards: Dict[str, int]):
         self.quest_id = quest_id
         self.name = name
         self.description = description
-        self.objectives = objectives
+        # Plain-string objectives are only completed by hand via complete_objective()
+        self.triggers: List[Optional[Objective]] = [
+            obj if isinstance(obj, Objective) else None for obj in objectives
+        ]
+        self.objectives = [obj.description if isinstance(obj, Objective) else obj for obj in objectives]
         self.completed_objectives = [False] * len(objectives)
         self.rewards = rewards
         self.completed = False
@@ -106,46 +222,149 @@ class Quest:
         total = len(self.objectives)
         return f"{completed}/{total}"
 
+# (quest id, objective index)
+ObjectiveRef = Tuple[str, int]
+
 class QuestSystem:
-    def __init__(self):
-        self.active_quests: List[Quest] = []
-        self.completed_quests: List[Quest] = []
+    """Tracks quests by id and advances event-driven objectives.
+
+    Open objectives are indexed by event type and, when they match on
+    attributes, by their first (attribute, value) pair, so an event only
+    touches the objectives listening to it.
+    """
+
+    def __init__(self, ui: Optional[BaseUI] = None, events: Optional[EventBus] = None):
+        self.ui = ui if ui is not None else get_default_ui()
+        self.events = events
+        self.game_state = None
+        self.quests: Dict[str, Quest] = {}
+        self.active_quests: Dict[str, Quest] = {}
+        self.completed_quests: Dict[str, Quest] = {}
+        # event type -> matched attribute (None if unmatched) -> attribute value -> objectives
+        self._listeners: Dict[type, Dict[Optional[str], Dict[Any, List[ObjectiveRef]]]] = {}
+        self._subscribed: Set[type] = set()
+
+    def attach(self, events: EventBus, game_state):
+        """Advance objectives from the engine's events; rewards go to game_state.player"""
+        self.events = events
+        self.game_state = game_state
+        for quest in self.active_quests.values():
+            self._subscribe(quest)
 
     def add_quest(self, quest: Quest):
-        self.active_quests.append(quest)
-        ui.print_success(f"新任务：{quest.name}")
-        ui.print_message(quest.description, "white")
+        self.quests[quest.quest_id] = quest
+        self.active_quests[quest.quest_id] = quest
+        self._index(quest)
+        if self.events:
+            self._subscribe(quest)
+        self.ui.print_success(f"新任务：{quest.name}")
+        self.ui.print_message(quest.description, "white")
+
+    def get_quest(self, quest_id: str) -> Optional[Quest]:
+        return self.quests.get(quest_id)
+
+    def _subscribe(self, quest: Quest):
+        for trigger in quest.triggers:
+            if trigger and trigger.event_type not in self._subscribed:
+                self._subscribed.add(trigger.event_type)
+                self.events.subscribe(trigger.event_type, self._on_event)
+
+    def _slot(self, trigger: Objective) -> List[ObjectiveRef]:
+        attr, value = trigger.match[0] if trigger.match else (None, None)
+        by_attr = self._listeners.setdefault(trigger.event_type, {})
+        return by_attr.setdefault(attr, {}).setdefault(value, [])
+
+    def _index(self, quest: Quest):
+        for index, trigger in enumerate(quest.triggers):
+            if trigger and not quest.completed_objectives[index]:
+                self._slot(trigger).append((quest.quest_id, index))
+
+    def _unindex(self, quest: Quest, index: int):
+        trigger = quest.triggers[index]
+        if trigger:
+            refs = self._slot(trigger)
+            if (quest.quest_id, index) in refs:
+                refs.remove((quest.quest_id, index))
+
+    def _on_event(self, event: GameEvent):
+        refs = []
+        for attr, by_value in self._listeners.get(type(event), {}).items():
+            refs.extend(by_value.get(None if attr is None else getattr(event, attr), ()))
+        for quest_id, index in refs:
+            quest = self.quests[quest_id]
+            if quest.triggers[index].matches(event):
+                self.advance(quest_id, index)
+
+    def advance(self, quest_id: str, index: int) -> bool:
+        """Complete one objective; finishing the last one completes the quest. True if progress was made"""
+        quest = self.active_quests.get(quest_id)
+        if quest is None or not 0 <= index < len(quest.objectives) or quest.completed_objectives[index]:
+            return False
+        quest.complete_objective(index)
+        self._unindex(quest, index)
+        if self.events:
+            self.events.publish(QuestProgress(quest.quest_id, quest.name, quest.objectives[index]))
+        if quest.is_completed() and self.game_state is not None:
+            self.complete_quest(quest_id, self.game_state.player)
+        return True
 
     def complete_quest(self, quest_id: str, player: Player) -> bool:
-        for quest in self.active_quests:
-            if quest.quest_id == quest_id and quest.is_completed():
-                self.active_quests.remove(quest)
-                self.completed_quests.append(quest)
+        quest = self.active_quests.get(quest_id)
+        if quest is None or not quest.is_completed():
+            return False
 
-                ui.print_success(f"任务完成：{quest.name}")
+        del self.active_quests[quest_id]
+        self.completed_quests[quest_id] = quest
 
-                if "experience" in quest.rewards:
-                    player.add_experience(quest.rewards["experience"])
-                    ui.print_message(f"获得 {quest.rewards['experience']} 点经验！", "yellow")
+        self.ui.print_success(f"任务完成：{quest.name}")
 
-                if "score" in quest.rewards:
-                    player.score += quest.rewards["score"]
+        if "experience" in quest.rewards:
+            player.add_experience(quest.rewards["experience"])
+            self.ui.print_message(f"获得 {quest.rewards['experience']} 点经验！", "yellow")
 
-                if "gold" in quest.rewards:
-                    player.add_gold(quest.rewards["gold"])
-                    ui.print_message(f"获得 {quest.rewards['gold']} 金币！", "yellow")
+        if "score" in quest.rewards:
+            player.score += quest.rewards["score"]
 
-                return True
-        return False
+        if "gold" in quest.rewards:
+            player.add_gold(quest.rewards["gold"])
+            self.ui.print_message(f"获得 {quest.rewards['gold']} 金币！", "yellow")
+
+        if self.events:
+            self.events.publish(QuestCompleted(quest.quest_id, quest.name))
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            quest_id: {
+                "objectives": list(quest.completed_objectives),
+                "rewarded": quest_id in self.completed_quests,
+            }
+            for quest_id, quest in self.quests.items()
+        }
+
+    def load_dict(self, data: Dict[str, Any]):
+        self.active_quests.clear()
+        self.completed_quests.clear()
+        self._listeners.clear()
+        for quest_id, quest in self.quests.items():
+            state = data.get(quest_id, {})
+            done = list(state.get("objectives", []))[:len(quest.objectives)]
+            quest.completed_objectives = done + [False] * (len(quest.objectives) - len(done))
+            quest.completed = all(quest.completed_objectives)
+            if state.get("rewarded"):
+                self.completed_quests[quest_id] = quest
+            else:
+                self.active_quests[quest_id] = quest
+                self._index(quest)
 
     def show_quests(self):
         if not self.active_quests:
-            ui.print_warning("没有进行中的任务")
+            self.ui.print_warning("没有进行中的任务")
             return
 
-        ui.print_message("\n[bold yellow]当前任务：[/]", "yellow")
-        for quest in self.active_quests:
-            ui.print_message(f"\n[cyan]{quest.name}[/] - 进度: {quest.get_progress()}", "white")
+        self.ui.print_message("\n[bold yellow]当前任务：[/]", "yellow")
+        for quest in self.active_quests.values():
+            self.ui.print_message(f"\n[cyan]{quest.name}[/] - 进度: {quest.get_progress()}", "white")
             for i, obj in enumerate(quest.objectives):
                 status = "✓" if quest.completed_objectives[i] else "○"
-                ui.print_message(f"  {status} {obj}", "white")
+                self.ui.print_message(f"  {status} {obj}", "white")
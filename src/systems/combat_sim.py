@@ -0,0 +1,137 @@
+"""Monte Carlo combat simulation for balancing, with the rules of CombatSystem.start_combat"""
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_ENABLED = True
+except ImportError:
+    np = None
+    NUMPY_ENABLED = False
+
+DAMAGE_PERCENTILES = (50, 90, 99)
+
+# Fight outcomes
+WON, LOST, FLED = 1, 2, 3
+
+@dataclass
+class CombatSimulation:
+    """Outcome distribution of many simulated fights between the same two combatants"""
+    trials: int
+    wins: int
+    losses: int
+    fled: int
+    turn_counts: List[int]  # turn_counts[n]: fights that lasted n rounds
+    mean_damage: float  # health the player lost, averaged over every fight
+    damage_percentiles: Dict[int, float] = field(default_factory=dict)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trials if self.trials else 0.0
+
+    @property
+    def mean_turns(self) -> float:
+        return sum(turns * count for turns, count in enumerate(self.turn_counts)) / self.trials if self.trials else 0.0
+
+def _base_damage(attack: int, defense: int) -> int:
+    """CombatSystem._calculate_damage before its -2..2 variance"""
+    return max(1, attack - defense // 2)
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of sorted values, as numpy.percentile computes it"""
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def simulate_combat(player, enemy, trials: int = 10000, flee_at: int = 0,
+                    seed: Optional[int] = None, use_numpy: Optional[bool] = None) -> CombatSimulation:
+    """Play `trials` independent fights of `player` against `enemy` without touching either.
+
+    `player` needs health, strength and defense (a Player); `enemy` needs
+    health, attack_power and defense_power (an NPC). Each round follows
+    start_combat exactly: a player at or below `flee_at` health tries to flee
+    (succeeding half the time), then the player strikes, then a surviving
+    enemy strikes back through Player.take_damage. Fights run as NumPy array
+    operations when it is installed, else one at a time in Python.
+    """
+    if use_numpy is None:
+        use_numpy = NUMPY_ENABLED
+    run = _simulate_numpy if use_numpy else _simulate_python
+    return run(player.health, player.strength, player.defense,
+               enemy.health, enemy.attack_power, enemy.defense_power, trials, flee_at, seed)
+
+def _simulate_python(health, strength, defense, enemy_health, enemy_attack, enemy_defense,
+                     trials, flee_at, seed) -> CombatSimulation:
+    rng = random.Random(seed)
+    player_base = _base_damage(strength, enemy_defense)
+    enemy_base = _base_damage(enemy_attack, defense)
+    outcomes = {WON: 0, LOST: 0, FLED: 0}
+    turn_counts: List[int] = []
+    damage: List[int] = []
+    for _ in range(trials):
+        player_hp, enemy_hp, turns, outcome = health, enemy_health, 0, None
+        while player_hp > 0 and enemy_hp > 0:
+            turns += 1
+            if player_hp <= flee_at and rng.random() < 0.5:
+                outcome = FLED
+                break
+            enemy_hp -= max(1, player_base + rng.randint(-2, 2))
+            if enemy_hp <= 0:
+                break
+            enemy_damage = max(1, enemy_base + rng.randint(-2, 2))
+            player_hp = max(0, player_hp - max(1, enemy_damage - defense))
+        if outcome is None:
+            outcome = WON if player_hp > 0 else LOST
+        outcomes[outcome] += 1
+        if turns >= len(turn_counts):
+            turn_counts.extend([0] * (turns + 1 - len(turn_counts)))
+        turn_counts[turns] += 1
+        damage.append(health - player_hp)
+
+    damage.sort()
+    return CombatSimulation(
+        trials, outcomes[WON], outcomes[LOST], outcomes[FLED], turn_counts,
+        sum(damage) / trials if trials else 0.0,
+        {q: float(_percentile(damage, q)) for q in DAMAGE_PERCENTILES},
+    )
+
+def _simulate_numpy(health, strength, defense, enemy_health, enemy_attack, enemy_defense,
+                    trials, flee_at, seed) -> CombatSimulation:
+    rng = np.random.default_rng(seed)
+    player_base = _base_damage(strength, enemy_defense)
+    enemy_base = _base_damage(enemy_attack, defense)
+    player_hp = np.full(trials, health, dtype=np.int64)
+    enemy_hp = np.full(trials, enemy_health, dtype=np.int64)
+    turns = np.zeros(trials, dtype=np.int64)
+    outcome = np.zeros(trials, dtype=np.int8)
+
+    # Indices of the fights still going; each round only draws for those
+    active = np.arange(trials) if health > 0 and enemy_health > 0 else np.arange(0)
+    while active.size:
+        turns[active] += 1
+        if flee_at > 0:
+            escaped = (player_hp[active] <= flee_at) & (rng.random(active.size) < 0.5)
+            outcome[active[escaped]] = FLED
+            active = active[~escaped]
+
+        enemy_hp[active] -= np.maximum(1, player_base + rng.integers(-2, 3, active.size))
+        active = active[enemy_hp[active] > 0]
+
+        enemy_damage = np.maximum(1, enemy_base + rng.integers(-2, 3, active.size))
+        player_hp[active] = np.maximum(0, player_hp[active] - np.maximum(1, enemy_damage - defense))
+        active = active[player_hp[active] > 0]
+
+    undecided = outcome == 0
+    outcome[undecided] = np.where(player_hp[undecided] > 0, WON, LOST)
+    damage = health - player_hp
+    percentiles = np.percentile(damage, DAMAGE_PERCENTILES) if trials else [0.0] * len(DAMAGE_PERCENTILES)
+    return CombatSimulation(
+        trials, int(np.count_nonzero(outcome == WON)), int(np.count_nonzero(outcome == LOST)),
+        int(np.count_nonzero(outcome == FLED)), np.bincount(turns).tolist(),
+        float(damage.mean()) if trials else 0.0,
+        {q: float(value) for q, value in zip(DAMAGE_PERCENTILES, percentiles)},
+    )
@@ -0,0 +1,151 @@
+"""Typed game events and the publish/subscribe bus that delivers them"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+@dataclass(frozen=True)
+class GameEvent:
+    """Base class of every event; subscribing to it receives them all"""
+
+@dataclass(frozen=True)
+class RoomEntered(GameEvent):
+    room_id: str
+    display_name: str
+    first_visit: bool
+    fast_travel: bool = False
+
+@dataclass(frozen=True)
+class ItemTaken(GameEvent):
+    item_name: str
+    display_name: str
+    room_id: str
+
+@dataclass(frozen=True)
+class ItemDropped(GameEvent):
+    item_name: str
+    display_name: str
+    room_id: str
+
+@dataclass(frozen=True)
+class ItemUsed(GameEvent):
+    item_name: str
+    display_name: str
+    room_id: str
+    target: Optional[str] = None
+    consumed: bool = False
+
+@dataclass(frozen=True)
+class ItemCrafted(GameEvent):
+    item_name: str
+    display_name: str
+    recipe_id: str
+
+@dataclass(frozen=True)
+class NpcTalkedTo(GameEvent):
+    npc_name: str
+    topic: str
+
+@dataclass(frozen=True)
+class MonsterDefeated(GameEvent):
+    monster_name: str
+    room_id: str
+
+@dataclass(frozen=True)
+class PuzzleSolved(GameEvent):
+    puzzle_id: str
+    room_id: str
+
+@dataclass(frozen=True)
+class QuestProgress(GameEvent):
+    quest_id: str
+    quest_name: str
+    objective: str
+
+@dataclass(frozen=True)
+class QuestCompleted(GameEvent):
+    quest_id: str
+    quest_name: str
+
+@dataclass(frozen=True)
+class AchievementUnlocked(GameEvent):
+    achievement_id: str
+    name: str
+
+@dataclass(frozen=True)
+class PlayerStatChanged(GameEvent):
+    """A tracked player field changed during a command"""
+    field: str
+    old: Any
+    new: Any
+
+@dataclass(frozen=True)
+class CombatStarted(GameEvent):
+    enemy_name: str
+
+@dataclass(frozen=True)
+class CombatActionNeeded(GameEvent):
+    """The fight waits for the player's next action"""
+    player_hp: int
+    player_max_hp: int
+    enemy_name: str
+    enemy_hp: int
+    enemy_max_hp: int
+
+@dataclass(frozen=True)
+class FleeAttempted(GameEvent):
+    succeeded: bool
+
+@dataclass(frozen=True)
+class CombatHit(GameEvent):
+    attacker: str
+    defender: str
+    damage: int
+    defender_hp: int
+    by_player: bool
+
+@dataclass(frozen=True)
+class CombatEnded(GameEvent):
+    enemy_name: str
+    outcome: str  # "won", "lost" or "fled"
+    experience: int = 0
+    gold: int = 0
+    new_level: Optional[int] = None  # set if the experience levelled the player up
+
+Handler = Callable[[GameEvent], None]
+
+class EventBus:
+    """Per-type subscriber lists.
+
+    Handlers for an event type (including those subscribed to its base
+    classes) are resolved once into a tuple, so publishing an event nobody
+    listens to costs a single dict lookup.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[Type[GameEvent], List[Handler]] = {}
+        self._routes: Dict[Type[GameEvent], Tuple[Handler, ...]] = {}
+
+    def subscribe(self, event_type: Type[GameEvent], handler: Handler):
+        self._subscribers.setdefault(event_type, []).append(handler)
+        self._routes.clear()
+
+    def unsubscribe(self, event_type: Type[GameEvent], handler: Handler):
+        handlers = self._subscribers.get(event_type)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+            self._routes.clear()
+
+    def handlers_for(self, event_type: Type[GameEvent]) -> Tuple[Handler, ...]:
+        route = self._routes.get(event_type)
+        if route is None:
+            route = tuple(handler for cls in event_type.__mro__
+                          for handler in self._subscribers.get(cls, ()))
+            self._routes[event_type] = route
+        return route
+
+    def wants(self, event_type: Type[GameEvent]) -> bool:
+        """Whether publishing this type would reach anyone; lets emitters skip building events"""
+        return bool(self.handlers_for(event_type))
+
+    def publish(self, event: GameEvent):
+        for handler in self.handlers_for(type(event)):
+            handler(event)
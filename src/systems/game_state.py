@@ -1,44 +1,78 @@
 """Enhanced game state management with multi-save and auto-save"""
 import json
-import os
-from typing import Dict, Any, Optional, List
-from ..core.entities import Player, Room, Item
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Mapping, Set
+from ..core.entities import Player, Item, Room, NamedCollection
+from ..core.world import SessionRooms
+from .save_codec import get_codec
+from .save_store import FileSaveStore, SaveStore, slot_metadata
+from .save_writer import SaveWriter
+
+@dataclass
+class SaveCheckpoint:
+    """What a slot's base snapshot plus journal hold, so the next save writes only the difference"""
+    generation: int
+    player: Dict[str, Any]
+    rooms: Dict[str, Dict[str, Any]]
+    components: Dict[str, Any]
+    codec: str = "json"
+    dirty_rooms: Set[str] = field(default_factory=set)
+    journal_entries: int = 0
+    journal_bytes: int = 0
+    base_bytes: Optional[int] = None  # known once the base is on disk
+    failed: bool = False  # a write failed, so the files no longer match this checkpoint
+
+    def needs_base(self, compact_after: int) -> bool:
+        return (self.failed or self.journal_entries >= compact_after or
+                (self.base_bytes is not None and self.journal_bytes > self.base_bytes))
 
 class GameState:
-    def __init__(self, save_dir: str):
+    def __init__(self, save_dir: str, writer: Optional[SaveWriter] = None, save_format: str = "json",
+                 store: Optional[SaveStore] = None):
         self.save_dir = save_dir
-        os.makedirs(self.save_dir, exist_ok=True)
+        # New base snapshots use this codec; loading accepts any format
+        self.codec = get_codec(save_format)
+        # Saves are captured here and written by the store, in the background by default
+        self.store = store if store is not None else FileSaveStore(save_dir, writer)
         self.player: Optional[Player] = None
-        self.rooms: Dict[str, Room] = {}
-        self.items: Dict[str, Item] = {}
-        self.npcs: Dict[str, Any] = {}
+        self.rooms = SessionRooms()
+        self.items: Mapping[str, Item] = {}
+        self.npcs: Mapping[str, Any] = {}
         self.auto_save_interval = 10  # Auto-save every N actions
         self.last_auto_save = 0
+        self.components: Dict[str, Any] = {}
+        # Fold a slot's journal into a new base snapshot after this many deltas
+        self.compact_after = 50
+        self._checkpoints: Dict[int, SaveCheckpoint] = {}
+        # Play time carried over from the loaded save, plus time since it was loaded
+        self.play_time_offset = 0.0
+        self._session_started = time.monotonic()
+        self.restores = 0  # times the session was replaced by a snapshot (load_game, replay)
+        self.saves_suspended = False  # replay re-runs save commands without writing
 
-    def get_save_file(self, slot: int = 1) -> str:
-        return os.path.join(self.save_dir, f"save_slot_{slot}.json")
-
-    def list_saves(self) -> List[Dict[str, Any]]:
-        """List all available save slots"""
-        saves = []
-        for slot in range(1, 4):  # 3 save slots
-            save_file = self.get_save_file(slot)
-            if os.path.exists(save_file):
-                try:
-                    with open(save_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        saves.append({
-                            'slot': slot,
-                            'location': data.get('player_room_id', 'Unknown'),
-                            'level': data.get('player_level', 1),
-                            'exists': True
-                        })
-                except Exception:
-                    saves.append({'slot': slot, 'exists': False})
-            else:
-                saves.append({'slot': slot, 'exists': False})
+    def register_component(self, name: str, component: Any):
+        """Save extra state with the game: component.to_dict() is stored under `name`
+        and handed back to component.load_dict() on load ({} for older saves)"""
+        self.components[name] = component
+
+    def list_saves(self, include_empty: int = 3) -> List[Dict[str, Any]]:
+        """Metadata of every manual save slot, without decoding the saves.
+
+        Slots are unbounded; empty entries are added for slots 1..include_empty.
+        """
+        entries = self.store.list_slots()
+        saves = [dict(entries[slot], exists=True) for slot in sorted(entries) if slot >= 1]
+        existing = {save["slot"] for save in saves}
+        saves.extend({"slot": slot, "exists": False}
+                     for slot in range(1, include_empty + 1) if slot not in existing)
+        saves.sort(key=lambda save: save["slot"])
         return saves
 
+    def play_time(self) -> float:
+        """Seconds played, including earlier sessions of the loaded save"""
+        return self.play_time_offset + time.monotonic() - self._session_started
+
     def should_auto_save(self) -> bool:
         """Check if auto-save should trigger"""
         if not self.player:
@@ -48,17 +82,14 @@ class GameState:
         return False
 
     def auto_save(self) -> bool:
-        """Perform auto-save"""
-        if self.save_game(slot=0):  # Slot 0 is auto-save
+        """Queue an auto-save; the write happens off the command loop"""
+        if self.save_game(slot=0, wait=False):  # Slot 0 is auto-save
             self.last_auto_save = self.player.actions_count if self.player else 0
             return True
         return False
 
-    def save_game(self, slot: int = 1) -> bool:
-        if not self.player:
-            return False
-
-        game_state = {
+    def _player_state(self) -> Dict[str, Any]:
+        return {
             "player_room_id": self.player.current_room_id,
             "player_inventory": [i.name for i in self.player.inventory],
             "player_health": self.player.health,
@@ -70,78 +101,215 @@ class GameState:
             "player_defense": self.player.defense,
             "player_intelligence": self.player.intelligence,
             "player_gold": self.player.gold,
-            "player_visited_rooms": self.player.visited_rooms,
+            "player_visited_rooms": list(self.player.visited_rooms),
             "player_actions_count": self.player.actions_count,
-            "player_history": self.player.history,
-            "room_states": {}
+            "player_history": list(self.player.history),
+            "player_play_time": round(self.play_time()),
         }
 
-        for room_id, room in self.rooms.items():
-            game_state["room_states"][room_id] = {
-                "items_in_room": [i.name for i in room.items],
-                "properties": room.properties.copy(),
-                "exits": room.exits.copy(),
-                "description": room.description,
-                "visited_art_shown": room.visited_art_shown,
-                "ambient_sound": room.ambient_sound
-            }
+    @staticmethod
+    def _room_state(room: Room) -> Dict[str, Any]:
+        return {
+            "items_in_room": [i.name for i in room.items],
+            "properties": room.properties.copy(),
+            "exits": room.exits.copy(),
+            "description": room.description,
+            "visited_art_shown": room.visited_art_shown,
+            "ambient_sound": room.ambient_sound,
+            "monsters": [m.name for m in room.monsters]
+        }
 
-        try:
-            os.makedirs(self.save_dir, exist_ok=True)
-            save_file = self.get_save_file(slot)
-            with open(save_file, 'w', encoding='utf-8') as f:
-                json.dump(game_state, f, indent=4, ensure_ascii=False)
+    def _room_states(self) -> Dict[str, Dict[str, Any]]:
+        """Every room that differs from the template, including restored ones not yet hydrated"""
+        states = dict(self.rooms.saved_states())
+        for room_id, room in self.rooms.touched().items():
+            states[room_id] = self._room_state(room)
+        return states
+
+    def _hydrate_room(self, room: Room, room_data: Dict[str, Any]):
+        """Apply a saved room state to a fresh template copy"""
+        room.items = NamedCollection(
+            self.items[name.lower()]
+            for name in room_data.get("items_in_room", [])
+            if name.lower() in self.items
+        )
+        # Copies: the saved state may also be the last checkpoint's record of this room
+        room.properties = dict(room_data.get("properties", room.properties))
+        room.exits = dict(room_data.get("exits", room.exits))
+        room.description = room_data.get("description", room.description)
+        room.visited_art_shown = room_data.get("visited_art_shown", False)
+        room.ambient_sound = room_data.get("ambient_sound", room.ambient_sound)
+        if "monsters" in room_data:
+            remaining = set(room_data["monsters"])
+            room.monsters = NamedCollection(m for m in room.monsters if m.name in remaining)
+
+    def _component_states(self) -> Dict[str, Any]:
+        return {name: component.to_dict() for name, component in self.components.items()}
+
+    def _collect_dirty_rooms(self):
+        """Hand rooms looked up since the last save to every slot being tracked"""
+        dirty = self.rooms.take_dirty()
+        if dirty:
+            for checkpoint in self._checkpoints.values():
+                checkpoint.dirty_rooms |= dirty
+
+    def save_game(self, slot: int = 1, wait: bool = True) -> bool:
+        """Capture what changed since this slot's last checkpoint and hand it to the writer.
+
+        The first save of a slot in a session, and every `compact_after`
+        deltas, capture a full base snapshot instead, which empties the
+        journal. With wait=False the write is only queued.
+        """
+        if not self.player:
+            return False
+        if self.saves_suspended:
             return True
+
+        errors: List[Exception] = []
+        try:
+            self._collect_dirty_rooms()
+            checkpoint = self._checkpoints.get(slot)
+            if (checkpoint is None or checkpoint.codec != self.codec.name
+                    or checkpoint.needs_base(self.compact_after)):
+                self._save_base(slot, errors)
+            else:
+                self._save_delta(slot, checkpoint, errors)
         except Exception:
             return False
+        if wait:
+            self.store.flush([slot])
+            return not errors
+        return True
 
-    def load_game(self, slot: int = 1) -> bool:
-        save_file = self.get_save_file(slot)
-        if not os.path.exists(save_file):
-            return False
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every save this game queued is durable; False on timeout"""
+        return self.store.flush(timeout=timeout)
 
-        try:
-            with open(save_file, 'r', encoding='utf-8') as f:
-                game_state = json.load(f)
+    def _save_base(self, slot: int, errors: List[Exception]):
+        player = self._player_state()
+        rooms = self._room_states()
+        components = self._component_states()
+        generation = time.time_ns()
+        checkpoint = SaveCheckpoint(generation, player, rooms, components, codec=self.codec.name)
+        self._checkpoints[slot] = checkpoint
+        # Later deltas replace entries of the checkpoint's dicts, never mutate them, so shallow copies suffice
+        snapshot = dict(player, room_states=dict(rooms), save_generation=generation, **components)
+        metadata = slot_metadata(slot, player, time.time(), checkpoint.codec)
 
-            if not self.player:
-                return False
+        def done(error: Optional[Exception], size: int):
+            if error is None:
+                checkpoint.base_bytes = size
+            else:
+                checkpoint.failed = True
+                errors.append(error)
+
+        self.store.write_base(slot, snapshot, checkpoint.codec, metadata, done)
+
+    def _save_delta(self, slot: int, checkpoint: SaveCheckpoint, errors: List[Exception]):
+        delta: Dict[str, Any] = {}
+        player = self._player_state()
+        changed = {key: value for key, value in player.items() if checkpoint.player.get(key) != value}
+        if changed:
+            delta["player"] = changed
+            checkpoint.player.update(changed)
+
+        rooms = {}
+        touched = self.rooms.touched()
+        for room_id in checkpoint.dirty_rooms:
+            room_state = self._room_state(touched[room_id])
+            if checkpoint.rooms.get(room_id) != room_state:
+                rooms[room_id] = room_state
+                checkpoint.rooms[room_id] = room_state
+        checkpoint.dirty_rooms.clear()
+        if rooms:
+            delta["rooms"] = rooms
+
+        components = {}
+        for name, state in self._component_states().items():
+            if checkpoint.components.get(name) != state:
+                components[name] = state
+                checkpoint.components[name] = state
+        if components:
+            delta["components"] = components
+
+        if not delta:
+            return
+        delta["generation"] = checkpoint.generation
+        line = json.dumps(delta, ensure_ascii=False, separators=(",", ":")) + "\n"
+        checkpoint.journal_entries += 1
+        checkpoint.journal_bytes += len(line.encode("utf-8"))
+
+        metadata = slot_metadata(slot, checkpoint.player, time.time(), checkpoint.codec)
+
+        def done(error: Optional[Exception], size: int):
+            if error is not None:
+                checkpoint.failed = True
+                errors.append(error)
 
-            self.player.current_room_id = game_state.get("player_room_id", "cabin")
-            self.player.health = game_state.get("player_health", 100)
-            self.player.max_health = game_state.get("player_max_health", 100)
-            self.player.score = game_state.get("player_score", 0)
-            self.player.level = game_state.get("player_level", 1)
-            self.player.experience = game_state.get("player_experience", 0)
-            self.player.strength = game_state.get("player_strength", 10)
-            self.player.defense = game_state.get("player_defense", 5)
-            self.player.intelligence = game_state.get("player_intelligence", 10)
-            self.player.gold = game_state.get("player_gold", 0)
-            self.player.visited_rooms = game_state.get("player_visited_rooms", [])
-            self.player.actions_count = game_state.get("player_actions_count", 0)
-            self.player.history = game_state.get("player_history", self.player.history)
-
-            self.player.inventory = [
-                self.items[name.lower()]
-                for name in game_state.get("player_inventory", [])
-                if name.lower() in self.items
-            ]
-
-            loaded_room_states = game_state.get("room_states", {})
-            for room_id, room in self.rooms.items():
-                room_data = loaded_room_states.get(room_id)
-                if room_data:
-                    room.items = [
-                        self.items[name.lower()]
-                        for name in room_data.get("items_in_room", [])
-                        if name.lower() in self.items
-                    ]
-                    room.properties = room_data.get("properties", room.properties)
-                    room.exits = room_data.get("exits", room.exits)
-                    room.description = room_data.get("description", room.description)
-                    room.visited_art_shown = room_data.get("visited_art_shown", False)
-                    room.ambient_sound = room_data.get("ambient_sound", room.ambient_sound)
+        self.store.append_delta(slot, line, checkpoint.codec, metadata, done)
 
+    def read_save(self, slot: int = 1) -> Optional[Dict[str, Any]]:
+        """A slot's base snapshot with its journal replayed on top, or None if there is no save"""
+        stored = self.store.read(slot)
+        return stored.merged() if stored else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The whole session in save format, as a base snapshot holds it"""
+        return dict(self._player_state(), room_states=self._room_states(), **self._component_states())
+
+    def restore(self, game_state: Dict[str, Any]):
+        """Replace the session with a snapshot in save format (from snapshot() or read_save)"""
+        self.player.current_room_id = game_state.get("player_room_id", "cabin")
+        self.player.health = game_state.get("player_health", 100)
+        self.player.max_health = game_state.get("player_max_health", 100)
+        self.player.score = game_state.get("player_score", 0)
+        self.player.level = game_state.get("player_level", 1)
+        self.player.experience = game_state.get("player_experience", 0)
+        self.player.strength = game_state.get("player_strength", 10)
+        self.player.defense = game_state.get("player_defense", 5)
+        self.player.intelligence = game_state.get("player_intelligence", 10)
+        self.player.gold = game_state.get("player_gold", 0)
+        self.player.visited_rooms = list(game_state.get("player_visited_rooms", []))
+        self.player.actions_count = game_state.get("player_actions_count", 0)
+        self.player.history = list(game_state.get("player_history", self.player.history))
+        self.play_time_offset = game_state.get("player_play_time", 0)
+        self._session_started = time.monotonic()
+
+        self.player.inventory = NamedCollection(
+            self.items[name.lower()]
+            for name in game_state.get("player_inventory", [])
+            if name.lower() in self.items
+        )
+
+        # Rooms missing from the snapshot were untouched when it was taken; the rest
+        # are hydrated on first lookup, starting with the one the player stands in
+        self.rooms.restore(game_state.get("room_states", {}), self._hydrate_room)
+        self.rooms.get(self.player.current_room_id)
+
+        for name, component in self.components.items():
+            component.load_dict(game_state.get(name, {}))
+
+        # No slot's files share a starting point with memory any more
+        self._checkpoints.clear()
+        self.rooms.take_dirty()
+        self.restores += 1
+
+    def load_game(self, slot: int = 1) -> bool:
+        try:
+            stored = self.store.read(slot)
+            if stored is None or not self.player:
+                return False
+            game_state = stored.merged()
+            self.restore(game_state)
+            if "save_generation" in game_state:
+                self._checkpoints[slot] = SaveCheckpoint(
+                    game_state["save_generation"], self._player_state(), self._room_states(),
+                    self._component_states(),
+                    # A slot loaded from another format gets a new base in the current one on its next save
+                    codec=stored.codec,
+                    journal_bytes=stored.journal_bytes,
+                    base_bytes=stored.base_bytes,
+                )
             return True
         except Exception:
             return False
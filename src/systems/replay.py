@@ -0,0 +1,148 @@
+"""Command logs with keyframe snapshots, replayed to restore or reproduce a session"""
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .save_codec import decode_save, get_codec
+from .save_writer import SaveWriter, shared_writer
+
+if TYPE_CHECKING:
+    from ..game_engine import GameEngine
+    from ..ui import BaseUI
+
+LOG_VERSION = 1
+
+# One logged command and the replies its prompts consumed
+LogEntry = Tuple[str, List[str]]
+
+class SessionRecorder:
+    """Logs every command an engine runs, with the replies its prompts consumed.
+
+    `<path>.log` starts with a header holding the session's starting state
+    and random state, followed by one compact JSON line per command.
+    `<path>.keyframe` holds the latest snapshot and how many logged commands
+    it already includes. A keyframe is taken every `keyframe_every` commands,
+    and after any command that replaced the session (such as load), whose
+    outcome the log alone cannot reproduce.
+    """
+
+    def __init__(self, engine: "GameEngine", path: str, keyframe_every: int = 100,
+                 writer: Optional[SaveWriter] = None):
+        self.engine = engine
+        self.log_file = f"{path}.log"
+        self.keyframe_file = f"{path}.keyframe"
+        self.keyframe_every = keyframe_every
+        self.writer = writer if writer is not None else shared_writer()
+        self.session_id: Optional[int] = None
+        self.commands = 0
+        self._restores = engine.game_state.restores
+        self._log = None
+
+    def _keyframe_data(self) -> Dict[str, Any]:
+        engine = self.engine
+        return {
+            "version": LOG_VERSION,
+            "session": self.session_id,
+            "commands": self.commands,
+            "random": engine.random_state(),
+            "running": engine.is_running,
+            "outcome": engine.outcome,
+            "state": engine.game_state.snapshot(),
+        }
+
+    def start(self):
+        """Begin a new log from the engine's current state.
+
+        Start it after anything that runs outside the log, such as the intro,
+        or the replay will begin with a different random state.
+        """
+        self.session_id = time.time_ns()
+        self.commands = 0
+        header = self._keyframe_data()
+        os.makedirs(os.path.dirname(os.path.abspath(self.log_file)), exist_ok=True)
+        self._log = open(self.log_file, 'w', encoding='utf-8')
+        self._log.write(json.dumps(header, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._log.flush()
+        # A keyframe left by an earlier session must not outlive this header
+        self.keyframe()
+        self.writer.flush([self.keyframe_file])
+        self.engine.recorder = self
+
+    def resume(self):
+        """Keep appending to an existing log, after restore_session rebuilt its state"""
+        header, entries, valid_bytes = read_log(self.log_file)
+        self.session_id = header["session"]
+        self.commands = len(entries)
+        self._log = open(self.log_file, 'a', encoding='utf-8')
+        self._log.truncate(valid_bytes)  # drop a torn final line
+        self._restores = self.engine.game_state.restores
+        self.engine.recorder = self
+
+    def record(self, command: str, replies: List[str]):
+        self._log.write(json.dumps([command, replies], ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._log.flush()
+        self.commands += 1
+        restores = self.engine.game_state.restores
+        if restores != self._restores or self.commands % self.keyframe_every == 0:
+            self._restores = restores
+            self.keyframe()
+
+    def keyframe(self):
+        """Snapshot the session now; the write happens on the save writer"""
+        self.writer.submit_snapshot(self.keyframe_file, None, self._keyframe_data(), get_codec("binary"))
+
+    def close(self):
+        if self._log:
+            self._log.close()
+            self._log = None
+        if self.engine.recorder is self:
+            self.engine.recorder = None
+        self.writer.flush([self.keyframe_file])
+
+def read_log(log_file: str) -> Tuple[Dict[str, Any], List[LogEntry], int]:
+    """Header, logged commands, and the byte length of the log up to its last complete line"""
+    entries: List[LogEntry] = []
+    with open(log_file, 'rb') as f:
+        first = f.readline()
+        header = json.loads(first)
+        if header.get("version", 0) > LOG_VERSION:
+            raise ValueError(f"command log version {header['version']} is newer than this game")
+        valid_bytes = len(first)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # torn final line from an interrupted write
+            command, replies = json.loads(line)
+            entries.append((command, replies))
+            valid_bytes += len(line)
+    return header, entries, valid_bytes
+
+def restore_session(engine: "GameEngine", path: str, use_keyframe: bool = True,
+                    ui: Optional["BaseUI"] = None) -> int:
+    """Rebuild a recorded session in `engine`, a fresh engine on the same world.
+
+    Starts from the latest keyframe (or the log header with
+    use_keyframe=False, to reproduce the whole session) and fast-forwards
+    through the commands logged after it, rendering them to `ui` if given.
+    Returns how many were replayed.
+    """
+    header, entries, _ = read_log(f"{path}.log")
+    start = header
+    keyframe_file = f"{path}.keyframe"
+    if use_keyframe and os.path.exists(keyframe_file):
+        with open(keyframe_file, 'rb') as f:
+            keyframe = decode_save(f.read())
+        if keyframe.get("session") == header["session"] and keyframe["commands"] <= len(entries):
+            start = keyframe
+
+    engine.game_state.restore(start["state"])
+    engine.set_random_state(start["random"])
+    engine.is_running = start["running"]
+    engine.outcome = start["outcome"]
+    pending = entries[start["commands"]:]
+    with engine.fast_forward(ui):
+        for command, replies in pending:
+            engine.ui.print_message(f"> {command}", "dim")
+            engine.step(command, replies)
+            engine.ui.replies.clear()
+    return len(pending)
@@ -0,0 +1,36 @@
+"""Per-session random streams"""
+import base64
+import random
+import struct
+from typing import Any, Dict, Optional
+
+# Mersenne Twister state: 624 words plus the position within them
+_MT_STATE = struct.Struct("<625I")
+
+class SessionRandom(random.Random):
+    """A seeded random stream owned by one engine.
+
+    Sessions never draw from the process-global `random` module, so any
+    number of them can run side by side in threads or processes and the
+    same seed always plays out the same way. The stream is a save
+    component, so a loaded game continues the exact sequence it was saved with.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(seed)
+        self.seed_value = seed
+
+    def to_dict(self) -> Dict[str, Any]:
+        version, internal, gauss_next = self.getstate()
+        return {
+            "version": version,
+            "state": base64.b64encode(_MT_STATE.pack(*internal)).decode("ascii"),
+            "gauss_next": gauss_next,
+        }
+
+    def load_dict(self, data: Dict[str, Any]):
+        # Saves from before the stream was saved keep the current one
+        if "state" not in data:
+            return
+        internal = _MT_STATE.unpack(base64.b64decode(data["state"]))
+        self.setstate((data["version"], internal, data.get("gauss_next")))
@@ -0,0 +1,123 @@
+"""Save snapshot encodings: readable JSON and a compact versioned binary format"""
+import io
+import json
+import os
+import pickle
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from .save_writer import atomic_write
+
+class SaveCodec(ABC):
+    """Turns a save snapshot (plain dicts, lists, strings and numbers) into file bytes and back"""
+    name = ""
+    extension = ""
+
+    @abstractmethod
+    def encode(self, state: Dict[str, Any]) -> bytes:
+        ...
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def matches(self, data: bytes) -> bool:
+        """Whether `data` looks like this format, for detecting a file's codec"""
+
+class JsonCodec(SaveCodec):
+    """The original human-readable format"""
+    name = "json"
+    extension = ".json"
+
+    def encode(self, state: Dict[str, Any]) -> bytes:
+        return json.dumps(state, indent=4, ensure_ascii=False).encode('utf-8')
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return json.loads(data.decode('utf-8'))
+
+    def matches(self, data: bytes) -> bool:
+        return data.lstrip()[:1] == b"{"
+
+class _PlainUnpickler(pickle.Unpickler):
+    """Refuses every class lookup, so a save file can only produce plain data"""
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"save files may not reference {module}.{name}")
+
+class BinaryCodec(SaveCodec):
+    """Fixed header (magic, format version, flags) followed by a zlib-compressed pickle.
+
+    Version 1 uses pickle protocol 5 with compression level 1, which
+    trades a little size for save time on large worlds.
+    """
+    name = "binary"
+    extension = ".sav"
+    MAGIC = b"LTHS"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHH")
+    FLAG_ZLIB = 1
+
+    def __init__(self, level: int = 1):
+        self.level = level
+
+    def encode(self, state: Dict[str, Any]) -> bytes:
+        payload = pickle.dumps(state, protocol=5)
+        flags = 0
+        if self.level:
+            payload = zlib.compress(payload, self.level)
+            flags |= self.FLAG_ZLIB
+        return self.HEADER.pack(self.MAGIC, self.VERSION, flags) + payload
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        magic, version, flags = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC:
+            raise ValueError("not a binary save file")
+        if version > self.VERSION:
+            raise ValueError(f"binary save version {version} is newer than this game ({self.VERSION})")
+        payload = memoryview(data)[self.HEADER.size:]
+        if flags & self.FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return _PlainUnpickler(io.BytesIO(payload)).load()
+
+    def matches(self, data: bytes) -> bool:
+        return data[:len(self.MAGIC)] == self.MAGIC
+
+CODECS: Dict[str, SaveCodec] = {codec.name: codec for codec in (JsonCodec(), BinaryCodec())}
+
+def get_codec(name: str) -> SaveCodec:
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"unknown save format: {name}") from None
+
+def detect_codec(data: bytes) -> Optional[SaveCodec]:
+    """The codec that wrote these bytes, judged by content rather than file name"""
+    for codec in CODECS.values():
+        if codec.matches(data):
+            return codec
+    return None
+
+def decode_save(data: bytes) -> Dict[str, Any]:
+    codec = detect_codec(data)
+    if codec is None:
+        raise ValueError("unrecognised save file format")
+    return codec.decode(data)
+
+def read_save_file(path: str) -> Dict[str, Any]:
+    with open(path, 'rb') as f:
+        return decode_save(f.read())
+
+def convert_save_file(path: str, target: str) -> str:
+    """Re-encode a save snapshot in the target format next to the original, which is removed.
+
+    Returns the new path. The snapshot keeps its save_generation, so the
+    slot's journal still applies.
+    """
+    codec = get_codec(target)
+    state = read_save_file(path)
+    new_path = os.path.splitext(path)[0] + codec.extension
+    atomic_write(new_path, codec.encode(state))
+    if os.path.abspath(new_path) != os.path.abspath(path):
+        os.remove(path)
+    return new_path
@@ -0,0 +1,62 @@
+"""Sidecar index of save slot metadata, so save/load menus never decode whole saves"""
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from .save_writer import atomic_write
+
+INDEX_FILE = "save_index.json"
+
+# Index updates arrive from the writer thread and from inline (synchronous) writers
+_lock = threading.Lock()
+
+def index_path(save_dir: str) -> str:
+    return os.path.join(save_dir, INDEX_FILE)
+
+def read_index(save_dir: str) -> Dict[int, Dict[str, Any]]:
+    """Slot number -> metadata; empty if the index is missing or unreadable"""
+    try:
+        with open(index_path(save_dir), 'r', encoding='utf-8') as f:
+            return {int(slot): entry for slot, entry in json.load(f).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def write_index(save_dir: str, entries: Dict[int, Dict[str, Any]]):
+    data = json.dumps({str(slot): entries[slot] for slot in sorted(entries)}, ensure_ascii=False)
+    atomic_write(index_path(save_dir), data.encode('utf-8'))
+
+def update_entry(save_dir: str, slot: int, entry: Dict[str, Any]):
+    with _lock:
+        entries = read_index(save_dir)
+        entries[slot] = entry
+        write_index(save_dir, entries)
+
+def repair_index(save_dir: str, seen: Dict[int, Dict[str, Any]],
+                 repairs: Dict[int, Optional[Dict[str, Any]]]):
+    """Apply repaired entries (None drops the slot) to the index read as `seen`.
+
+    Runs under the same lock as update_entry; a slot whose entry changed
+    since `seen` was read was just saved, and keeps its newer entry.
+    """
+    with _lock:
+        entries = read_index(save_dir)
+        for slot, entry in repairs.items():
+            if entries.get(slot) != seen.get(slot):
+                continue
+            if entry is None:
+                entries.pop(slot, None)
+            else:
+                entries[slot] = entry
+        write_index(save_dir, entries)
+        return entries
+
+def slot_size(save_file: str, journal_file: str) -> int:
+    """Bytes on disk for a slot: base snapshot plus journal"""
+    size = 0
+    for path in (save_file, journal_file):
+        try:
+            size += os.path.getsize(path)
+        except OSError:
+            pass
+    return size
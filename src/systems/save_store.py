@@ -0,0 +1,410 @@
+"""Where saves live: per-slot files (the default) or a shared SQLite database"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import traceback
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .save_codec import CODECS, decode_save, get_codec, read_save_file
+from .save_index import read_index, repair_index, slot_size, update_entry
+from .save_writer import SaveWriter, shared_writer
+
+# Called once a write is durable, with the error that stopped it (or None) and the bytes it wrote
+WrittenCallback = Callable[[Optional[Exception], int], None]
+
+SAVE_FILE_PATTERN = re.compile(r"save_slot_(\d+)\.(?:%s)$" % "|".join(
+    re.escape(codec.extension[1:]) for codec in CODECS.values()))
+
+def slot_metadata(slot: int, state: Dict[str, Any], timestamp: float, codec: str) -> Dict[str, Any]:
+    """Listing entry for a slot, from a save's player fields"""
+    return {
+        "slot": slot,
+        "location": state.get("player_room_id", "Unknown"),
+        "level": state.get("player_level", 1),
+        "play_time": state.get("player_play_time", 0),
+        "timestamp": timestamp,
+        "format": codec,
+    }
+
+@dataclass
+class StoredSave:
+    """A slot as stored: base snapshot, the journal lines written since, and their sizes"""
+    base: Dict[str, Any]
+    journal: List[str]
+    codec: str
+    base_bytes: int
+    journal_bytes: int = 0
+
+    def merged(self) -> Dict[str, Any]:
+        """The base with journal lines of its generation replayed on top"""
+        state = self.base
+        generation = state.get("save_generation")
+        for line in self.journal:
+            try:
+                delta = json.loads(line)
+            except ValueError:
+                break  # torn final line from an interrupted write
+            if delta.get("generation") != generation:
+                continue
+            state.update(delta.get("player", {}))
+            state.setdefault("room_states", {}).update(delta.get("rooms", {}))
+            state.update(delta.get("components", {}))
+        return state
+
+class SaveStore(ABC):
+    """Storage backend of one player's save slots.
+
+    Writes may complete in the background; `flush` waits for them, and
+    reads see every write submitted before them.
+    """
+
+    @abstractmethod
+    def write_base(self, slot: int, snapshot: Dict[str, Any], codec: str,
+                   metadata: Dict[str, Any], on_done: WrittenCallback):
+        """Replace the slot with a new base snapshot and an empty journal"""
+
+    @abstractmethod
+    def append_delta(self, slot: int, line: str, codec: str,
+                     metadata: Dict[str, Any], on_done: WrittenCallback):
+        """Add a journal line to the slot whose base was written with `codec`"""
+
+    @abstractmethod
+    def read(self, slot: int) -> Optional[StoredSave]:
+        ...
+
+    @abstractmethod
+    def list_slots(self) -> Dict[int, Dict[str, Any]]:
+        """Slot number -> metadata (see slot_metadata) plus size in bytes"""
+
+    @abstractmethod
+    def flush(self, slots: Optional[Iterable[int]] = None, timeout: Optional[float] = None) -> bool:
+        """Wait until queued writes (of the given slots, default all) are durable; False on timeout"""
+
+class FileSaveStore(SaveStore):
+    """save_slot_N.<ext> snapshots plus save_slot_N.journal, indexed by save_index.json"""
+
+    def __init__(self, save_dir: str, writer: Optional[SaveWriter] = None):
+        self.save_dir = save_dir
+        # Writes run on the writer, on its background thread by default
+        self.writer = writer if writer is not None else shared_writer()
+        self._written_files: Set[str] = set()
+        os.makedirs(self.save_dir, exist_ok=True)
+
+    def get_save_file(self, slot: int = 1, codec: str = "json") -> str:
+        return os.path.join(self.save_dir, f"save_slot_{slot}{CODECS[codec].extension}")
+
+    def get_journal_file(self, slot: int = 1) -> str:
+        return os.path.join(self.save_dir, f"save_slot_{slot}.journal")
+
+    def _slot_files(self, slot: int) -> List[str]:
+        return [self.get_save_file(slot, name) for name in CODECS]
+
+    def find_save_file(self, slot: int = 1) -> Optional[str]:
+        for save_file in self._slot_files(slot):
+            if os.path.exists(save_file):
+                return save_file
+        return None
+
+    @staticmethod
+    def codec_of(save_file: str) -> str:
+        return next(name for name, codec in CODECS.items() if save_file.endswith(codec.extension))
+
+    def write_base(self, slot: int, snapshot: Dict[str, Any], codec: str,
+                   metadata: Dict[str, Any], on_done: WrittenCallback):
+        save_file = self.get_save_file(slot, codec)
+        journal_file = self.get_journal_file(slot)
+
+        def done(error: Optional[Exception]):
+            if error is not None:
+                on_done(error, 0)
+                return
+            self._update_index(slot, metadata, save_file, journal_file)
+            on_done(None, os.path.getsize(save_file))
+
+        self._written_files.add(save_file)
+        self.writer.submit_snapshot(save_file, journal_file, snapshot, get_codec(codec), done,
+                                    stale_files=[path for path in self._slot_files(slot) if path != save_file])
+
+    def append_delta(self, slot: int, line: str, codec: str,
+                     metadata: Dict[str, Any], on_done: WrittenCallback):
+        save_file = self.get_save_file(slot, codec)
+        journal_file = self.get_journal_file(slot)
+
+        def done(error: Optional[Exception]):
+            if error is None:
+                self._update_index(slot, metadata, save_file, journal_file)
+            on_done(error, len(line.encode("utf-8")))
+
+        self._written_files.add(save_file)
+        self.writer.submit_delta(save_file, journal_file, line, done)
+
+    def _update_index(self, slot: int, metadata: Dict[str, Any], save_file: str, journal_file: str):
+        try:
+            update_entry(self.save_dir, slot, dict(metadata, size=slot_size(save_file, journal_file)))
+        except OSError:
+            pass  # the save itself is on disk; list_slots repairs the entry from it
+
+    def read(self, slot: int) -> Optional[StoredSave]:
+        self.flush([slot])
+        save_file = self.find_save_file(slot)
+        if save_file is None:
+            return None
+        stored = StoredSave(read_save_file(save_file), [], self.codec_of(save_file),
+                            os.path.getsize(save_file))
+        journal_file = self.get_journal_file(slot)
+        if os.path.exists(journal_file):
+            with open(journal_file, 'r', encoding='utf-8') as f:
+                stored.journal = f.readlines()
+            stored.journal_bytes = os.path.getsize(journal_file)
+        return stored
+
+    def list_slots(self) -> Dict[int, Dict[str, Any]]:
+        """Entries come from the sidecar index; a slot is decoded only when its files
+        do not match its entry (saves older than the index, or a crash between writes)"""
+        self.flush()
+        entries = read_index(self.save_dir)
+        on_disk = {}
+        for name in os.listdir(self.save_dir):
+            match = SAVE_FILE_PATTERN.match(name)
+            if match:
+                on_disk.setdefault(int(match.group(1)), os.path.join(self.save_dir, name))
+
+        repairs: Dict[int, Optional[Dict[str, Any]]] = {slot: None for slot in set(entries) - set(on_disk)}
+        for slot, save_file in on_disk.items():
+            size = slot_size(save_file, self.get_journal_file(slot))
+            entry = entries.get(slot)
+            if entry is None or entry.get("size") != size:
+                try:
+                    state = self.read(slot).merged()
+                    repairs[slot] = dict(slot_metadata(slot, state, os.path.getmtime(save_file),
+                                                       self.codec_of(save_file)), size=size)
+                except Exception:
+                    continue
+        if repairs:
+            # Under the index lock, so a save finishing meanwhile is neither lost nor clobbered
+            entries = repair_index(self.save_dir, entries, repairs)
+        return entries
+
+    def flush(self, slots: Optional[Iterable[int]] = None, timeout: Optional[float] = None) -> bool:
+        if slots is None:
+            return self.writer.flush(self._written_files, timeout)
+        return self.writer.flush([path for slot in slots for path in self._slot_files(slot)], timeout)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    player TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    generation INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    location TEXT,
+    level INTEGER,
+    play_time REAL,
+    saved_at REAL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (player, slot)
+);
+CREATE INDEX IF NOT EXISTS saves_by_time ON saves (player, saved_at);
+CREATE INDEX IF NOT EXISTS saves_by_level ON saves (level);
+CREATE TABLE IF NOT EXISTS save_deltas (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    player TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS save_deltas_by_slot ON save_deltas (player, slot, seq);
+"""
+
+# One queued write: runs inside the shared transaction and returns the bytes it wrote
+Operation = Callable[[sqlite3.Connection], int]
+
+class SaveDatabase:
+    """A SQLite database in WAL mode holding the saves of many players.
+
+    Writes from every session are queued and committed by one writer
+    thread, which wraps everything queued since its last commit in a
+    single transaction (each write in its own savepoint, so one failure
+    does not undo the others). Readers use per-thread connections and
+    are not blocked by the writer.
+    """
+
+    def __init__(self, path: str, background: bool = True):
+        self.path = path
+        self.background = background
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[Operation, WrittenCallback]] = []
+        self._submitted = 0
+        self._committed = 0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._write_lock = threading.Lock()  # inline mode commits on the submitting threads
+        self._local = threading.local()
+        self._write_conn = self._connect()
+        self._write_conn.executescript(SCHEMA)
+        self.batches = 0  # transactions committed, for tests and benchmarks
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """This thread's read connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def submit(self, operation: Operation, on_done: WrittenCallback) -> int:
+        """Queue a write; returns a ticket that flush() can wait for.
+
+        After close() the write fails at once through on_done, like any failed write.
+        """
+        with self._cond:
+            closed = self._closed
+            if not closed:
+                self._pending.append((operation, on_done))
+                self._submitted += 1
+                if self.background and self._thread is None:
+                    self._thread = threading.Thread(target=self._worker, name="save-database", daemon=True)
+                    self._thread.start()
+                self._cond.notify_all()
+            ticket = self._submitted
+        if closed:
+            on_done(RuntimeError("save database is closed"), 0)
+        elif not self.background:
+            self._commit_pending()
+        return ticket
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return  # closed, and everything queued is committed
+            self._commit_pending()
+
+    def _commit_pending(self):
+        with self._write_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+                last = self._submitted
+            if batch:
+                self._commit(batch, last)
+
+    def _commit(self, batch: List[Tuple[Operation, WrittenCallback]], last: int):
+        results: List[Tuple[Optional[Exception], int]] = []
+        conn = self._write_conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for operation, _ in batch:
+                conn.execute("SAVEPOINT write")
+                try:
+                    results.append((None, operation(conn)))
+                    conn.execute("RELEASE write")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write")
+                    conn.execute("RELEASE write")
+                    results.append((e, 0))
+            conn.execute("COMMIT")
+            self.batches += 1
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            results = [(e, 0)] * len(batch)
+        with self._cond:
+            self._committed = max(self._committed, last)
+            self._cond.notify_all()
+        for (_, on_done), (error, size) in zip(batch, results):
+            try:
+                on_done(error, size)
+            except Exception:
+                traceback.print_exc()  # a failing callback must not stop the writer thread
+
+    def flush(self, ticket: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """Wait until the write with this ticket (default: everything queued so far) is committed"""
+        with self._cond:
+            target = self._submitted if ticket is None else ticket
+            return self._cond.wait_for(lambda: self._committed >= target, timeout)
+
+    def close(self):
+        """Commit what is queued, stop the writer thread, then close the connection"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._commit_pending()  # inline mode has no thread to drain the queue
+        self._write_conn.close()
+
+class SqliteSaveStore(SaveStore):
+    """One player's slots inside a shared SaveDatabase"""
+
+    def __init__(self, database: SaveDatabase, player: str):
+        self.database = database
+        self.player = player
+        self._last_ticket = 0
+
+    def write_base(self, slot: int, snapshot: Dict[str, Any], codec: str,
+                   metadata: Dict[str, Any], on_done: WrittenCallback):
+        player = self.player
+
+        def operation(conn: sqlite3.Connection) -> int:
+            data = get_codec(codec).encode(snapshot)
+            conn.execute(
+                "INSERT OR REPLACE INTO saves (player, slot, generation, codec, data, location, level,"
+                " play_time, saved_at, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (player, slot, snapshot["save_generation"], codec, data, metadata["location"],
+                 metadata["level"], metadata["play_time"], metadata["timestamp"], len(data)))
+            conn.execute("DELETE FROM save_deltas WHERE player = ? AND slot = ?", (player, slot))
+            return len(data)
+
+        self._last_ticket = self.database.submit(operation, on_done)
+
+    def append_delta(self, slot: int, line: str, codec: str,
+                     metadata: Dict[str, Any], on_done: WrittenCallback):
+        player = self.player
+        size = len(line.encode("utf-8"))
+
+        def operation(conn: sqlite3.Connection) -> int:
+            conn.execute("INSERT INTO save_deltas (player, slot, line) VALUES (?, ?, ?)", (player, slot, line))
+            conn.execute(
+                "UPDATE saves SET location = ?, level = ?, play_time = ?, saved_at = ?, size = size + ?"
+                " WHERE player = ? AND slot = ?",
+                (metadata["location"], metadata["level"], metadata["play_time"], metadata["timestamp"],
+                 size, player, slot))
+            return size
+
+        self._last_ticket = self.database.submit(operation, on_done)
+
+    def read(self, slot: int) -> Optional[StoredSave]:
+        self.flush()
+        conn = self.database.reader()
+        row = conn.execute("SELECT codec, data FROM saves WHERE player = ? AND slot = ?",
+                           (self.player, slot)).fetchone()
+        if row is None:
+            return None
+        codec, data = row
+        journal = [line for (line,) in conn.execute(
+            "SELECT line FROM save_deltas WHERE player = ? AND slot = ? ORDER BY seq", (self.player, slot))]
+        return StoredSave(decode_save(data), journal, codec, len(data),
+                          sum(len(line.encode("utf-8")) for line in journal))
+
+    def list_slots(self) -> Dict[int, Dict[str, Any]]:
+        self.flush()
+        rows = self.database.reader().execute(
+            "SELECT slot, location, level, play_time, saved_at, codec, size FROM saves WHERE player = ?",
+            (self.player,))
+        return {slot: {"slot": slot, "location": location, "level": level, "play_time": play_time,
+                       "timestamp": saved_at, "format": codec, "size": size}
+                for slot, location, level, play_time, saved_at, codec, size in rows}
+
+    def flush(self, slots: Optional[Iterable[int]] = None, timeout: Optional[float] = None) -> bool:
+        return self.database.flush(self._last_ticket, timeout)
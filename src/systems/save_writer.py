@@ -0,0 +1,147 @@
+"""Save file writes, performed inline or on a shared background thread"""
+import atexit
+import os
+import threading
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    from .save_codec import SaveCodec
+
+# Called with None once the work is on disk, or with the exception that stopped it
+DoneCallback = Callable[[Optional[Exception]], None]
+
+def atomic_write(path: str, data: bytes):
+    """Write to a temp file and rename it over `path`, so a crash never leaves a partial save"""
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, path)
+
+@dataclass
+class SlotWork:
+    """Everything queued for one save slot: an optional new base snapshot, then journal lines"""
+    save_file: str
+    journal_file: Optional[str]  # None for files that never have a journal
+    snapshot: Optional[Dict[str, Any]] = None
+    codec: Optional["SaveCodec"] = None
+    stale_files: List[str] = field(default_factory=list)  # other formats' snapshots of the slot
+    journal: List[str] = field(default_factory=list)
+    callbacks: List[DoneCallback] = field(default_factory=list)
+
+class SaveWriter:
+    """Performs save writes, inline or on one background thread shared by every GameState.
+
+    In background mode work is queued per slot. A new snapshot replaces
+    whatever is still queued for that slot, and journal lines queued back
+    to back go out in a single append.
+    """
+
+    def __init__(self, background: bool = True):
+        self.background = background
+        self._cond = threading.Condition()
+        self._pending: "OrderedDict[str, SlotWork]" = OrderedDict()
+        self._busy: Set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit_snapshot(self, save_file: str, journal_file: Optional[str], snapshot: Dict[str, Any],
+                        codec: "SaveCodec", on_done: Optional[DoneCallback] = None,
+                        stale_files: Iterable[str] = ()):
+        with self._cond:
+            work = self._queue(save_file, journal_file, on_done)
+            work.snapshot = snapshot
+            work.codec = codec
+            work.stale_files = list(stale_files)
+            work.journal.clear()
+        self._kick(save_file)
+
+    def submit_delta(self, save_file: str, journal_file: str, line: str,
+                     on_done: Optional[DoneCallback] = None):
+        with self._cond:
+            self._queue(save_file, journal_file, on_done).journal.append(line)
+        self._kick(save_file)
+
+    def _queue(self, save_file: str, journal_file: Optional[str], on_done: Optional[DoneCallback]) -> SlotWork:
+        work = self._pending.get(save_file)
+        if work is None:
+            work = self._pending[save_file] = SlotWork(save_file, journal_file)
+        if on_done:
+            work.callbacks.append(on_done)
+        return work
+
+    def _kick(self, save_file: str):
+        if not self.background:
+            with self._cond:
+                work = self._pending.pop(save_file)
+            self._run(work)
+            return
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="save-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            self._cond.notify_all()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                save_file, work = self._pending.popitem(last=False)
+                self._busy.add(save_file)
+            try:
+                self._run(work)
+            finally:
+                with self._cond:
+                    self._busy.discard(save_file)
+                    self._cond.notify_all()
+
+    def _run(self, work: SlotWork):
+        error = None
+        try:
+            self.write(work)
+        except Exception as e:
+            error = e
+        for callback in work.callbacks:
+            try:
+                callback(error)
+            except Exception:
+                traceback.print_exc()  # a failing callback must not stop the writer thread
+
+    def write(self, work: SlotWork):
+        if work.snapshot is not None:
+            atomic_write(work.save_file, work.codec.encode(work.snapshot))
+            # Journal lines of the previous generation are ignored even if this fails
+            for path in [work.journal_file] + work.stale_files:
+                if path and os.path.exists(path):
+                    os.remove(path)
+        if work.journal:
+            with open(work.journal_file, 'a', encoding='utf-8') as f:
+                f.write("".join(work.journal))
+
+    def flush(self, save_files: Optional[Iterable[str]] = None, timeout: Optional[float] = None) -> bool:
+        """Wait until the given slots (default: all) are on disk; False on timeout"""
+        keys = None if save_files is None else set(save_files)
+
+        def idle() -> bool:
+            if keys is None:
+                return not self._pending and not self._busy
+            return not (keys & self._busy) and not any(key in self._pending for key in keys)
+
+        with self._cond:
+            return self._cond.wait_for(idle, timeout)
+
+_shared_writer: Optional[SaveWriter] = None
+_shared_lock = threading.Lock()
+
+def shared_writer() -> SaveWriter:
+    """The process-wide background writer; its thread starts on first use"""
+    global _shared_writer
+    with _shared_lock:
+        if _shared_writer is None:
+            _shared_writer = SaveWriter()
+        return _shared_writer
@@ -1,4 +1,35 @@
-"""UI package"""
-from .terminal_ui import ui
+"""UI package
 
-__all__ = ['ui']
+Backends share the BaseUI interface: GameUI (rich), PlainUI, NullUI and
+RecordingUI. The rich backend is imported lazily so headless runs never
+load rich or build its layouts.
+"""
+from .base_ui import BaseUI, NullUI
+from .plain_ui import PlainUI
+from .recording_ui import RecordingUI, UIEvent
+
+UI_BACKENDS = ('rich', 'plain', 'null', 'recording')
+
+def get_default_ui() -> BaseUI:
+    """The shared rich terminal UI"""
+    from .terminal_ui import ui as terminal_ui
+    return terminal_ui
+
+def create_ui(backend: str = 'rich') -> BaseUI:
+    if backend == 'rich':
+        return get_default_ui()
+    if backend == 'plain':
+        return PlainUI()
+    if backend == 'null':
+        return NullUI()
+    if backend == 'recording':
+        return RecordingUI()
+    raise ValueError(f"Unknown UI backend '{backend}', expected one of {UI_BACKENDS}")
+
+def __getattr__(name):
+    if name == 'ui':
+        return get_default_ui()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ['ui', 'BaseUI', 'NullUI', 'PlainUI', 'RecordingUI', 'UIEvent',
+           'UI_BACKENDS', 'get_default_ui', 'create_ui']
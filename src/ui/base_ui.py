@@ -0,0 +1,140 @@
+"""Renderer interface shared by every UI backend"""
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Iterable, Iterator, List, Optional
+
+class BaseUI:
+    """Every method is a no-op here; backends override what they render.
+
+    Prompts are answered from a queue of scripted replies, falling back to
+    reply_source and finally default_reply, so any backend can run unattended.
+    """
+
+    def __init__(self, replies: Iterable[str] = ()):
+        self.replies: Deque[str] = deque(replies)
+        self.reply_source: Optional[Callable[[], Optional[str]]] = None
+        self.consumed_replies: List[str] = []
+        self.default_reply = "cancel"
+
+    def queue_replies(self, replies: Iterable[str]):
+        self.replies.extend(replies)
+
+    def next_reply(self) -> str:
+        """Next scripted answer to a prompt"""
+        if self.replies:
+            reply = self.replies.popleft()
+        elif self.reply_source is not None:
+            reply = self.reply_source()
+        else:
+            reply = None
+        if reply is None:
+            reply = self.default_reply
+        reply = reply.strip().lower()
+        self.consumed_replies.append(reply)
+        return reply
+
+    def get_input(self, prompt: str = "> ") -> str:
+        return self.next_reply()
+
+    def drain(self) -> list:
+        """Events captured since the last drain; only recording backends keep any"""
+        return []
+
+    def clear(self):
+        pass
+
+    def close(self):
+        """Give back terminal state the backend took over, such as a pinned status bar"""
+        pass
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Hold back output produced inside and emit it as one write at the end.
+
+        Prompts and flush() still send what is pending at once; backends
+        without a terminal to spare simply write as they go.
+        """
+        yield
+
+    def flush(self):
+        """Send any held-back output now, e.g. before a dramatic pause"""
+        pass
+
+    def print_status_bar(self, health: int, max_health: int, level: int,
+                         exp: int, location: str, gold: int = 0):
+        pass
+
+    def print_mini_map(self, current_room: str, map_rows: List[str]):
+        """Show the explored map around the player, drawn as rich-markup rows"""
+        pass
+
+    def print_header(self, title: str):
+        pass
+
+    def print_message(self, message: str, style: str = "white", slow: bool = False):
+        pass
+
+    def print_room(self, room_name: str, description: str, items: List[str],
+                   npcs: List[str], exits: List[str]):
+        pass
+
+    def print_inventory(self, items: List[tuple], health: int, max_health: int,
+                        level: int, exp: int):
+        pass
+
+    def print_combat(self, player_hp: int, player_max_hp: int,
+                     enemy_name: str, enemy_hp: int, enemy_max_hp: int):
+        pass
+
+    def print_ascii_art(self, art: str):
+        pass
+
+    def print_dialogue(self, npc_name: str, text: str):
+        pass
+
+    def print_help(self, commands: dict):
+        pass
+
+    def print_achievements(self, achievements: List[tuple]):
+        pass
+
+    def print_hint(self, hint: str):
+        pass
+
+    def print_crafting_menu(self, recipes: List[tuple]):
+        pass
+
+    def print_shop(self, items: List[tuple], gold: int):
+        pass
+
+    def print_error(self, message: str):
+        pass
+
+    def print_success(self, message: str):
+        pass
+
+    def print_warning(self, message: str):
+        pass
+
+    def print_journal(self, entries: List[str]):
+        pass
+
+    def print_stats_panel(self, health: int, max_health: int, level: int,
+                          exp: int, strength: int, intelligence: int,
+                          defense: int, gold: int, score: int):
+        pass
+
+    def print_quests_panel(self, quests: List[tuple]):
+        pass
+
+    def print_level_up(self, new_level: int):
+        pass
+
+    def print_combat_log(self, messages: List[str]):
+        pass
+
+    def print_monster_defeated(self, monster_name: str, exp_gained: int, gold_gained: int):
+        pass
+
+class NullUI(BaseUI):
+    """Discards all output; the cheapest backend for simulations"""
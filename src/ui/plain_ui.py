@@ -0,0 +1,134 @@
+"""Plain-text UI: the same output as GameUI without rich layouts, panels or colors"""
+import re
+import sys
+from typing import List, Optional, TextIO
+from .base_ui import BaseUI
+
+# Matches rich markup tags such as [bold red] and [/]; bracketed game terms like [火把] are kept
+MARKUP_TAG = re.compile(r"\[/?[a-z#@][^\[\]]*\]|\[/\]")
+
+def strip_markup(text: str) -> str:
+    return MARKUP_TAG.sub("", text)
+
+class PlainUI(BaseUI):
+    def __init__(self, stream: Optional[TextIO] = None, interactive: bool = True):
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.interactive = interactive
+        self._status_drawn: Optional[tuple] = None
+
+    def _write(self, text: str):
+        self.stream.write(strip_markup(text) + "\n")
+
+    def get_input(self, prompt: str = "> ") -> str:
+        if self.replies or self.reply_source is not None or not self.interactive:
+            return self.next_reply()
+        self.stream.write(strip_markup(prompt))
+        self.stream.flush()
+        reply = input().strip().lower()
+        self.consumed_replies.append(reply)
+        return reply
+
+    def print_status_bar(self, health: int, max_health: int, level: int,
+                         exp: int, location: str, gold: int = 0):
+        # Only repeated after a change, which keeps remote sessions terse
+        status = (health, max_health, level, exp, location, gold)
+        if status == self._status_drawn:
+            return
+        self._status_drawn = status
+        self._write(f"❤ {health}/{max_health} | ⭐ Lv.{level} | 📍 {location} | 💰 {gold} | ✨ {exp} XP")
+
+    def print_mini_map(self, current_room: str, map_rows: List[str]):
+        self._write(f"地图 - 当前: {current_room}")
+        for row in map_rows:
+            self._write(row)
+
+    def print_header(self, title: str):
+        self._write(f"=== {title} ===")
+
+    def print_message(self, message: str, style: str = "white", slow: bool = False):
+        self._write(message)
+
+    def print_room(self, room_name: str, description: str, items: List[str],
+                   npcs: List[str], exits: List[str]):
+        lines = [f"== {room_name} ==", description]
+        if items:
+            lines.append(f"物品: {', '.join(items)}")
+        if npcs:
+            lines.append(f"人物: {', '.join(npcs)}")
+        lines.append(f"出口: {', '.join(exits) if exits else '无'}")
+        self._write("\n".join(lines))
+
+    def print_inventory(self, items: List[tuple], health: int, max_health: int,
+                        level: int, exp: int):
+        lines = [f"生命: {health}/{max_health} | 等级: {level} | 经验: {exp}", "物品栏:"]
+        lines.extend(f"  {name} ({item_type}) - {desc}" for name, desc, item_type in items)
+        self._write("\n".join(lines))
+
+    def print_combat(self, player_hp: int, player_max_hp: int,
+                     enemy_name: str, enemy_hp: int, enemy_max_hp: int):
+        self._write(f"你 {player_hp}/{player_max_hp}  vs  {enemy_name} {enemy_hp}/{enemy_max_hp}")
+
+    def print_ascii_art(self, art: str):
+        self._write(art)
+
+    def print_dialogue(self, npc_name: str, text: str):
+        self._write(f"{npc_name}: {text}")
+
+    def print_help(self, commands: dict):
+        width = max((len(cmd) for cmd in commands), default=0)
+        self._write("\n".join(f"{cmd.ljust(width)}  {desc}" for cmd, desc in commands.items()))
+
+    def print_achievements(self, achievements: List[tuple]):
+        self._write("\n".join(
+            f"{'✓' if unlocked else '○'} {name} - {desc}" for name, desc, unlocked in achievements
+        ))
+
+    def print_hint(self, hint: str):
+        self._write(f"💡 {hint}")
+
+    def print_crafting_menu(self, recipes: List[tuple]):
+        self._write("\n".join(
+            f"[{idx}] {name}: {materials} -> {result}"
+            for idx, (name, materials, result) in enumerate(recipes, 1)
+        ))
+
+    def print_shop(self, items: List[tuple], gold: int):
+        lines = [f"商店 (你的金币: {gold})"]
+        lines.extend(f"[{idx}] {name} - {price} 金币" for idx, (name, price) in enumerate(items, 1))
+        self._write("\n".join(lines))
+
+    def print_error(self, message: str):
+        self._write(f"✗ {message}")
+
+    def print_success(self, message: str):
+        self._write(f"✓ {message}")
+
+    def print_warning(self, message: str):
+        self._write(f"⚠ {message}")
+
+    def print_journal(self, entries: List[str]):
+        self._write("\n".join(f"{idx}. {entry}" for idx, entry in enumerate(entries, 1)))
+
+    def print_stats_panel(self, health: int, max_health: int, level: int,
+                          exp: int, strength: int, intelligence: int,
+                          defense: int, gold: int, score: int):
+        self._write(
+            f"生命值: {health}/{max_health} | 经验值: {exp}/{level * 100} | 等级: {level}\n"
+            f"力量: {strength} | 智力: {intelligence} | 防御: {defense} | 金币: {gold} | 分数: {score}"
+        )
+
+    def print_quests_panel(self, quests: List[tuple]):
+        if not quests:
+            self._write("没有进行中的任务")
+            return
+        self._write("\n".join(f"{name} [{progress}] {objectives}" for name, progress, objectives in quests))
+
+    def print_level_up(self, new_level: int):
+        self._write(f"🎉 等级提升! Lv.{new_level}")
+
+    def print_combat_log(self, messages: List[str]):
+        self._write("\n".join(f"  > {msg}" for msg in messages))
+
+    def print_monster_defeated(self, monster_name: str, exp_gained: int, gold_gained: int):
+        self._write(f"⚔️ 击败了 {monster_name}！ 经验 +{exp_gained} 金币 +{gold_gained}")
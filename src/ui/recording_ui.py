@@ -0,0 +1,110 @@
+"""Recording UI: captures output as events instead of rendering it, for headless runs"""
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Tuple
+from .base_ui import BaseUI
+
+@dataclass
+class UIEvent:
+    kind: str
+    args: Tuple[Any, ...] = ()
+
+    @property
+    def text(self) -> str:
+        """Plain-text summary of the event, for logs and assertions"""
+        return " ".join(str(arg) for arg in self.args if isinstance(arg, (str, int)))
+
+class RecordingUI(BaseUI):
+    """Records every call as a UIEvent instead of rendering it"""
+
+    def __init__(self, replies: Iterable[str] = ()):
+        super().__init__(replies)
+        self.events: List[UIEvent] = []
+
+    def _record(self, kind: str, *args):
+        self.events.append(UIEvent(kind, args))
+
+    def drain(self) -> List[UIEvent]:
+        """Return the events recorded so far and start a fresh list"""
+        events, self.events = self.events, []
+        return events
+
+    def get_input(self, prompt: str = "> ") -> str:
+        reply = self.next_reply()
+        self._record("input", prompt, reply)
+        return reply
+
+    def print_status_bar(self, health: int, max_health: int, level: int,
+                         exp: int, location: str, gold: int = 0):
+        self._record("status_bar", health, max_health, level, exp, location, gold)
+
+    def print_mini_map(self, current_room: str, map_rows: List[str]):
+        self._record("mini_map", current_room, list(map_rows))
+
+    def print_header(self, title: str):
+        self._record("header", title)
+
+    def print_message(self, message: str, style: str = "white", slow: bool = False):
+        self._record("message", message)
+
+    def print_room(self, room_name: str, description: str, items: List[str],
+                   npcs: List[str], exits: List[str]):
+        self._record("room", room_name, description, items, npcs, exits)
+
+    def print_inventory(self, items: List[tuple], health: int, max_health: int,
+                        level: int, exp: int):
+        self._record("inventory", items, health, max_health, level, exp)
+
+    def print_combat(self, player_hp: int, player_max_hp: int,
+                     enemy_name: str, enemy_hp: int, enemy_max_hp: int):
+        self._record("combat", player_hp, player_max_hp, enemy_name, enemy_hp, enemy_max_hp)
+
+    def print_ascii_art(self, art: str):
+        self._record("ascii_art", art)
+
+    def print_dialogue(self, npc_name: str, text: str):
+        self._record("dialogue", npc_name, text)
+
+    def print_help(self, commands: dict):
+        self._record("help", commands)
+
+    def print_achievements(self, achievements: List[tuple]):
+        self._record("achievements", achievements)
+
+    def print_hint(self, hint: str):
+        self._record("hint", hint)
+
+    def print_crafting_menu(self, recipes: List[tuple]):
+        self._record("crafting_menu", recipes)
+
+    def print_shop(self, items: List[tuple], gold: int):
+        self._record("shop", items, gold)
+
+    def print_error(self, message: str):
+        self._record("error", message)
+
+    def print_success(self, message: str):
+        self._record("success", message)
+
+    def print_warning(self, message: str):
+        self._record("warning", message)
+
+    def print_journal(self, entries: List[str]):
+        self._record("journal", entries)
+
+    def print_stats_panel(self, health: int, max_health: int, level: int,
+                          exp: int, strength: int, intelligence: int,
+                          defense: int, gold: int, score: int):
+        self._record("stats", health, max_health, level, exp, strength,
+                     intelligence, defense, gold, score)
+
+    def print_quests_panel(self, quests: List[tuple]):
+        self._record("quests", quests)
+
+    def print_level_up(self, new_level: int):
+        self._record("level_up", new_level)
+
+    def print_combat_log(self, messages: List[str]):
+        self._record("combat_log", messages)
+
+    def print_monster_defeated(self, monster_name: str, exp_gained: int, gold_gained: int):
+        self._record("monster_defeated", monster_name, exp_gained, gold_gained)
@@ -6,23 +6,192 @@ from rich.layout import Layout
 from rich.text import Text
 from rich.live import Live
 from rich.columns import Columns
-from typing import Optional, List, Dict
-import time
+from rich.segment import Segment, Segments
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterator, Optional, List, TextIO
+import io
+from .base_ui import BaseUI
+from .typewriter import CHARS_PER_FRAME, TypewriterOutput
 
 console = Console()
 
-class GameUI:
-    def __init__(self):
-        self.console = console
+# Rendered panels kept for reuse, least recently printed dropped first
+RENDER_CACHE_SIZE = 256
+
+class OutputBatch(io.StringIO):
+    """Collects a command's console output in memory for one write to `target`.
+
+    It reports the target's tty status and encoding, so rich renders exactly
+    as it would for the terminal itself.
+    """
+
+    def __init__(self, target: TextIO):
+        super().__init__()
+        self.target = target
+
+    def isatty(self) -> bool:
+        return self.target.isatty()
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.target, "encoding", None) or "utf-8"
+
+    def send(self):
+        text = self.getvalue()
+        if text:
+            self.seek(0)
+            self.truncate()
+            self.target.write(text)
+            self.target.flush()
+
+class GameUI(BaseUI):
+    """Rich terminal backend"""
+
+    def __init__(self, rich_console: Optional[Console] = None, render_cache_size: int = RENDER_CACHE_SIZE,
+                 batch_output: bool = True, typewriter: bool = True):
+        super().__init__()
+        self.console = rich_console or console
+        self.batch_output = batch_output
+        self._batch: Optional[OutputBatch] = None
+        # slow messages type out in the background on a terminal; elsewhere they print at once
+        self.typewriter = typewriter
+        self._typewriter: Optional[TypewriterOutput] = None
         self.screen_width = 80
         self.status_bar_enabled = True
+        self.render_cache_size = render_cache_size
+        self._render_cache: "OrderedDict[Hashable, str]" = OrderedDict()
+        # Values and console size the status bar was last drawn with
+        self._status_drawn: Optional[tuple] = None
+        # Console size the status row and scroll region were reserved for
+        self._status_region: Optional[tuple] = None
+
+    def _print_cached(self, key: Hashable, build: Callable[[], object]):
+        """Print the renderable build() makes, reusing its rendered output for the same key.
+
+        Keys hold everything the renderable shows, so changed state is a new
+        key rather than a stale entry; the console size is part of the key
+        because layouts fill the terminal.
+        """
+        if not self.render_cache_size:
+            self.console.print(build())
+            return
+        key = (key, self.console.size)
+        text = self._render_cache.get(key)
+        if text is None:
+            with self.console.capture() as capture:
+                self.console.print(build())
+            text = capture.get()
+            self._render_cache[key] = text
+            if len(self._render_cache) > self.render_cache_size:
+                self._render_cache.popitem(last=False)
+        else:
+            self._render_cache.move_to_end(key)
+        self._write_rendered(text)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        if not self.batch_output or self._batch is not None:
+            yield
+            return
+        self._batch = OutputBatch(self.console.file)
+        self.console.file = self._batch
+        try:
+            yield
+        finally:
+            batch, self._batch = self._batch, None
+            self.console.file = batch.target
+            batch.send()
+
+    def flush(self):
+        if self._batch is not None:
+            self._batch.send()
+
+    @contextmanager
+    def _unbatched(self) -> Iterator[None]:
+        """Write straight to the terminal inside a batch, after what it already holds"""
+        batch = self._batch
+        if batch is None:
+            yield
+            return
+        batch.send()
+        self.console.file = batch.target
+        try:
+            yield
+        finally:
+            self.console.file = batch
+
+    def _write_rendered(self, text: str):
+        """Emit already rendered output (or escape sequences) through the console untouched"""
+        self.console.print(Segments([Segment(text)]), end="", crop=False, soft_wrap=True)
 
     def clear(self):
         self.console.clear()
+        if self._status_region is not None:
+            # Clearing homes the cursor onto the status row; resume below it and redraw
+            self._write_rendered("\x1b[2;1H")
+            self._status_drawn = None
+
+    def close(self):
+        if self._typewriter is not None:
+            self._typewriter.skip()
+            self._typewriter.wait()
+        self._release_status_region()
+
+    def _typewriter_output(self) -> TypewriterOutput:
+        """Route the terminal through a TypewriterOutput, installed on first use"""
+        if self._typewriter is None:
+            if self._batch is not None:
+                self._typewriter = TypewriterOutput(self._batch.target)
+                self._batch.target = self._typewriter
+            else:
+                self._typewriter = TypewriterOutput(self.console.file)
+                self.console.file = self._typewriter
+        return self._typewriter
+
+    def _supports_status_region(self) -> bool:
+        return self.console.is_terminal and not self.console.is_dumb_terminal and not self.console.legacy_windows
+
+    def _reserve_status_region(self, height: int):
+        """Keep the top row for the status bar by scrolling only the rows below it"""
+        # Setting the region homes the cursor, so put it back where output left off
+        self._write_rendered(f"\x1b7\x1b[2;{height}r\x1b8")
+        self._status_region = self.console.size
+
+    def _release_status_region(self):
+        if self._status_region is not None:
+            self._write_rendered("\x1b7\x1b[r\x1b8")
+            self._status_region = None
+            self._status_drawn = None
 
     def print_status_bar(self, health: int, max_health: int, level: int,
                         exp: int, location: str, gold: int = 0):
-        """Persistent status bar at top of screen"""
+        """Status bar pinned to the top row, redrawn in place only when a value changes.
+
+        Terminals without cursor control get the bar as a panel in the
+        scrollback instead, likewise only after a change.
+        """
+        drawn = (health, max_health, level, exp, location, gold, self.console.size)
+        if drawn == self._status_drawn:
+            return
+        self._status_drawn = drawn
+        status_text = self._status_text(health, max_health, level, exp, location, gold)
+
+        if not self._supports_status_region():
+            self.console.print(Panel(status_text, style="bold", border_style="cyan", padding=(0, 1)))
+            return
+        width, height = self.console.size
+        if self._status_region != self.console.size:
+            self._reserve_status_region(height)
+        line = self.console.render_str(f" {status_text}")
+        line.style = "bold"
+        line.truncate(width, overflow="ellipsis", pad=True)
+        with self.console.capture() as capture:
+            self.console.print(line, end="", no_wrap=True)
+        self._write_rendered(f"\x1b7\x1b[1;1H\x1b[2K{capture.get()}\x1b8")
+
+    @staticmethod
+    def _status_text(health: int, max_health: int, level: int, exp: int, location: str, gold: int) -> str:
         hp_percent = health / max_health if max_health > 0 else 0
         hp_color = "green" if hp_percent > 0.5 else "yellow" if hp_percent > 0.25 else "red"
 
@@ -33,40 +202,14 @@ class GameUI:
             f"[green]💰 {gold}[/] | "
             f"[blue]✨ {exp} XP[/]"
         )
+        return status_text
 
-        self.console.print(Panel(status_text, style="bold", border_style="cyan", padding=(0, 1)))
-
-    def print_mini_map(self, current_room: str, visited_rooms: Dict[str, bool],
-                       room_connections: Dict[str, List[str]]):
-        """Display mini-map of explored areas"""
-        map_grid = []
-
-        # Simple 3x3 grid representation
-        symbols = {
-            'current': '[bold red]X[/]',
-            'visited': '[green]●[/]',
-            'unexplored': '[dim]?[/]',
-            'empty': ' '
-        }
-
-        # Build map representation
-        map_text = "╔═══╦═══╦═══╗\n"
-        for i in range(3):
-            map_text += "║ "
-            for j in range(3):
-                if i == 1 and j == 1:  # Center is current
-                    map_text += symbols['current']
-                elif visited_rooms.get(f"pos_{i}_{j}", False):
-                    map_text += symbols['visited']
-                else:
-                    map_text += symbols['unexplored']
-                map_text += " ║ "
-            map_text += "\n"
-            if i < 2:
-                map_text += "╠═══╬═══╬═══╣\n"
-        map_text += "╚═══╩═══╩═══╝"
-
-        self.console.print(Panel(map_text, title="[bold cyan]地图[/]", border_style="blue"))
+    def print_mini_map(self, current_room: str, map_rows: List[str]):
+        """Display the explored map around the player"""
+        rows = tuple(map_rows)
+        self._print_cached(("map", current_room, rows), lambda: Panel(
+            "\n".join(rows + ("", "[bold red]X[/] 当前  [green]●[/] 已探索  [dim]?[/] 未探索")),
+            title=f"[bold cyan]地图 - {current_room}[/]", border_style="blue", expand=False))
 
     def print_header(self, title: str):
         header = Panel(
@@ -77,16 +220,27 @@ class GameUI:
         self.console.print(header)
 
     def print_message(self, message: str, style: str = "white", slow: bool = False):
-        if slow:
-            for char in message:
-                self.console.print(char, end="", style=style)
-                time.sleep(0.02)
-            self.console.print()
-        else:
+        if not (slow and self.typewriter and self.console.is_terminal):
             self.console.print(message, style=style)
+            return
+        text = Text.from_markup(message, style=style)
+        chunks = []
+        for start in range(0, len(text), CHARS_PER_FRAME):
+            with self.console.capture() as capture:
+                self.console.print(text[start:start + CHARS_PER_FRAME], end="", no_wrap=True)
+            chunks.append(capture.get())
+        chunks.append("\n")
+        # Output already held by a batch goes first; later output queues behind the effect
+        self.flush()
+        self._typewriter_output().type(chunks)
 
     def print_room(self, room_name: str, description: str, items: List[str],
                    npcs: List[str], exits: List[str]):
+        key = ("room", room_name, description, tuple(items), tuple(npcs), tuple(exits))
+        self._print_cached(key, lambda: self._room_layout(room_name, description, items, npcs, exits))
+
+    def _room_layout(self, room_name: str, description: str, items: List[str],
+                     npcs: List[str], exits: List[str]) -> Layout:
         layout = Layout()
         layout.split_column(
             Layout(name="header", size=3),
@@ -108,7 +262,7 @@ class GameUI:
         details_table.add_row("出口:", ", ".join([f"[cyan]{e}[/]" for e in exits]) if exits else "[yellow]无[/]")
 
         layout["details"].update(Panel(details_table, border_style="green"))
-        self.console.print(layout)
+        return layout
 
     def print_inventory(self, items: List[tuple], health: int, max_health: int,
                        level: int, exp: int):
@@ -149,7 +303,7 @@ class GameUI:
         return f"[bold]{name}[/]\n[{color}]{bar}[/] {hp}/{max_hp}"
 
     def print_ascii_art(self, art: str):
-        self.console.print(Panel(art, border_style="yellow"))
+        self._print_cached(("art", art), lambda: Panel(art, border_style="yellow"))
 
     def print_dialogue(self, npc_name: str, text: str):
         panel = Panel(
@@ -161,17 +315,22 @@ class GameUI:
         self.console.print(panel)
 
     def print_help(self, commands: dict):
+        self._print_cached(("help", tuple(commands.items())), lambda: self._help_table(commands))
+
+    def _help_table(self, commands: dict) -> Table:
         table = Table(title="[bold yellow]游戏指令[/]", border_style="cyan")
         table.add_column("指令", style="green", width=30)
         table.add_column("说明", style="white")
 
         for cmd, desc in commands.items():
             table.add_row(cmd, desc)
-
-        self.console.print(table)
+        return table
 
     def print_achievements(self, achievements: List[tuple]):
         """Display achievements"""
+        self._print_cached(("achievements", tuple(achievements)), lambda: self._achievements_table(achievements))
+
+    def _achievements_table(self, achievements: List[tuple]) -> Table:
         table = Table(title="[bold yellow]🏆 成就[/]", border_style="gold1")
         table.add_column("成就", style="cyan")
         table.add_column("描述", style="white")
@@ -181,8 +340,7 @@ class GameUI:
             status = "✓ 已解锁" if unlocked else "○ 未解锁"
             style = "green" if unlocked else "dim"
             table.add_row(f"[{style}]{name}[/]", f"[{style}]{desc}[/]", f"[{style}]{status}[/]")
-
-        self.console.print(table)
+        return table
 
     def print_hint(self, hint: str):
         """Display contextual hint"""
@@ -217,7 +375,14 @@ class GameUI:
         self.console.print(table)
 
     def get_input(self, prompt: str = "> ") -> str:
-        return self.console.input(f"[green]{prompt}[/]").strip().lower()
+        # Everything the command printed so far must be on screen before it waits;
+        # a typewriter effect still playing can be skipped with any key
+        if self._typewriter is not None:
+            self._typewriter.wait()
+        with self._unbatched():
+            reply = self.console.input(f"[green]{prompt}[/]").strip().lower()
+        self.consumed_replies.append(reply)
+        return reply
 
     def print_error(self, message: str):
         self.console.print(f"[bold red]✗[/] {message}")
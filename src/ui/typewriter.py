@@ -0,0 +1,156 @@
+"""Typewriter text played in the background, skippable with any key"""
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, TextIO, Union
+
+try:
+    import select
+    import termios
+    import tty
+    RAW_KEYS = "posix"
+except ImportError:
+    try:
+        import msvcrt
+        RAW_KEYS = "windows"
+    except ImportError:
+        RAW_KEYS = None
+
+# Three characters every 1/30 s: about 90 characters per second
+CHARS_PER_FRAME = 3
+FRAME_SECONDS = 1 / 30
+
+class KeyListener:
+    """Reports single keypresses on an interactive stdin without echoing them"""
+
+    def __init__(self, stdin: Optional[TextIO] = None):
+        self.stdin = stdin or sys.stdin
+        self.enabled = RAW_KEYS is not None and self._isatty()
+        self._saved = None
+
+    def _isatty(self) -> bool:
+        try:
+            return self.stdin.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def __enter__(self) -> "KeyListener":
+        if self.enabled and RAW_KEYS == "posix":
+            fd = self.stdin.fileno()
+            self._saved = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+        return self
+
+    def __exit__(self, *exc):
+        if self._saved is not None:
+            termios.tcsetattr(self.stdin.fileno(), termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+    def pressed(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for a key and swallow it; False if none came"""
+        if not self.enabled:
+            time.sleep(timeout)
+            return False
+        if RAW_KEYS == "posix":
+            fd = self.stdin.fileno()
+            if not select.select([fd], [], [], timeout)[0]:
+                return False
+            os.read(fd, 1024)
+            return True
+        deadline = time.monotonic() + timeout
+        while not msvcrt.kbhit():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        while msvcrt.kbhit():
+            msvcrt.getwch()
+        return True
+
+class TypewriterOutput:
+    """A terminal file whose writes queue up behind typewriter effects still playing.
+
+    type() returns at once; a player thread writes the chunks frame by frame
+    and then whatever was written meanwhile, in order. A keypress (or skip())
+    finishes every queued effect instantly. While nothing plays, writes go
+    straight through.
+    """
+
+    def __init__(self, target: TextIO, frame_seconds: float = FRAME_SECONDS,
+                 keys: Optional[KeyListener] = None):
+        self.target = target
+        self.frame_seconds = frame_seconds
+        self.keys = keys or KeyListener()
+        self._lock = threading.Lock()
+        # Plain text (str) and typewriter effects (lists of chunks), oldest first
+        self._queue: Deque[Union[str, List[str]]] = deque()
+        self._player = None
+        self._skip = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+
+    def isatty(self) -> bool:
+        return self.target.isatty()
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.target, "encoding", None) or "utf-8"
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            if self._player is None:
+                self.target.write(text)
+            else:
+                self._queue.append(text)
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            if self._player is None:
+                self.target.flush()
+
+    def type(self, chunks: List[str]):
+        with self._lock:
+            self._queue.append(list(chunks))
+            if self._player is None:
+                self._idle.clear()
+                self._skip.clear()
+                self._player = threading.Thread(target=self._play, name="typewriter", daemon=True)
+                self._player.start()
+
+    def skip(self):
+        self._skip.set()
+
+    def wait(self):
+        """Block until every effect has finished (a keypress finishes them now)"""
+        self._idle.wait()
+
+    @property
+    def playing(self) -> bool:
+        return not self._idle.is_set()
+
+    def _play(self):
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._player = None
+                    self._idle.set()
+                    return
+                item = self._queue.popleft()
+            if isinstance(item, str):
+                self._emit(item)
+                continue
+            # The terminal is back in line mode before anyone waiting on wait() prompts
+            with self.keys:
+                for index, chunk in enumerate(item):
+                    if self._skip.is_set():
+                        self._emit("".join(item[index:]))
+                        break
+                    self._emit(chunk)
+                    if self.keys.pressed(self.frame_seconds):
+                        self._skip.set()
+
+    def _emit(self, text: str):
+        self.target.write(text)
+        self.target.flush()
@@ -21,8 +21,6 @@ from typing import List, Tuple
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.game_engine import GameEngine
-from src.systems.combat import CombatSystem
-from src.ui.terminal_ui import ui
 
 class AutomatedTester:
     """自动化游戏测试器"""
@@ -36,18 +34,14 @@ class AutomatedTester:
         self.log = []
         
     def setup_game(self):
-        """初始化游戏引擎（自动战斗模式）"""
+        """初始化无界面游戏引擎（自动战斗、无音频、无延迟）"""
         script_dir = os.path.dirname(os.path.abspath(__file__))
         save_dir = os.path.join(script_dir, "saving")
         sounds_dir = os.path.join(script_dir, "sounds")
         
         os.makedirs(save_dir, exist_ok=True)
         
-        self.game = GameEngine(save_dir, sounds_dir)
-        self.game.audio = None  # 禁用音频
-        
-        # 启用自动战斗模式
-        self.game.combat_system = CombatSystem(audio_system=None, auto_mode=True)
+        self.game = GameEngine(save_dir, sounds_dir, headless=True)
         
     def load_walkthrough(self, filepath: str) -> List[str]:
         """加载通关脚本"""
@@ -72,8 +66,13 @@ class AutomatedTester:
                 return True, "跳过确认命令"
             
             # 执行命令
-            self.game.process_command(command)
-            self.game._check_game_state()
+            result = self.game.step(command)
+            if self.verbose:
+                for event in result.events:
+                    if event.text:
+                        print(f"      {event.text}")
+            if result.error:
+                return False, result.error
             
             return True, "成功"
             